@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Benchmark the documentation build pipeline on a synthetic SDRF corpus.
+
+SDRF files are synthesized from the resolved templates: every file combines
+a sample-layer template (human, vertebrates, plants, ...) with the
+ms-proteomics technology template, and each column takes its values from
+the column's validator 'values' or 'examples', or from the builder's
+example value. Samples repeat across runs, as in real files.
+
+Timed stages:
+    resolve_all, template_index, search_index, builder_data
+        once per run, on the templates directory;
+    generate, parse_sdrf_file, statistics, index_sdrf_file
+        for every (files, rows per file) combination of the corpus grid.
+
+Results are written as JSON; pass a previous result file to --compare to
+see the ratio of each timing against it.
+
+Usage:
+    python3 scripts/benchmark.py --files 1,100 --rows 10,1000,100000 -o results.json
+    python3 scripts/benchmark.py --compare results-main.json -o results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent))
+from build_sdrf_builder_data import (
+    _example_value,
+    _load_terms,
+    build_builder_data,
+    write_builder_data,
+)
+from resolve_templates import resolve_all
+from template_index import TemplateIndex
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = REPO_ROOT / "sdrf-proteomics" / "sdrf-templates"
+SITE_DIR = REPO_ROOT / "site"
+
+TECHNOLOGY_TEMPLATE = "ms-proteomics"
+
+# Number of runs (rows) per sample in the synthetic files
+RUNS_PER_SAMPLE = 4
+
+# Columns that identify a row rather than describe its sample
+ROW_COLUMNS = {
+    "assay name": "run_{row}",
+    "comment[data file]": "run_{row}.raw",
+    "comment[fraction identifier]": "{fraction}",
+}
+
+
+def load_site_script(filename: str):
+    """Import one of the site/ build scripts (their names are not importable)."""
+    spec = importlib.util.spec_from_file_location(
+        filename.replace("-", "_").removesuffix(".py"), SITE_DIR / filename
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def column_values(column: dict) -> list[str]:
+    """Candidate values of a column: validator values or examples, else its example value."""
+    for validator in column.get("validators") or []:
+        if not validator:
+            continue
+        params = validator.get("params") or {}
+        for key in ("values", "examples"):
+            if params.get(key):
+                return [str(value) for value in params[key]]
+    example = _example_value(column)
+    if example:
+        return [example]
+    if column.get("allow_not_available"):
+        return ["not available"]
+    return ["not applicable"]
+
+
+def synthetic_columns(
+    resolved: dict[str, dict[str, Any]],
+    sample_template: str,
+    technology_template: str = TECHNOLOGY_TEMPLATE,
+) -> list[tuple[str, list[str]]]:
+    """Columns of a sample template combined with a technology template.
+
+    Returns:
+        List of (column name, candidate values), without repeated names.
+    """
+    columns: dict[str, list[str]] = {}
+    for name in (sample_template, technology_template):
+        for column in resolved[name]["all_columns"]:
+            columns.setdefault(column["name"], column_values(column))
+    return list(columns.items())
+
+
+def write_synthetic_sdrf(
+    path: Path,
+    columns: list[tuple[str, list[str]]],
+    num_rows: int,
+    rng: random.Random,
+    metadata: dict[str, str] | None = None,
+) -> None:
+    """Write an SDRF file of num_rows rows with the given columns.
+
+    Sample-level values are drawn once per sample; identifiers such as the
+    assay name and data file are unique per row.
+    """
+    num_samples = max(1, num_rows // RUNS_PER_SAMPLE)
+    samples = [
+        [
+            f"sample_{s}" if name == "source name" else rng.choice(values)
+            for name, values in columns
+        ]
+        for s in range(num_samples)
+    ]
+    row_columns = [
+        (i, ROW_COLUMNS[name]) for i, (name, _) in enumerate(columns) if name in ROW_COLUMNS
+    ]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for key, value in (metadata or {}).items():
+            f.write(f"#{key}={value}\n")
+        f.write("\t".join(name for name, _ in columns) + "\n")
+        for row in range(num_rows):
+            values = samples[row % num_samples]
+            if row_columns:
+                values = list(values)
+                for i, pattern in row_columns:
+                    values[i] = pattern.format(row=row, fraction=row // num_samples + 1)
+            f.write("\t".join(values) + "\n")
+
+
+def generate_corpus(
+    resolved: dict[str, dict[str, Any]],
+    datasets_dir: Path,
+    num_files: int,
+    rows_per_file: int,
+    seed: int = 0,
+) -> list[Path]:
+    """Write num_files synthetic SDRF files laid out like the datasets/ folder.
+
+    Files cycle through the sample-layer templates. The same arguments
+    always produce the same files.
+
+    Returns:
+        The paths written, in accession order.
+    """
+    rng = random.Random(seed)
+    sample_templates = [name for name, tpl in resolved.items() if tpl.get("layer") == "sample"]
+    paths = []
+    for n in range(num_files):
+        template = sample_templates[n % len(sample_templates)]
+        accession = f"PXD{n + 1:06d}"
+        path = datasets_dir / accession / f"{accession}.sdrf.tsv"
+        write_synthetic_sdrf(
+            path,
+            synthetic_columns(resolved, template),
+            rows_per_file,
+            rng,
+            {"template": template, "version": resolved[template].get("version", "")},
+        )
+        paths.append(path)
+    return paths
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Run fn repeat times.
+
+    Returns:
+        Dict with the best and mean wall-clock time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"best_s": round(min(timings), 6), "mean_s": round(sum(timings) / len(timings), 6)}
+
+
+def run_benchmarks(
+    templates_dir: Path,
+    files_grid: list[int],
+    rows_grid: list[int],
+    repeat: int,
+    work_dir: Path,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Time every stage; see the module docstring for the list.
+
+    Returns:
+        One dict per measurement with 'benchmark', 'files', 'rows',
+        'best_s' and 'mean_s' ('files' and 'rows' are None for the
+        template stages).
+    """
+    results = []
+
+    def record(name: str, fn: Callable[[], Any], files=None, rows=None, times=repeat):
+        results.append({"benchmark": name, "files": files, "rows": rows, **time_call(fn, times)})
+        print(f"  {name:<16} files={files!s:<6} rows={rows!s:<8} {results[-1]['best_s']:.4f}s")
+
+    search = load_site_script("build-search-index.py")
+    index = load_site_script("build-sdrf-index.py")
+
+    resolved = resolve_all(templates_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        terms = _load_terms(REPO_ROOT)
+    record("resolve_all", lambda: resolve_all(templates_dir))
+    record("template_index", lambda: TemplateIndex(resolved))
+
+    def search_index():
+        with contextlib.redirect_stdout(io.StringIO()):
+            search.build_index(
+                str(REPO_ROOT), str(work_dir / "search-index.json"), templates_dir=templates_dir
+            )
+
+    record("search_index", search_index)
+    record(
+        "builder_data",
+        lambda: write_builder_data(build_builder_data(resolved, terms), work_dir / "builder.json"),
+    )
+
+    for num_files in files_grid:
+        for rows in rows_grid:
+            datasets_dir = work_dir / f"datasets-{num_files}x{rows}"
+            paths = []
+
+            def generate():
+                paths[:] = generate_corpus(resolved, datasets_dir, num_files, rows, seed)
+
+            record("generate", generate, num_files, rows, times=1)
+            parsed = [index.parse_sdrf_file(path) for path in paths]
+
+            def statistics():
+                counters = {key: Counter() for key, _, _ in index.STAT_FIELDS}
+                for file_parsed in parsed:
+                    for key, names in index.summarize_file(file_parsed).items():
+                        counters[key].update(names)
+                    index.sketch_file(file_parsed)
+
+            record(
+                "parse_sdrf_file",
+                lambda: [index.parse_sdrf_file(path) for path in paths],
+                num_files, rows,
+            )
+            record("statistics", statistics, num_files, rows)
+            record(
+                "index_sdrf_file",
+                lambda: [
+                    index.index_sdrf_file(path, str(datasets_dir), "benchmark/datasets", "main")
+                    for path in paths
+                ],
+                num_files, rows,
+            )
+    return results
+
+
+def compare(results: list[dict[str, Any]], previous: list[dict[str, Any]]) -> None:
+    """Print each timing next to the matching one of a previous run."""
+    before = {(r["benchmark"], r["files"], r["rows"]): r["best_s"] for r in previous}
+    print(f"\n{'benchmark':<16} {'files':>6} {'rows':>8} {'before':>10} {'now':>10} {'ratio':>7}")
+    for r in results:
+        old = before.get((r["benchmark"], r["files"], r["rows"]))
+        if old is None:
+            continue
+        ratio = r["best_s"] / old if old else float("inf")
+        print(
+            f"{r['benchmark']:<16} {r['files']!s:>6} {r['rows']!s:>8} "
+            f"{old:>10.4f} {r['best_s']:>10.4f} {ratio:>6.2f}x"
+        )
+
+
+def _int_list(text: str) -> list[int]:
+    return [int(value) for value in text.split(",") if value]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the SDRF build pipeline.")
+    parser.add_argument("--templates-dir", type=Path, default=TEMPLATES_DIR)
+    parser.add_argument(
+        "--files", type=_int_list, default=[1, 100],
+        help="Comma-separated numbers of synthetic SDRF files (default: 1,100)",
+    )
+    parser.add_argument(
+        "--rows", type=_int_list, default=[10, 1000, 100000],
+        help="Comma-separated rows per file (default: 10,1000,100000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per timing; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--work-dir", type=Path,
+        help="Where to write the synthetic corpus (default: a temporary directory)",
+    )
+    parser.add_argument("-o", "--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--compare", type=Path, metavar="RESULTS", help="Previous results JSON")
+    args = parser.parse_args()
+
+    # Time the real work, not the compiled-template cache
+    os.environ["SDRF_TEMPLATES_CACHE"] = "0"
+
+    print(f"Benchmarking files={args.files} rows={args.rows} repeat={args.repeat}")
+    with contextlib.ExitStack() as stack:
+        work_dir = args.work_dir or Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        results = run_benchmarks(
+            args.templates_dir, args.files, args.rows, args.repeat, work_dir, args.seed
+        )
+
+    report = {
+        "commit": _git_commit(),
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "files": args.files, "rows": args.rows, "repeat": args.repeat, "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote benchmark results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@
 # Options:
 #   --dev         Build as dev version (adds dev banner)
 #   --clean       Remove output directory before building
+#   --snapshot    Pre-parse sdrf-templates into one JSON snapshot and feed
+#                 that to the template scripts instead of the YAML tree
 #   --help        Show this help message
 #
 # Examples:
@@ -30,6 +32,7 @@ set -e  # Exit on error
 OUTPUT_DIR="demo_page"
 IS_DEV=false
 CLEAN=false
+SNAPSHOT=false
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -42,8 +45,12 @@ while [[ $# -gt 0 ]]; do
             CLEAN=true
             shift
             ;;
+        --snapshot)
+            SNAPSHOT=true
+            shift
+            ;;
         --help)
-            head -30 "$0" | tail -28
+            head -32 "$0" | tail -30
             exit 0
             ;;
         *)
@@ -147,10 +154,19 @@ if [ -f "sdrf-proteomics/metadata-guidelines/data-analysis-metadata.adoc" ]; the
         sdrf-proteomics/metadata-guidelines/data-analysis-metadata.adoc
 fi
 
+# Optionally snapshot the YAML templates into a single pre-parsed JSON file
+TEMPLATES_SRC="sdrf-proteomics/sdrf-templates"
+if [ "$SNAPSHOT" = true ]; then
+    echo "Snapshotting YAML templates..."
+    TEMPLATES_SRC=".cache/sdrf-templates/templates-snapshot.json"
+    python3 scripts/build_templates_snapshot.py \
+        sdrf-proteomics/sdrf-templates "$TEMPLATES_SRC"
+fi
+
 # Build template pages from YAML definitions
 echo "Building template pages from YAML..."
 python3 scripts/build_template_pages.py \
-    sdrf-proteomics/sdrf-templates "$OUTPUT_DIR/templates"
+    "$TEMPLATES_SRC" "$OUTPUT_DIR/templates"
 
 # Copy assets
 echo "Copying assets..."
@@ -171,7 +187,6 @@ echo "Copying static pages..."
 cp site/index.html "$OUTPUT_DIR/"
 cp site/sdrf-terms.html "$OUTPUT_DIR/"
 cp site/quickstart.html "$OUTPUT_DIR/"
-cp site/sdrf-explorer.html "$OUTPUT_DIR/"
 cp site/sdrf-editor.html "$OUTPUT_DIR/"
 cp site/sdrf-builder.html "$OUTPUT_DIR/"
 
@@ -182,7 +197,7 @@ cp sdrf-proteomics/TERMS.tsv "$OUTPUT_DIR/TERMS.tsv" 2>/dev/null || true
 # Auto-generate index.html template section from YAML
 echo "Updating index template section..."
 python3 scripts/build_index_templates.py \
-    sdrf-proteomics/sdrf-templates "$OUTPUT_DIR/index.html"
+    "$TEMPLATES_SRC" "$OUTPUT_DIR/index.html"
 
 # Provision the external sdrf-annotated-datasets repository so the index
 # script can read the SDRF files. Honour SDRF_DATASETS_DIR if the caller
@@ -211,6 +226,12 @@ echo "Using SDRF datasets from: $SDRF_DATASETS_DIR"
 echo "Building SDRF Explorer index..."
 python3 site/build-sdrf-index.py
 cp site/sdrf-data.json "$OUTPUT_DIR/"
+rm -rf "$OUTPUT_DIR/sdrf-explorer-data"
+cp -r site/sdrf-explorer-data "$OUTPUT_DIR/"
+rm -rf "$OUTPUT_DIR/sdrf-profiles"
+cp -r site/sdrf-profiles "$OUTPUT_DIR/"
+# Copied after the index build, which points it at the current data files
+cp site/sdrf-explorer.html "$OUTPUT_DIR/"
 
 # Inject navigation headers
 echo "Adding navigation headers..."
@@ -231,11 +252,11 @@ python3 scripts/transform-sdrf-tables.py "$OUTPUT_DIR"
 # Build SDRF builder data
 echo "Building SDRF builder data..."
 python3 scripts/build_sdrf_builder_data.py \
-    sdrf-proteomics/sdrf-templates "$OUTPUT_DIR/sdrf-builder-data.json"
+    "$TEMPLATES_SRC" "$OUTPUT_DIR/sdrf-builder-data.json"
 
 # Build search index
 echo "Building search index..."
-python3 site/build-search-index.py . "$OUTPUT_DIR/search-index.json"
+python3 site/build-search-index.py . "$OUTPUT_DIR/search-index.json" "$TEMPLATES_SRC"
 
 # Add dev banner if building dev version
 if [ "$IS_DEV" = true ]; then
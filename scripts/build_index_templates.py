@@ -19,10 +19,7 @@ from jinja2 import Environment, FileSystemLoader
 
 # Allow importing resolve_templates from scripts/
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from resolve_templates import resolve_all  # noqa: E402
-
-# Display order for layers
-LAYER_ORDER = {"technology": 0, "sample": 1, "experiment": 2}
+from resolve_templates import LAYER_ORDER, load_compiled_templates  # noqa: E402
 
 
 def filter_and_sort_templates(all_resolved: dict[str, dict]) -> list[dict]:
@@ -79,7 +76,7 @@ def main() -> None:
     index_path = Path(sys.argv[2])
 
     # Resolve all templates
-    all_resolved = resolve_all(templates_dir)
+    all_resolved = load_compiled_templates(templates_dir)["resolved"]
 
     # Filter and sort
     templates = filter_and_sort_templates(all_resolved)
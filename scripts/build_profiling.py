@@ -0,0 +1,144 @@
+"""
+Opt-in per-stage profiling for the build scripts.
+
+Profiling is off unless a script gets --profile[=DIR] or the SDRF_PROFILE
+environment variable is set (to 1, or to an output directory). When on,
+each stage a script wraps in profiler.stage(...) runs under cProfile and
+tracemalloc, and the profiler writes:
+
+    <DIR>/<script>.<stage>.prof   cProfile stats, for pstats or snakeviz
+    <DIR>/<script>.json           wall time and peak Python memory per stage
+
+and prints the top hotspots of each stage. DIR defaults to
+.cache/profiles in the repository. Stages of one script run one after the
+other; work done in worker processes is not profiled.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_ENV = "SDRF_PROFILE"
+PROFILE_TOP_ENV = "SDRF_PROFILE_TOP"
+DEFAULT_PROFILE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "profiles"
+DEFAULT_TOP_N = 15
+
+
+def pop_profile_option(argv: list[str]) -> str | None:
+    """Remove --profile or --profile=DIR from argv (in place).
+
+    For scripts that read sys.argv by position.
+
+    Returns:
+        None when absent, '' for a bare --profile, otherwise DIR.
+    """
+    option = None
+    for arg in list(argv[1:]):
+        if arg == "--profile" or arg.startswith("--profile="):
+            argv.remove(arg)
+            option = arg.partition("=")[2]
+    return option
+
+
+def add_profile_argument(parser) -> None:
+    """Add --profile [DIR] to an argparse parser."""
+    parser.add_argument(
+        "--profile", nargs="?", const="", metavar="DIR",
+        help=f"Profile each build stage with cProfile and tracemalloc, writing "
+             f"reports to DIR (default: {DEFAULT_PROFILE_DIR}); also enabled "
+             f"by {PROFILE_ENV}=1 or {PROFILE_ENV}=DIR",
+    )
+
+
+class StageProfiler:
+    """Profiles named stages of one script; does nothing when disabled."""
+
+    def __init__(self, script: str, output_dir: Path | None = None, top_n: int = DEFAULT_TOP_N) -> None:
+        self.script = script
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.top_n = top_n
+        self.stages: dict[str, dict] = {}
+
+    @classmethod
+    def create(cls, script: str, option: str | None = None) -> StageProfiler:
+        """Profiler for a script, from its --profile option or the environment.
+
+        Args:
+            script: Name used for the report files.
+            option: Value of --profile (None when not given, '' when given
+                without a directory).
+        """
+        if option is None:
+            option = os.environ.get(PROFILE_ENV)
+            if option in (None, "", "0"):
+                return cls(script)
+            if option == "1":
+                option = ""
+        top_n = int(os.environ.get(PROFILE_TOP_ENV, DEFAULT_TOP_N))
+        return cls(script, Path(option) if option else DEFAULT_PROFILE_DIR, top_n)
+
+    @property
+    def enabled(self) -> bool:
+        return self.output_dir is not None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as one stage."""
+        if not self.enabled:
+            yield
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            self._record(name, profile, elapsed, peak)
+
+    def _record(self, name: str, profile: cProfile.Profile, elapsed: float, peak: int) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        prof_path = self.output_dir / f"{self.script}.{name}.prof"
+        profile.dump_stats(prof_path)
+        self.stages[name] = {
+            "seconds": round(elapsed, 4),
+            "peak_memory_bytes": peak,
+            "profile": str(prof_path),
+        }
+
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("tottime").print_stats(self.top_n)
+        print(f"\n[profile] {self.script} / {name}: {elapsed:.3f}s, peak {peak / 2**20:.1f} MB")
+        # Skip the pstats preamble, keep the table
+        lines = out.getvalue().splitlines()
+        table = next((i for i, line in enumerate(lines) if "ncalls" in line), 0)
+        print("\n".join(line for line in lines[table:] if line.strip()))
+
+    def report(self) -> None:
+        """Write the per-stage summary and print it; stop tracemalloc."""
+        if not self.enabled or not self.stages:
+            return
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        summary_path = self.output_dir / f"{self.script}.json"
+        with open(summary_path, "w") as f:
+            json.dump({"script": self.script, "stages": self.stages}, f, indent=2)
+        print(f"\n[profile] {self.script} stages:")
+        for name, stage in self.stages.items():
+            print(f"  {name:<20} {stage['seconds']:>9.3f}s {stage['peak_memory_bytes'] / 2**20:>9.1f} MB")
+        print(f"[profile] Reports written to {self.output_dir}")
@@ -15,7 +15,8 @@ from pathlib import Path
 from typing import Any
 
 sys.path.insert(0, str(Path(__file__).parent))
-from resolve_templates import resolve_all
+from build_profiling import StageProfiler, pop_profile_option
+from resolve_templates import load_compiled_templates
 
 # Fallback example values for well-known column names
 FALLBACK_EXAMPLES: dict[str, str] = {
@@ -141,11 +142,44 @@ def _load_terms(repo_root: Path) -> list[dict]:
     return terms
 
 
+def serialize_template(tpl: dict) -> dict:
+    """Serialize a single resolved template for the builder JSON."""
+    return {
+        "description": tpl.get("description", ""),
+        "layer": tpl.get("layer"),
+        "usable_alone": tpl.get("usable_alone", False),
+        "extends": tpl.get("extends"),
+        "inheritance_chain": tpl.get("inheritance_chain", []),
+        "columns": [_serialize_column(c) for c in tpl["all_columns"]],
+        "own_columns": [_serialize_column(c) for c in tpl["own_columns"]],
+    }
+
+
+def build_builder_data(
+    all_templates: dict[str, dict], terms: list[dict]
+) -> dict[str, Any]:
+    """Assemble the full builder JSON document."""
+    return {
+        "templates": {
+            name: serialize_template(tpl) for name, tpl in all_templates.items()
+        },
+        "combination_rules": _extract_combination_rules(all_templates),
+        "terms": terms,
+    }
+
+
+def write_builder_data(output: dict[str, Any], output_path: Path) -> None:
+    """Write the builder JSON document."""
+    with open(output_path, "w") as f:
+        json.dump(output, f, indent=2)
+
+
 def main() -> None:
+    profiler = StageProfiler.create("build_sdrf_builder_data", pop_profile_option(sys.argv))
     if len(sys.argv) < 3:
         print(
             "Usage: python3 build_sdrf_builder_data.py "
-            "<sdrf-templates-dir> <output-json-path>"
+            "<sdrf-templates-dir> <output-json-path> [--profile[=DIR]]"
         )
         sys.exit(1)
 
@@ -156,38 +190,18 @@ def main() -> None:
     repo_root = Path(__file__).resolve().parent.parent
 
     # Resolve all templates
-    all_templates = resolve_all(templates_dir)
+    with profiler.stage("resolve"):
+        all_templates = load_compiled_templates(templates_dir)["resolved"]
     print(f"Resolved {len(all_templates)} templates")
 
-    # Serialize templates
-    templates_json: dict[str, dict] = {}
-    for name, tpl in all_templates.items():
-        templates_json[name] = {
-            "description": tpl.get("description", ""),
-            "layer": tpl.get("layer"),
-            "usable_alone": tpl.get("usable_alone", False),
-            "extends": tpl.get("extends"),
-            "inheritance_chain": tpl.get("inheritance_chain", []),
-            "columns": [_serialize_column(c) for c in tpl["all_columns"]],
-            "own_columns": [_serialize_column(c) for c in tpl["own_columns"]],
-        }
-
-    # Extract combination rules
-    combination_rules = _extract_combination_rules(all_templates)
-
-    # Load terms
-    terms = _load_terms(repo_root)
-
-    # Write output
-    output = {
-        "templates": templates_json,
-        "combination_rules": combination_rules,
-        "terms": terms,
-    }
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    # Serialize templates, combination rules and terms
+    with profiler.stage("serialize"):
+        output = build_builder_data(all_templates, _load_terms(repo_root))
+    with profiler.stage("write"):
+        write_builder_data(output, output_path)
 
     print(f"Wrote builder data to {output_path}")
+    profiler.report()
 
 
 if __name__ == "__main__":
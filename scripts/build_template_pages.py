@@ -8,7 +8,8 @@ from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 
 sys.path.insert(0, str(Path(__file__).parent))
-from resolve_templates import resolve_all
+from build_profiling import StageProfiler, pop_profile_option
+from resolve_templates import load_compiled_templates
 
 REQUIREMENT_ORDER = {"required": 0, "recommended": 1, "optional": 2}
 
@@ -66,19 +67,77 @@ def sort_columns(columns: list[dict]) -> list[dict]:
 
 
 def fix_jinja_reserved_keys(columns: list[dict]) -> list[dict]:
-    """Rename 'values' key in validator params to avoid Jinja2 dict.values() conflict."""
+    """Rename 'values' key in validator params to avoid Jinja2 dict.values() conflict.
+
+    Resolved columns may be shared between templates, so affected columns are
+    copied rather than modified in place.
+    """
+    fixed = []
     for col in columns:
-        if col.get("validators"):
-            for v in col["validators"]:
+        validators = col.get("validators")
+        if validators and any(
+            v.get("params") and "values" in v["params"] for v in validators
+        ):
+            new_validators = []
+            for v in validators:
                 if v.get("params") and "values" in v["params"]:
-                    v["params"]["allowed_values"] = v["params"].pop("values")
-    return columns
+                    params = dict(v["params"])
+                    params["allowed_values"] = params.pop("values")
+                    v = {**v, "params": params}
+                new_validators.append(v)
+            col = {**col, "validators": new_validators}
+        fixed.append(col)
+    return fixed
+
+
+def load_page_template():
+    """Load the Jinja2 template used for per-template pages."""
+    repo_root = Path(__file__).parent.parent
+    jinja_dir = repo_root / "site" / "templates"
+    env = Environment(loader=FileSystemLoader(str(jinja_dir)))
+    return env.get_template("template-page.html.j2")
+
+
+def render_template_page(page_template, resolved: dict) -> str:
+    """Render the HTML page for one resolved template.
+
+    The resolved dict is not modified.
+    """
+    page = dict(resolved)
+    page["documentation_html"] = process_documentation(
+        resolved.get("documentation", "")
+    )
+    # Sort columns by requirement level
+    page["all_columns"] = sort_columns(resolved["all_columns"])
+    page["own_columns"] = sort_columns(resolved["own_columns"])
+    page["inherited_columns"] = sort_columns(resolved["inherited_columns"])
+    # Fix Jinja2 reserved key conflicts
+    page["all_columns"] = fix_jinja_reserved_keys(page["all_columns"])
+    return page_template.render(template=page)
+
+
+def write_template_pages(
+    all_templates: dict[str, dict],
+    output_dir: Path,
+    names=None,
+    page_template=None,
+) -> None:
+    """Write <name>.html for the given templates (all of them by default)."""
+    if page_template is None:
+        page_template = load_page_template()
+    for name in all_templates if names is None else names:
+        html = render_template_page(page_template, all_templates[name])
+        out_path = output_dir / f"{name}.html"
+        with open(out_path, "w") as f:
+            f.write(html)
+        print(f"  Generated: {out_path}")
 
 
 def main():
+    profiler = StageProfiler.create("build_template_pages", pop_profile_option(sys.argv))
     if len(sys.argv) < 3:
         print(
-            "Usage: python3 build_template_pages.py <sdrf-templates-dir> <output-dir>"
+            "Usage: python3 build_template_pages.py <sdrf-templates-dir> <output-dir> [--profile[=DIR]]"
         )
         sys.exit(1)
 
@@ -86,32 +145,13 @@ def main():
     output_dir = Path(sys.argv[2])
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    repo_root = Path(__file__).parent.parent
-    jinja_dir = repo_root / "site" / "templates"
-
-    env = Environment(loader=FileSystemLoader(str(jinja_dir)))
-    page_template = env.get_template("template-page.html.j2")
-
-    all_templates = resolve_all(templates_dir)
-
-    for name, resolved in all_templates.items():
-        resolved["documentation_html"] = process_documentation(
-            resolved.get("documentation", "")
-        )
-        # Sort columns by requirement level
-        resolved["all_columns"] = sort_columns(resolved["all_columns"])
-        resolved["own_columns"] = sort_columns(resolved["own_columns"])
-        resolved["inherited_columns"] = sort_columns(resolved["inherited_columns"])
-        # Fix Jinja2 reserved key conflicts
-        fix_jinja_reserved_keys(resolved["all_columns"])
-
-        html = page_template.render(template=resolved)
-        out_path = output_dir / f"{name}.html"
-        with open(out_path, "w") as f:
-            f.write(html)
-        print(f"  Generated: {out_path}")
+    with profiler.stage("resolve"):
+        all_templates = load_compiled_templates(templates_dir)["resolved"]
+    with profiler.stage("render"):
+        write_template_pages(all_templates, output_dir)
 
     print(f"Generated {len(all_templates)} template pages in {output_dir}")
+    profiler.report()
 
 
 if __name__ == "__main__":
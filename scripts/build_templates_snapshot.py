@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Snapshot the sdrf-templates tree into a single pre-parsed JSON file.
+
+Every script that takes an <sdrf-templates-dir> argument also accepts the
+snapshot path, and then loads one JSON file instead of parsing each YAML.
+
+Usage:
+    python3 scripts/build_templates_snapshot.py <sdrf-templates-dir> <output-json-path>
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from resolve_templates import write_templates_snapshot  # noqa: E402
+
+
+def main() -> None:
+    if len(sys.argv) != 3:
+        print(
+            f"Usage: {sys.argv[0]} <sdrf-templates-dir> <output-json-path>",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    templates_dir = Path(sys.argv[1])
+    output_path = Path(sys.argv[2])
+
+    count = write_templates_snapshot(templates_dir, output_path)
+    print(f"Wrote snapshot of {count} template versions to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
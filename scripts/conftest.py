@@ -0,0 +1,52 @@
+"""Fixtures shared by the scripts/ test modules."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from resolve_templates import resolve_all
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = REPO_ROOT / "sdrf-proteomics" / "sdrf-templates"
+
+
+@pytest.fixture(autouse=True)
+def templates_cache_dir(tmp_path, monkeypatch):
+    """Keep compiled-template caches out of the repository's .cache/."""
+    cache_dir = tmp_path / "templates-cache"
+    monkeypatch.setenv("SDRF_TEMPLATES_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(scope="session")
+def templates_dir():
+    """The repository's templates directory (read-only)."""
+    return TEMPLATES_DIR
+
+
+@pytest.fixture(scope="session")
+def resolved():
+    """All templates resolved once per test session; do not mutate."""
+    return resolve_all(TEMPLATES_DIR)
+
+
+@pytest.fixture
+def templates_copy(tmp_path):
+    """A writable copy of the templates directory."""
+    copy = tmp_path / "templates"
+    shutil.copytree(TEMPLATES_DIR, copy)
+    return copy
+
+
+@pytest.fixture
+def write_sdrf(tmp_path):
+    """Write an SDRF file under tmp_path: write_sdrf(relative_path, text) -> Path."""
+
+    def write(relative_path, text):
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text.encode("utf-8"))
+        return path
+
+    return write
@@ -20,7 +20,7 @@ from typing import Any
 # Add scripts dir to path so we can import resolve_templates
 sys.path.insert(0, str(Path(__file__).parent))
 
-from resolve_templates import load_manifest, load_template_yaml
+from resolve_templates import load_compiled_templates
 
 # Marker used to identify the injected section
 MARKER_START = "// AUTO-GENERATED: Template Definitions (do not edit below this line)"
@@ -201,7 +201,8 @@ def generate_template_section(
 
 def generate_appendix(templates_dir: Path) -> str:
     """Generate the full AsciiDoc appendix content."""
-    manifest = load_manifest(templates_dir)
+    compiled = load_compiled_templates(templates_dir)
+    manifest = compiled["manifest"]
 
     lines: list[str] = []
     lines.append(MARKER_START)
@@ -230,8 +231,7 @@ def generate_appendix(templates_dir: Path) -> str:
 
     for name in ordered_names:
         entry = manifest[name]
-        version = entry["latest"]
-        tpl = load_template_yaml(templates_dir, name, version)
+        tpl = compiled["templates"][name]
         section = generate_template_section(name, tpl, entry)
         lines.append(section)
 
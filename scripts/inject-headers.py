@@ -12,6 +12,8 @@ import sys
 import re
 from pathlib import Path
 
+from build_profiling import StageProfiler, pop_profile_option
+
 
 # Version link placeholder — replaced at build time based on --dev flag
 VERSION_LINK_PLACEHOLDER = '{{VERSION_LINK}}'
@@ -79,8 +81,9 @@ def inject_version_link_into_static(filepath: str, is_dev: bool) -> None:
 
 
 def main():
+    profiler = StageProfiler.create("inject-headers", pop_profile_option(sys.argv))
     if len(sys.argv) < 2:
-        print("Usage: python3 inject-headers.py <output_dir> [--dev]")
+        print("Usage: python3 inject-headers.py <output_dir> [--dev] [--profile[=DIR]]")
         sys.exit(1)
 
     is_dev = '--dev' in sys.argv
@@ -88,53 +91,55 @@ def main():
 
     print(f"Dev mode: {is_dev}")
 
-    # Inject header into specification.html
-    spec_file = output_dir / "specification.html"
-    if spec_file.exists():
-        print(f"Injecting header into: {spec_file}")
-        inject_header(str(spec_file), HEADERS['root'], is_dev)
-
-    # Inject header into tools.html
-    tools_file = output_dir / "tools.html"
-    if tools_file.exists():
-        print(f"Injecting header into: {tools_file}")
-        inject_header(str(tools_file), HEADERS['tools'], is_dev)
-
-    # Inject header into sample-guidelines.html
-    sg_file = output_dir / "sample-guidelines.html"
-    if sg_file.exists():
-        print(f"Injecting header into: {sg_file}")
-        inject_header(str(sg_file), HEADERS['sample_guidelines'], is_dev)
-
-    # Inject header into templates.html (templates guide)
-    tpl_guide = output_dir / "templates.html"
-    if tpl_guide.exists():
-        print(f"Injecting header into: {tpl_guide}")
-        inject_header(str(tpl_guide), HEADERS['templates_guide'], is_dev)
-
-    # Inject headers into metadata-guidelines pages
-    guidelines_dir = output_dir / "metadata-guidelines"
-    if guidelines_dir.exists():
-        for html_file in guidelines_dir.glob("*.html"):
-            print(f"Injecting header into: {html_file}")
-            inject_header(str(html_file), HEADERS['guidelines'], is_dev)
-
-    # Inject headers into template pages
-    templates_dir = output_dir / "templates"
-    if templates_dir.exists():
-        for html_file in templates_dir.glob("*.html"):
-            print(f"Injecting header into: {html_file}")
-            inject_header(str(html_file), HEADERS['templates'], is_dev)
-
-    # Inject version link into static HTML pages for dev builds
-    for static_page in ["index.html", "quickstart.html", "sdrf-terms.html",
-                         "sdrf-explorer.html", "sdrf-editor.html", "sdrf-builder.html"]:
-        static_file = output_dir / static_page
-        if static_file.exists():
-            print(f"Processing version link in: {static_file}")
-            inject_version_link_into_static(str(static_file), is_dev)
+    with profiler.stage("inject"):
+        # Inject header into specification.html
+        spec_file = output_dir / "specification.html"
+        if spec_file.exists():
+            print(f"Injecting header into: {spec_file}")
+            inject_header(str(spec_file), HEADERS['root'], is_dev)
+
+        # Inject header into tools.html
+        tools_file = output_dir / "tools.html"
+        if tools_file.exists():
+            print(f"Injecting header into: {tools_file}")
+            inject_header(str(tools_file), HEADERS['tools'], is_dev)
+
+        # Inject header into sample-guidelines.html
+        sg_file = output_dir / "sample-guidelines.html"
+        if sg_file.exists():
+            print(f"Injecting header into: {sg_file}")
+            inject_header(str(sg_file), HEADERS['sample_guidelines'], is_dev)
+
+        # Inject header into templates.html (templates guide)
+        tpl_guide = output_dir / "templates.html"
+        if tpl_guide.exists():
+            print(f"Injecting header into: {tpl_guide}")
+            inject_header(str(tpl_guide), HEADERS['templates_guide'], is_dev)
+
+        # Inject headers into metadata-guidelines pages
+        guidelines_dir = output_dir / "metadata-guidelines"
+        if guidelines_dir.exists():
+            for html_file in guidelines_dir.glob("*.html"):
+                print(f"Injecting header into: {html_file}")
+                inject_header(str(html_file), HEADERS['guidelines'], is_dev)
+
+        # Inject headers into template pages
+        templates_dir = output_dir / "templates"
+        if templates_dir.exists():
+            for html_file in templates_dir.glob("*.html"):
+                print(f"Injecting header into: {html_file}")
+                inject_header(str(html_file), HEADERS['templates'], is_dev)
+
+        # Inject version link into static HTML pages for dev builds
+        for static_page in ["index.html", "quickstart.html", "sdrf-terms.html",
+                             "sdrf-explorer.html", "sdrf-editor.html", "sdrf-builder.html"]:
+            static_file = output_dir / static_page
+            if static_file.exists():
+                print(f"Processing version link in: {static_file}")
+                inject_version_link_into_static(str(static_file), is_dev)
 
     print("Header injection complete!")
+    profiler.report()
 
 
 if __name__ == "__main__":
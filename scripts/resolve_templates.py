@@ -7,25 +7,125 @@ and produces resolved template dicts with own, inherited, and merged columns.
 
 from __future__ import annotations
 
-import copy
+import functools
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+from collections.abc import Iterator, Mapping
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+# libyaml's C parser is several times faster than the pure-Python one;
+# fall back transparently when PyYAML was built without it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when the snapshot layout changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Order of the template layers, from the most general to the most specific
+LAYER_ORDER = {"technology": 0, "sample": 1, "experiment": 2}
+
+
+class ResolvedColumn(Mapping):
+    """Read-only merged column definition.
+
+    Behaves like the column dict from the template YAML plus a
+    'source_template' key. Merging an override builds a new column whose
+    untouched field values (validators, examples, descriptions, ...) are the
+    very same objects as in the parent column, so nothing is copied down the
+    inheritance chain. Nested values are shared and must not be mutated.
+    """
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, fields: dict[str, Any]) -> None:
+        object.__setattr__(self, "_fields", fields)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (self._fields,))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._fields!r})"
+
+    def derive(
+        self, overrides: Mapping[str, Any], source_template: str
+    ) -> ResolvedColumn:
+        """Return a new column with overrides applied on top of this one.
+
+        The 'name' key of overrides is ignored, it is the join key.
+        """
+        fields = dict(self._fields)
+        for key, value in overrides.items():
+            if key != "name":
+                fields[key] = value
+        fields["source_template"] = source_template
+        return ResolvedColumn(fields)
+
+
+def _load_yaml(path: Path) -> Any:
+    """Parse a YAML file with the fastest available safe loader."""
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def _is_snapshot(templates_dir: Path) -> bool:
+    """Whether templates_dir points at a snapshot file rather than a directory."""
+    return templates_dir.suffix == ".json" and templates_dir.is_file()
+
+
+def _load_snapshot(snapshot_path: Path) -> dict[str, Any]:
+    """Load a snapshot written by write_templates_snapshot, memoized per file."""
+    stat = snapshot_path.stat()
+    return _load_snapshot_cached(
+        str(snapshot_path.resolve()), stat.st_mtime_ns, stat.st_size
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _load_snapshot_cached(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("format") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported template snapshot format in {path}: "
+            f"{snapshot.get('format')!r} (expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+    return snapshot
+
 
 def load_manifest(templates_dir: Path) -> dict[str, dict]:
     """Load templates.yaml manifest and return the templates dict.
 
     Args:
-        templates_dir: Path to the sdrf-templates directory.
+        templates_dir: Path to the sdrf-templates directory, or to a
+            snapshot JSON file written by write_templates_snapshot.
 
     Returns:
         Dict mapping template name -> manifest entry (latest, versions, extends, etc.).
     """
-    manifest_path = templates_dir / "templates.yaml"
-    with open(manifest_path) as f:
-        data = yaml.safe_load(f)
+    if _is_snapshot(templates_dir):
+        return _load_snapshot(templates_dir)["manifest"]["templates"]
+    data = _load_yaml(templates_dir / "templates.yaml")
     return data["templates"]
 
 
@@ -35,16 +135,57 @@ def load_template_yaml(
     """Load a single template YAML file.
 
     Args:
-        templates_dir: Path to the sdrf-templates directory.
+        templates_dir: Path to the sdrf-templates directory, or to a
+            snapshot JSON file written by write_templates_snapshot.
         name: Template name (e.g. 'base', 'human').
         version: Exact version string (e.g. '1.1.0').
 
     Returns:
         Parsed YAML dict for the template.
     """
-    yaml_path = templates_dir / name / version / f"{name}.yaml"
-    with open(yaml_path) as f:
-        return yaml.safe_load(f)
+    if _is_snapshot(templates_dir):
+        try:
+            return _load_snapshot(templates_dir)["templates"][name][version]
+        except KeyError:
+            raise FileNotFoundError(
+                f"Template {name}@{version} not found in snapshot {templates_dir}"
+            ) from None
+    return _load_yaml(templates_dir / name / version / f"{name}.yaml")
+
+
+def write_templates_snapshot(templates_dir: Path, output_path: Path) -> int:
+    """Snapshot a whole sdrf-templates tree into one pre-parsed JSON file.
+
+    The snapshot holds templates.yaml plus every template version found on
+    disk, so any function taking a templates_dir also accepts the snapshot
+    path and never walks or parses YAML. Values JSON cannot represent
+    (e.g. YAML dates) are stored as strings.
+
+    Args:
+        templates_dir: Path to the sdrf-templates directory.
+        output_path: Where to write the snapshot JSON.
+
+    Returns:
+        Number of template versions written.
+    """
+    templates: dict[str, dict[str, Any]] = {}
+    count = 0
+    for yaml_path in sorted(templates_dir.glob("*/*/*.yaml")):
+        name, version = yaml_path.parent.parent.name, yaml_path.parent.name
+        if yaml_path.stem != name:
+            continue
+        templates.setdefault(name, {})[version] = _load_yaml(yaml_path)
+        count += 1
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "manifest": _load_yaml(templates_dir / "templates.yaml"),
+        "templates": templates,
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"), default=str)
+    return count
 
 
 def _parse_extends(extends_str: str | None) -> str | None:
@@ -58,6 +199,94 @@ def _parse_extends(extends_str: str | None) -> str | None:
     return extends_str.split("@")[0]
 
 
+def _parse_extends_constraint(
+    extends_str: str | None,
+) -> tuple[str | None, str | None]:
+    """Split an extends string like 'base@>=1.1.0' into name and constraint.
+
+    Returns (None, None) if extends_str is None, and a None constraint when
+    no '@' part is given.
+    """
+    if extends_str is None:
+        return None, None
+    name, _, constraint = extends_str.partition("@")
+    return name, constraint.strip() or None
+
+
+_CONSTRAINT_RE = re.compile(r"^(==|!=|>=|<=|>|<)?\s*([0-9][0-9A-Za-z.\-]*)$")
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    """Turn a 'MAJOR.MINOR.PATCH' string into a comparable tuple.
+
+    Non-numeric suffixes (e.g. '1.2.0-dev') are ignored for ordering.
+    """
+    parts = []
+    for part in version.split("-")[0].split("."):
+        digits = re.match(r"\d+", part)
+        parts.append(int(digits.group()) if digits else 0)
+    return tuple(parts)
+
+
+def version_satisfies(version: str, constraint: str | None) -> bool:
+    """Check a version against a constraint such as '>=1.1.0' or '>=1.0.0,<2.0.0'.
+
+    A bare version means '=='; comma-separated clauses must all hold.
+    A None or empty constraint is satisfied by every version.
+
+    Raises:
+        ValueError: If the constraint cannot be parsed.
+    """
+    if not constraint:
+        return True
+    key = _version_key(version)
+    for clause in constraint.split(","):
+        match = _CONSTRAINT_RE.match(clause.strip())
+        if match is None:
+            raise ValueError(f"Invalid version constraint: {constraint!r}")
+        op, bound = match.group(1) or "==", _version_key(match.group(2))
+        ok = {
+            "==": key == bound,
+            "!=": key != bound,
+            ">=": key >= bound,
+            "<=": key <= bound,
+            ">": key > bound,
+            "<": key < bound,
+        }[op]
+        if not ok:
+            return False
+    return True
+
+
+def select_version(
+    name: str, constraint: str | None, manifest: dict[str, dict]
+) -> str:
+    """Pick the highest manifest version of a template satisfying a constraint.
+
+    Args:
+        name: Template name.
+        constraint: Version constraint (e.g. '>=1.1.0'), or None for latest.
+        manifest: The loaded manifest dict.
+
+    Returns:
+        The selected version string.
+
+    Raises:
+        ValueError: If no listed version satisfies the constraint.
+    """
+    entry = manifest[name]
+    if constraint is None:
+        return entry["latest"]
+    versions = entry.get("versions") or [entry["latest"]]
+    candidates = [v for v in versions if version_satisfies(str(v), constraint)]
+    if not candidates:
+        raise ValueError(
+            f"No version of template '{name}' satisfies '{constraint}' "
+            f"(available: {', '.join(str(v) for v in versions)})"
+        )
+    return str(max(candidates, key=lambda v: _version_key(str(v))))
+
+
 def build_inheritance_chain(
     name: str,
     manifest: dict[str, dict],
@@ -85,73 +314,83 @@ def build_inheritance_chain(
     return chain
 
 
-def _merge_single_column(
-    parent_col: dict[str, Any], child_col: dict[str, Any]
-) -> dict[str, Any]:
-    """Merge a child column override onto a parent column.
-
-    Child inherits ALL parent properties via copy, then overrides only
-    the fields explicitly specified in child_col.
-    """
-    merged = copy.deepcopy(parent_col)
-    for key, value in child_col.items():
-        if key == "name":
-            continue  # name is the join key, always keep
-        merged[key] = copy.deepcopy(value)
-    return merged
+def topological_order(manifest: dict[str, dict]) -> list[str]:
+    """Order template names so that every parent precedes its children.
 
+    Siblings keep their manifest order, so the result is deterministic.
 
-def merge_columns(
-    chain: list[str],
-    manifest: dict[str, dict],
-    templates_dir: Path,
-) -> tuple[list[dict], list[dict], list[dict]]:
-    """Walk the inheritance chain and merge columns.
+    Args:
+        manifest: The loaded manifest dict.
 
     Returns:
-        Tuple of (own_columns, inherited_columns, all_columns).
-        Each column dict includes a 'source_template' annotation.
+        List of template names, roots first.
+
+    Raises:
+        ValueError: If the extends: graph contains a cycle.
     """
-    if not chain:
-        return [], [], []
+    order: list[str] = []
+    state: dict[str, str] = {}  # name -> "visiting" | "done"
+
+    for start in manifest:
+        path: list[str] = []
+        current: str | None = start
+        # Walk up to the first ancestor that is already ordered
+        while current is not None and state.get(current) != "done":
+            if state.get(current) == "visiting":
+                cycle = path[path.index(current):] + [current]
+                raise ValueError(f"Cyclic extends: chain: {' -> '.join(cycle)}")
+            state[current] = "visiting"
+            path.append(current)
+            current = _parse_extends(manifest[current].get("extends"))
+        for tname in reversed(path):
+            state[tname] = "done"
+            order.append(tname)
+    return order
+
+
+def _merge_template_columns(
+    parent_columns: dict[str, ResolvedColumn],
+    tpl: dict[str, Any],
+    tname: str,
+) -> dict[str, ResolvedColumn]:
+    """Apply one template's columns on top of its parent's merged columns.
+
+    The parent map is left untouched; columns the template does not mention
+    are shared with it by reference, and overridden columns share every
+    field value the override does not replace.
 
-    # Load all templates in the chain
-    loaded: dict[str, dict] = {}
-    for tname in chain:
-        entry = manifest[tname]
-        version = entry["latest"]
-        loaded[tname] = load_template_yaml(templates_dir, tname, version)
+    Args:
+        parent_columns: Merged column map of the parent (empty for roots).
+        tpl: Parsed YAML of the template being applied.
+        tname: Name of the template being applied.
 
-    # Build merged column list by walking chain from root to leaf
-    # merged_columns: ordered dict of name -> column dict
-    merged_columns: dict[str, dict[str, Any]] = {}
+    Returns:
+        Ordered dict of column name -> merged column, parent order first.
+    """
+    merged_columns = dict(parent_columns)
+    for col in tpl.get("columns", []):
+        col_name = col["name"]
+        # source_template is this template (last one to define/override)
+        if col_name in merged_columns:
+            # Merge: child overrides parent
+            merged_columns[col_name] = merged_columns[col_name].derive(col, tname)
+        else:
+            # New column
+            merged_columns[col_name] = ResolvedColumn({**col, "source_template": tname})
+    return merged_columns
 
-    # Track which template originally defined or last overrode each column
-    for tname in chain:
-        tpl = loaded[tname]
-        tpl_columns = tpl.get("columns", [])
-        for col in tpl_columns:
-            col_name = col["name"]
-            if col_name in merged_columns:
-                # Merge: child overrides parent
-                merged_columns[col_name] = _merge_single_column(
-                    merged_columns[col_name], col
-                )
-            else:
-                # New column
-                merged_columns[col_name] = copy.deepcopy(col)
-            # Update source_template to this template (last one to define/override)
-            merged_columns[col_name]["source_template"] = tname
 
-    # The leaf template is the last in the chain
-    leaf_name = chain[-1]
-    leaf_col_names = {
-        col["name"] for col in loaded[leaf_name].get("columns", [])
-    }
+def _split_columns(
+    merged_columns: dict[str, ResolvedColumn],
+    parent_columns: dict[str, ResolvedColumn],
+    tpl: dict[str, Any],
+) -> tuple[list[ResolvedColumn], list[ResolvedColumn], list[ResolvedColumn]]:
+    """Separate a merged column map into own, inherited and all columns."""
+    leaf_col_names = {col["name"] for col in tpl.get("columns", [])}
 
     # Separate own vs inherited
-    own_columns: list[dict] = []
-    inherited_columns: list[dict] = []
+    own_columns: list[ResolvedColumn] = []
+    inherited_columns: list[ResolvedColumn] = []
     for col_name, col in merged_columns.items():
         if col_name in leaf_col_names:
             own_columns.append(col)
@@ -160,49 +399,59 @@ def merge_columns(
 
     # all_columns: inherited order first, then own additions
     # "own" columns that override a parent column keep their inherited position
-    all_columns: list[dict] = []
-    own_addition_names = leaf_col_names - {
-        col["name"]
-        for tname in chain[:-1]
-        for col in loaded[tname].get("columns", [])
-    }
-    for col_name, col in merged_columns.items():
-        if col_name not in own_addition_names:
-            all_columns.append(col)
+    own_addition_names = leaf_col_names - parent_columns.keys()
+    all_columns: list[ResolvedColumn] = [
+        col
+        for col_name, col in merged_columns.items()
+        if col_name not in own_addition_names
+    ]
     # Then append own additions (new columns not in any parent)
-    for col_name, col in merged_columns.items():
-        if col_name in own_addition_names:
-            all_columns.append(col)
+    all_columns.extend(
+        col
+        for col_name, col in merged_columns.items()
+        if col_name in own_addition_names
+    )
 
     return own_columns, inherited_columns, all_columns
 
 
-def resolve_template(
-    name: str,
+def merge_columns(
+    chain: list[str],
+    manifest: dict[str, dict],
     templates_dir: Path,
-    manifest: dict[str, dict] | None = None,
-) -> dict[str, Any]:
-    """Resolve a single template with full inheritance.
-
-    Args:
-        name: Template name.
-        templates_dir: Path to sdrf-templates directory.
-        manifest: Optional pre-loaded manifest (loaded if None).
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Walk the inheritance chain and merge columns.
 
     Returns:
-        Resolved template dict with all metadata and merged columns.
+        Tuple of (own_columns, inherited_columns, all_columns).
+        Each column is a ResolvedColumn including a 'source_template' key.
     """
-    if manifest is None:
-        manifest = load_manifest(templates_dir)
+    if not chain:
+        return [], [], []
 
-    entry = manifest[name]
-    version = entry["latest"]
-    tpl = load_template_yaml(templates_dir, name, version)
-    chain = build_inheritance_chain(name, manifest, templates_dir)
-    own_columns, inherited_columns, all_columns = merge_columns(
-        chain, manifest, templates_dir
-    )
+    # Build merged column map by walking chain from root to leaf
+    parent_columns: dict[str, ResolvedColumn] = {}
+    merged_columns: dict[str, ResolvedColumn] = {}
+    for tname in chain:
+        tpl = load_template_yaml(templates_dir, tname, manifest[tname]["latest"])
+        parent_columns = merged_columns
+        merged_columns = _merge_template_columns(parent_columns, tpl, tname)
 
+    # The leaf template is the last in the chain
+    return _split_columns(merged_columns, parent_columns, tpl)
+
+
+def _build_resolved(
+    name: str,
+    entry: dict[str, Any],
+    tpl: dict[str, Any],
+    version: str,
+    chain: list[str],
+    chain_versions: list[str],
+    columns: tuple[list[ResolvedColumn], list[ResolvedColumn], list[ResolvedColumn]],
+) -> dict[str, Any]:
+    """Assemble the resolved template dict from its parts."""
+    own_columns, inherited_columns, all_columns = columns
     return {
         "name": tpl["name"],
         "description": tpl.get("description", ""),
@@ -216,22 +465,474 @@ def resolve_template(
         "requires": entry.get("requires"),
         "excludes": entry.get("excludes"),
         "inheritance_chain": chain,
+        "inheritance_versions": chain_versions,
         "own_columns": own_columns,
         "inherited_columns": inherited_columns,
         "all_columns": all_columns,
     }
 
 
+def resolve_template(
+    name: str,
+    templates_dir: Path,
+    manifest: dict[str, dict] | None = None,
+) -> dict[str, Any]:
+    """Resolve a single template with full inheritance.
+
+    Args:
+        name: Template name.
+        templates_dir: Path to sdrf-templates directory.
+        manifest: Optional pre-loaded manifest (loaded if None).
+
+    Returns:
+        Resolved template dict with all metadata and merged columns.
+    """
+    if manifest is None:
+        manifest = load_manifest(templates_dir)
+
+    entry = manifest[name]
+    tpl = load_template_yaml(templates_dir, name, entry["latest"])
+    chain = build_inheritance_chain(name, manifest, templates_dir)
+    columns = merge_columns(chain, manifest, templates_dir)
+    chain_versions = [manifest[tname]["latest"] for tname in chain]
+    return _build_resolved(
+        name, entry, tpl, entry["latest"], chain, chain_versions, columns
+    )
+
+
+def _resolve_node(
+    name: str,
+    manifest: dict[str, dict],
+    tpl: dict[str, Any],
+    chains: dict[str, list[str]],
+    merged_maps: dict[str, dict[str, ResolvedColumn]],
+) -> dict[str, Any]:
+    """Resolve one template whose parent is already in chains/merged_maps.
+
+    Records the template's own chain and merged column map in place so its
+    children can build on them.
+    """
+    entry = manifest[name]
+    parent_name = _parse_extends(entry.get("extends"))
+    parent_columns = merged_maps[parent_name] if parent_name else {}
+    chains[name] = (chains[parent_name] if parent_name else []) + [name]
+    merged_maps[name] = _merge_template_columns(parent_columns, tpl, name)
+    columns = _split_columns(merged_maps[name], parent_columns, tpl)
+    chain_versions = [manifest[tname]["latest"] for tname in chains[name]]
+    return _build_resolved(
+        name, entry, tpl, entry["latest"], chains[name], chain_versions, columns
+    )
+
+
+def _resolve_loaded(
+    manifest: dict[str, dict],
+    loaded: dict[str, dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Resolve every template from already-parsed YAML documents.
+
+    Args:
+        manifest: The loaded manifest dict.
+        loaded: Dict mapping template name -> parsed YAML of its latest version.
+
+    Returns:
+        Dict mapping template name -> resolved template dict, in manifest order.
+    """
+    chains: dict[str, list[str]] = {}
+    merged_maps: dict[str, dict[str, ResolvedColumn]] = {}
+    resolved: dict[str, dict[str, Any]] = {}
+    for name in topological_order(manifest):
+        resolved[name] = _resolve_node(name, manifest, loaded[name], chains, merged_maps)
+
+    return {name: resolved[name] for name in manifest}
+
+
 def resolve_all(
     templates_dir: Path,
 ) -> dict[str, dict[str, Any]]:
     """Resolve all templates from the manifest.
 
+    Each template YAML is parsed exactly once. Templates are resolved in
+    topological order so every child starts from its parent's already-merged
+    column map instead of re-walking the whole chain. Columns a child does
+    not override are the same ResolvedColumn objects as in the parent's
+    resolved template.
+
     Returns:
-        Dict mapping template name -> resolved template dict.
+        Dict mapping template name -> resolved template dict, in manifest order.
     """
     manifest = load_manifest(templates_dir)
-    result: dict[str, dict[str, Any]] = {}
-    for name in manifest:
-        result[name] = resolve_template(name, templates_dir, manifest=manifest)
+    loaded = {
+        name: load_template_yaml(templates_dir, name, entry["latest"])
+        for name, entry in manifest.items()
+    }
+    return _resolve_loaded(manifest, loaded)
+
+
+# --- Incremental re-resolution ---
+
+
+def build_dependency_graph(manifest: dict[str, dict]) -> dict[str, list[str]]:
+    """Map every template to the templates that directly extend it.
+
+    Args:
+        manifest: The loaded manifest dict.
+
+    Returns:
+        Dict mapping parent name -> list of child names, in manifest order.
+    """
+    graph: dict[str, list[str]] = {name: [] for name in manifest}
+    for name, entry in manifest.items():
+        parent_name = _parse_extends(entry.get("extends"))
+        if parent_name is not None:
+            graph.setdefault(parent_name, []).append(name)
+    return graph
+
+
+def descendants(graph: dict[str, list[str]], names: set[str]) -> set[str]:
+    """Return the given templates plus everything that inherits from them."""
+    result: set[str] = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name in result:
+            continue
+        result.add(name)
+        stack.extend(graph.get(name, []))
     return result
+
+
+class IncrementalResolver:
+    """Keep a resolved template tree up to date as YAML files change.
+
+    The first refresh() resolves everything. Later calls re-parse only the
+    template files whose content changed and re-resolve those templates and
+    their descendants, reusing every other template's merged columns. An
+    edit to templates.yaml falls back to a full rebuild.
+
+    Attributes:
+        manifest: The current manifest dict.
+        graph: Parent -> children dependency graph from extends: fields.
+        resolved: Dict mapping template name -> resolved template dict.
+
+    Raises:
+        ValueError: If templates_dir is a snapshot file, which has no YAML
+            files to watch.
+    """
+
+    def __init__(self, templates_dir: Path) -> None:
+        if _is_snapshot(templates_dir):
+            raise ValueError(
+                f"{templates_dir} is a templates snapshot; "
+                "incremental rebuilds need the sdrf-templates directory"
+            )
+        self.templates_dir = templates_dir
+        self.manifest: dict[str, dict] = {}
+        self.graph: dict[str, list[str]] = {}
+        self.resolved: dict[str, dict[str, Any]] = {}
+        self._loaded: dict[str, dict[str, Any]] = {}
+        self._chains: dict[str, list[str]] = {}
+        self._merged: dict[str, dict[str, ResolvedColumn]] = {}
+        # path -> ((mtime_ns, size), sha256 of content)
+        self._stamps: dict[Path, tuple[tuple[int, int], str]] = {}
+
+    def _template_path(self, name: str) -> Path:
+        version = self.manifest[name]["latest"]
+        return self.templates_dir / name / version / f"{name}.yaml"
+
+    def _has_changed(self, path: Path) -> bool:
+        """Check a file against its last seen stamp, updating the stamp.
+
+        The mtime/size pair is checked first so untouched files are never
+        read; a content hash then filters out touches that changed nothing.
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            changed = path in self._stamps
+            self._stamps.pop(path, None)
+            return changed
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        previous = self._stamps.get(path)
+        if previous is not None and previous[0] == stamp:
+            return False
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._stamps[path] = (stamp, digest)
+        return previous is None or previous[1] != digest
+
+    def refresh(self) -> set[str]:
+        """Re-resolve whatever changed since the previous call.
+
+        Returns:
+            Names of templates whose resolved output changed, including
+            templates that were removed from the manifest (no longer in
+            self.resolved). Empty if nothing changed.
+
+        Raises:
+            Whatever loading or resolving a template raises. The changes
+            seen by the failed call are then forgotten, so the next call
+            picks them up again.
+        """
+        manifest, stamps = self.manifest, dict(self._stamps)
+        try:
+            return self._refresh()
+        except Exception:
+            self.manifest, self._stamps = manifest, stamps
+            raise
+
+    def _refresh(self) -> set[str]:
+        if self._has_changed(self.templates_dir / "templates.yaml") or not self.manifest:
+            previous_names = set(self.manifest)
+            self.manifest = load_manifest(self.templates_dir)
+            self.graph = build_dependency_graph(self.manifest)
+            self._loaded.clear()
+            self._chains.clear()
+            self._merged.clear()
+            self.resolved.clear()
+            for name in self.manifest:
+                self._has_changed(self._template_path(name))
+            changed = set(self.manifest)
+            affected = changed | previous_names
+        else:
+            changed = {
+                name
+                for name in self.manifest
+                if self._has_changed(self._template_path(name))
+            }
+            affected = descendants(self.graph, changed)
+
+        for name in changed:
+            self._loaded[name] = load_template_yaml(
+                self.templates_dir, name, self.manifest[name]["latest"]
+            )
+        for name in topological_order(self.manifest):
+            if name in affected:
+                self.resolved[name] = _resolve_node(
+                    name, self.manifest, self._loaded[name], self._chains, self._merged
+                )
+        self.resolved = {name: self.resolved[name] for name in self.manifest}
+        return affected
+
+
+# --- Resolution of arbitrary template versions ---
+
+
+class TemplateVersionResolver:
+    """Resolve any (name, version) pair of a template tree.
+
+    Unlike resolve_all, which always pairs latest with latest, each node's
+    parent version is the highest one satisfying the constraint of its own
+    extends: field (e.g. 'sample-metadata@>=1.0.0'). Parsed YAML, merged
+    column maps and resolved templates are memoized per (name, version), so
+    resolving every version in the manifest touches each node only once.
+    """
+
+    def __init__(
+        self, templates_dir: Path, manifest: dict[str, dict] | None = None
+    ) -> None:
+        self.templates_dir = templates_dir
+        self.manifest = manifest if manifest is not None else load_manifest(templates_dir)
+        self._yaml: dict[tuple[str, str], dict[str, Any]] = {}
+        self._nodes: dict[tuple[str, str], dict[str, Any]] = {}
+        self._merged: dict[tuple[str, str], dict[str, ResolvedColumn]] = {}
+        self._in_progress: set[tuple[str, str]] = set()
+
+    def _load(self, name: str, version: str) -> dict[str, Any]:
+        key = (name, version)
+        if key not in self._yaml:
+            self._yaml[key] = load_template_yaml(self.templates_dir, name, version)
+        return self._yaml[key]
+
+    def parent_of(self, name: str, version: str) -> tuple[str, str] | None:
+        """Return the (name, version) node a template version extends, or None."""
+        tpl = self._load(name, version)
+        extends = tpl.get("extends", self.manifest[name].get("extends"))
+        parent_name, constraint = _parse_extends_constraint(extends)
+        if parent_name is None:
+            return None
+        return parent_name, select_version(parent_name, constraint, self.manifest)
+
+    def resolve(self, name: str, version: str | None = None) -> dict[str, Any]:
+        """Resolve one template version with full inheritance.
+
+        Args:
+            name: Template name.
+            version: Exact version string; defaults to the manifest latest.
+
+        Returns:
+            Resolved template dict, same layout as resolve_template().
+
+        Raises:
+            ValueError: If a parent constraint cannot be satisfied or the
+                extends: chain is cyclic.
+        """
+        entry = self.manifest[name]
+        version = str(version or entry["latest"])
+        key = (name, version)
+        if key in self._nodes:
+            return self._nodes[key]
+        if key in self._in_progress:
+            raise ValueError(f"Cyclic extends: chain at {name}@{version}")
+        self._in_progress.add(key)
+        try:
+            tpl = self._load(name, version)
+            parent = self.parent_of(name, version)
+            if parent is None:
+                chain, chain_versions = [name], [version]
+                parent_columns: dict[str, ResolvedColumn] = {}
+            else:
+                parent_resolved = self.resolve(*parent)
+                chain = parent_resolved["inheritance_chain"] + [name]
+                chain_versions = parent_resolved["inheritance_versions"] + [version]
+                parent_columns = self._merged[parent]
+        finally:
+            self._in_progress.discard(key)
+
+        self._merged[key] = _merge_template_columns(parent_columns, tpl, name)
+        columns = _split_columns(self._merged[key], parent_columns, tpl)
+        self._nodes[key] = _build_resolved(
+            name, entry, tpl, version, chain, chain_versions, columns
+        )
+        return self._nodes[key]
+
+    def resolve_all_versions(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """Resolve every version listed in the manifest.
+
+        Returns:
+            Dict mapping (name, version) -> resolved template dict.
+        """
+        result: dict[tuple[str, str], dict[str, Any]] = {}
+        for name, entry in self.manifest.items():
+            for version in entry.get("versions") or [entry["latest"]]:
+                result[(name, str(version))] = self.resolve(name, str(version))
+        return result
+
+
+def resolve_template_version(
+    name: str,
+    version: str,
+    templates_dir: Path,
+    manifest: dict[str, dict] | None = None,
+) -> dict[str, Any]:
+    """Resolve a specific template version, honouring extends: constraints.
+
+    Convenience wrapper around TemplateVersionResolver for one-off lookups.
+    """
+    return TemplateVersionResolver(templates_dir, manifest).resolve(name, version)
+
+
+# --- On-disk cache shared by the build scripts ---
+
+# Bump when the cached payload layout changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "sdrf-templates"
+
+
+def templates_fingerprint(templates_dir: Path) -> str:
+    """Compute a content hash of templates.yaml and every template YAML.
+
+    The resolver source itself is part of the hash, so a change to the
+    merge rules also invalidates previously cached results.
+
+    Args:
+        templates_dir: Path to the sdrf-templates directory, or to a
+            snapshot JSON file (hashed as a whole).
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"format={CACHE_FORMAT_VERSION}\n".encode())
+    digest.update(Path(__file__).read_bytes())
+    if _is_snapshot(templates_dir):
+        digest.update(templates_dir.read_bytes())
+        return digest.hexdigest()
+    yaml_paths = sorted(
+        p
+        for p in templates_dir.rglob("*.yaml")
+        if not any(part.startswith(".") for part in p.relative_to(templates_dir).parts)
+    )
+    for yaml_path in yaml_paths:
+        digest.update(yaml_path.relative_to(templates_dir).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(yaml_path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def compile_templates(templates_dir: Path) -> dict[str, Any]:
+    """Load and resolve the whole template tree.
+
+    Returns:
+        Dict with 'manifest', 'templates' (parsed YAML of each latest
+        version) and 'resolved' (output of resolve_all).
+    """
+    manifest = load_manifest(templates_dir)
+    loaded = {
+        name: load_template_yaml(templates_dir, name, entry["latest"])
+        for name, entry in manifest.items()
+    }
+    return {
+        "manifest": manifest,
+        "templates": loaded,
+        "resolved": _resolve_loaded(manifest, loaded),
+    }
+
+
+def load_compiled_templates(
+    templates_dir: Path,
+    cache_dir: Path | None = None,
+) -> dict[str, Any]:
+    """Return compile_templates() output, reusing an on-disk cache when valid.
+
+    The cache is keyed by templates_fingerprint(), so the first build script
+    in a run resolves the tree and every later one loads the pickled result.
+    A cache written for different template contents is ignored and replaced.
+    Entries are also named after a hash of the source path, so caches of
+    other sources sharing the directory (e.g. a snapshot and the live tree)
+    are kept.
+
+    The cache location defaults to DEFAULT_CACHE_DIR and can be overridden
+    with the SDRF_TEMPLATES_CACHE_DIR environment variable. Setting
+    SDRF_TEMPLATES_CACHE=0 disables the cache entirely.
+
+    Args:
+        templates_dir: Path to the sdrf-templates directory.
+        cache_dir: Optional cache directory (overrides the environment).
+
+    Returns:
+        Dict with 'manifest', 'templates' and 'resolved' keys.
+    """
+    if os.environ.get("SDRF_TEMPLATES_CACHE", "1") == "0":
+        return compile_templates(templates_dir)
+    if cache_dir is None:
+        cache_dir = Path(os.environ.get("SDRF_TEMPLATES_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+    source = hashlib.sha256(str(Path(templates_dir).resolve()).encode()).hexdigest()[:12]
+    key = templates_fingerprint(templates_dir)
+    cache_path = cache_dir / f"compiled-{source}-{key}.pickle"
+    if cache_path.exists():
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass  # Corrupt or unreadable cache: rebuild below
+
+    compiled = compile_templates(templates_dir)
+    tmp_name = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Drop caches built from older contents of the same source
+        for stale in cache_dir.glob(f"compiled-{source}-*.pickle"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+        # Write atomically so a concurrent reader never sees a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+    except OSError as e:
+        if tmp_name is not None and os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        print(f"Warning: could not write template cache to {cache_dir}: {e}")
+    return compiled
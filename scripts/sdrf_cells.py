@@ -0,0 +1,74 @@
+"""
+Structured parsing of SDRF key=value cells.
+
+Ontology-backed SDRF cells pack several keys into one string, e.g.
+'NT=Oxidation;AC=UNIMOD:35;MT=Variable;TA=M' for a modification or
+'NT=Trypsin;AC=MS:1001251;CS=(?<=[KR])(?!P)' for a cleavage agent.
+parse_cell() splits such a cell into all of its keys once; results are kept
+in an LRU cache, so the many rows of a dataset that repeat the same value
+cost a single parse.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
+# Upper bound on the number of distinct cell strings kept parsed in memory
+CELL_CACHE_SIZE = 1 << 16
+
+# A key is two upper-case letters: NT, AC, MT, TA, PP, CS, CF, MM, TS, ...
+_KEY_RE = re.compile(r"^([A-Z]{2})=(.*)$", re.DOTALL)
+
+
+@lru_cache(maxsize=CELL_CACHE_SIZE)
+def parse_cell(value: str) -> Mapping[str, str]:
+    """Split an SDRF cell into its keys.
+
+    Parts are separated by ';'. A part that does not start with a key
+    continues the previous value, so ';' inside a value (as in some CS
+    regular expressions) is kept; empty parts, such as the one after a
+    trailing ';', are ignored. Text before the first key, as in
+    'Homo sapiens;AC=NCBITaxon:9606', is returned as NT unless the cell
+    also has an explicit NT. A plain value without keys parses to
+    {'NT': value}.
+
+    Returns:
+        Read-only mapping of key to stripped value. The result is shared
+        between callers through the cache and must not be modified.
+    """
+    fields: dict[str, str] = {}
+    leading: list[str] = []
+    key = None
+    for part in value.split(";"):
+        # Empty parts, as left by a trailing ';', carry no text
+        if not part.strip():
+            continue
+        match = _KEY_RE.match(part.strip())
+        if match:
+            key = match.group(1)
+            fields[key] = match.group(2).strip()
+        elif key is None:
+            leading.append(part)
+        else:
+            fields[key] = f"{fields[key]};{part.strip()}"
+
+    if leading and "NT" not in fields:
+        fields = {"NT": ";".join(leading).strip(), **fields}
+    return MappingProxyType(fields)
+
+
+def term_name(value: str) -> str:
+    """Return the term name (NT) of a cell, or the value when it has none."""
+    if not value:
+        return value
+    return parse_cell(value).get("NT") or value
+
+
+def term_accession(value: str) -> str | None:
+    """Return the ontology accession (AC) of a cell, if any."""
+    if not value:
+        return None
+    return parse_cell(value).get("AC")
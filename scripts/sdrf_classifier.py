@@ -0,0 +1,88 @@
+"""
+Vocabulary-driven classification of SDRF datasets.
+
+The dataset index labels each dataset with an experiment type (DDA, DIA,
+SRM/MRM) and a label type (TMT, iTRAQ, SILAC, label-free). The terms and
+ontology accessions behind each class live in sdrf_vocabulary.json, so a
+new acquisition mode or plex is a data change. Per facet, all terms are
+compiled into one alternation; a term only matches as a whole word (it may
+be followed by digits, as in 'TMT126'), so 'dia' no longer matches inside
+'media'. Each distinct cell value is classified once and kept in a bounded
+LRU cache, like the parsed cells of sdrf_cells.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+
+from sdrf_cells import CELL_CACHE_SIZE, term_accession, term_name
+
+VOCABULARY_PATH = Path(__file__).with_name("sdrf_vocabulary.json")
+
+
+class KeywordClassifier:
+    """Maps cell values of one column to the classes of a vocabulary facet.
+
+    Classes are listed in priority order: when a value, or the set of values
+    of a dataset, matches several classes, the first one listed wins.
+    """
+
+    def __init__(self, spec: dict) -> None:
+        self.column: str = spec["column"]
+        self.default: str = spec["default"]
+        self.classes: list[str] = [cls["name"] for cls in spec["classes"]]
+        # Matched text (lower case) or accession -> class priority
+        self._terms: dict[str, int] = {}
+        self._accessions: dict[str, int] = {}
+        for priority, cls in enumerate(spec["classes"]):
+            for term in cls.get("terms", []):
+                self._terms.setdefault(term.lower(), priority)
+            for accession in cls.get("accessions", []):
+                self._accessions.setdefault(accession.upper(), priority)
+        # Longest terms first, so 'data-independent' is preferred over 'dia'
+        alternation = "|".join(
+            re.escape(term) for term in sorted(self._terms, key=len, reverse=True)
+        )
+        self._pattern = re.compile(rf"(?<![a-z])(?:{alternation})(?![a-z])", re.IGNORECASE)
+        # Bounded, as the distinct cell values of a large corpus are not
+        self._priority = lru_cache(maxsize=CELL_CACHE_SIZE)(self._match_priority)
+
+    def _match_priority(self, value: str) -> int | None:
+        accession = term_accession(value)
+        priority = self._accessions.get(accession.upper()) if accession else None
+        if priority is None:
+            matches = [
+                self._terms[match.group(0).lower()]
+                for match in self._pattern.finditer(term_name(value))
+            ]
+            priority = min(matches, default=None)
+        return priority
+
+    def classify(self, value: str) -> str | None:
+        """Class of a single cell value, or None if no term or accession matches."""
+        priority = self._priority(value)
+        return None if priority is None else self.classes[priority]
+
+    def classify_values(self, values: Iterable[str]) -> str:
+        """Class of a dataset from its distinct values of the column.
+
+        Returns:
+            The highest-priority class matched by any value, or the default.
+        """
+        priorities = [p for p in map(self._priority, values) if p is not None]
+        return self.classes[min(priorities)] if priorities else self.default
+
+
+def load_classifiers(path: Path = VOCABULARY_PATH) -> dict[str, KeywordClassifier]:
+    """Compile every facet of a vocabulary file.
+
+    Returns:
+        Dict mapping the facet name (the dataset entry field) to its classifier.
+    """
+    with open(path, encoding="utf-8") as f:
+        vocabulary = json.load(f)
+    return {facet: KeywordClassifier(spec) for facet, spec in vocabulary.items()}
@@ -0,0 +1,294 @@
+"""
+Columnar export of every sample row of the annotated SDRF corpus.
+
+The index builder only keeps aggregates. This module streams every row of
+every SDRF file into one dictionary-encoded column store, tagged with the
+dataset ID and file name, so cross-study questions ("all HeLa samples run
+on an Orbitrap Exploris 480") become a few integer scans instead of
+re-parsing thousands of TSV files.
+
+Each column is a list of distinct values plus one int32 code per row
+(-1 where the row's file has no such column). Stores are written as
+Parquet when pyarrow is installed, or as a NumPy .npz archive otherwise;
+both are optional dependencies and only imported when writing or loading.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from sdrf_cells import term_name
+
+# Columns added to every row of the store
+DATASET_COLUMN = "dataset_id"
+FILE_COLUMN = "file"
+
+MISSING = -1
+
+
+def read_sdrf_preamble(f) -> tuple[dict[str, str], list[str] | None]:
+    """Read the '#key=value' metadata lines and the column header line.
+
+    Consumes the file object up to and including the header line, so the
+    caller can keep iterating over it for the data rows.
+
+    Returns:
+        (metadata, headers) tuple; headers is None when the file has no header line.
+    """
+    metadata: dict[str, str] = {}
+    started = False
+    for line in f:
+        stripped = line.strip()
+        if not stripped and not started:
+            # Skip blank lines at the start of the file
+            continue
+        started = True
+        if stripped.startswith("#"):
+            match = re.match(r"^#(\w+)=(.+)$", stripped)
+            if match:
+                metadata[match.group(1)] = match.group(2)
+            continue
+        headers = [h.strip().lower() for h in line.split("\t")]
+        return metadata, headers
+    return metadata, None
+
+
+def iter_sdrf_rows(f, num_columns: int) -> Iterator[list[str]]:
+    """Yield the stripped cell values of each data row, padded to num_columns."""
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        values = [v.strip() for v in line.split("\t")[:num_columns]]
+        if len(values) < num_columns:
+            values.extend([""] * (num_columns - len(values)))
+        yield values
+
+
+def unique_column_names(headers: list[str]) -> list[str]:
+    """Make repeated headers unique: 'name', 'name.1', 'name.2', ..."""
+    seen: dict[str, int] = {}
+    names = []
+    for header in headers:
+        count = seen.get(header, 0)
+        seen[header] = count + 1
+        names.append(header if count == 0 else f"{header}.{count}")
+    return names
+
+
+class CorpusBuilder:
+    """Accumulates SDRF rows into dictionary-encoded columns.
+
+    Columns are the union of all files' headers; a column first seen in a
+    later file is back-filled with MISSING for the rows already added.
+    """
+
+    def __init__(self) -> None:
+        self.num_rows = 0
+        self.codes: dict[str, array] = {}
+        self.values: dict[str, list[str]] = {}
+        self._lookup: dict[str, dict[str, int]] = {}
+        for name in (DATASET_COLUMN, FILE_COLUMN):
+            self._column(name)
+
+    def _column(self, name: str) -> tuple[array, dict[str, int], list[str]]:
+        if name not in self.codes:
+            self.codes[name] = array("i", [MISSING]) * self.num_rows
+            self.values[name] = []
+            self._lookup[name] = {}
+        return self.codes[name], self._lookup[name], self.values[name]
+
+    def _encode(self, name: str, value: str) -> int:
+        _, lookup, values = self._column(name)
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(values)
+            values.append(value)
+        return code
+
+    def add_file(self, filepath: Path, dataset_id: str) -> int:
+        """Stream one SDRF file into the store.
+
+        Returns:
+            Number of rows added.
+        """
+        with open(filepath, encoding="utf-8", errors="replace") as f:
+            _, headers = read_sdrf_preamble(f)
+            if headers is None:
+                return 0
+            columns = [self._column(name) for name in unique_column_names(headers)]
+            added = 0
+            for values in iter_sdrf_rows(f, len(headers)):
+                for (codes, lookup, distinct), value in zip(columns, values):
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(distinct)
+                        distinct.append(value)
+                    codes.append(code)
+                added += 1
+
+        dataset_code = self._encode(DATASET_COLUMN, dataset_id)
+        file_code = self._encode(FILE_COLUMN, Path(filepath).name)
+        self.codes[DATASET_COLUMN].extend(array("i", [dataset_code]) * added)
+        self.codes[FILE_COLUMN].extend(array("i", [file_code]) * added)
+        self.num_rows += added
+        # Columns this file does not have
+        for codes in self.codes.values():
+            if len(codes) < self.num_rows:
+                codes.extend(array("i", [MISSING]) * (self.num_rows - len(codes)))
+        return added
+
+    def build(self) -> SDRFCorpus:
+        return SDRFCorpus(
+            {name: (self.codes[name], self.values[name]) for name in self.codes},
+            self.num_rows,
+        )
+
+
+class SDRFCorpus:
+    """Dictionary-encoded SDRF rows with simple term lookups."""
+
+    def __init__(
+        self, columns: dict[str, tuple[array, list[str]]], num_rows: int
+    ) -> None:
+        self.columns = columns
+        self.num_rows = num_rows
+
+    @classmethod
+    def from_files(cls, files: Iterable[tuple[str, Path]]) -> SDRFCorpus:
+        """Build a corpus from (dataset_id, filepath) pairs."""
+        builder = CorpusBuilder()
+        for dataset_id, filepath in files:
+            builder.add_file(filepath, dataset_id)
+        return builder.build()
+
+    def value(self, column: str, row: int) -> str | None:
+        """Raw cell value of a row, or None if its file has no such column."""
+        codes, values = self.columns[column]
+        code = codes[row]
+        return None if code == MISSING else values[code]
+
+    def matching_codes(self, column: str, term: str) -> set[int]:
+        """Codes of a column whose raw value or term name equals term (case-insensitive)."""
+        if column not in self.columns:
+            return set()
+        wanted = term.casefold()
+        return {
+            code
+            for code, value in enumerate(self.columns[column][1])
+            if value.casefold() == wanted or term_name(value).casefold() == wanted
+        }
+
+    def rows_where(self, conditions: dict[str, str]) -> list[int]:
+        """Row indices matching every column=term condition.
+
+        Terms are matched against the (small) value dictionaries first; rows
+        are then filtered one column at a time, starting with the condition
+        that matches the fewest distinct values.
+        """
+        if any(column not in self.columns for column in conditions):
+            return []
+        wanted = [
+            (self.columns[column][0], self.matching_codes(column, term))
+            for column, term in conditions.items()
+        ]
+        if any(not accepted for _, accepted in wanted):
+            return []
+        wanted.sort(key=lambda item: len(item[1]))
+        codes, accepted = wanted[0]
+        rows = [i for i, code in enumerate(codes) if code in accepted]
+        for codes, accepted in wanted[1:]:
+            rows = [i for i in rows if codes[i] in accepted]
+        return rows
+
+    def datasets_where(self, conditions: dict[str, str]) -> list[str]:
+        """Sorted dataset IDs having at least one row matching every condition."""
+        return sorted({self.value(DATASET_COLUMN, i) for i in self.rows_where(conditions)})
+
+    def write(self, path: Path) -> Path:
+        """Write the store, as Parquet for a .parquet path or NumPy for a .npz path.
+
+        When pyarrow is not installed, a .parquet store is written as .npz
+        next to it instead (same name, .npz suffix).
+
+        Returns:
+            The path written.
+
+        Raises:
+            ValueError: If the suffix is neither .parquet nor .npz.
+            ImportError: If numpy is needed and not installed.
+        """
+        path = Path(path)
+        if path.suffix not in (".parquet", ".npz"):
+            raise ValueError(f"Unknown store format {path.suffix!r}: use .parquet or .npz")
+        if path.suffix == ".parquet":
+            try:
+                self._write_parquet(path)
+                return path
+            except ImportError:
+                path = path.with_suffix(".npz")
+        self._write_npz(path)
+        return path
+
+    def _write_parquet(self, path: Path) -> None:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        arrays = {}
+        for name, (codes, values) in self.columns.items():
+            indices = pa.Array.from_buffers(
+                pa.int32(), len(codes), [None, pa.py_buffer(codes)]
+            )
+            indices = pc.if_else(
+                pc.equal(indices, MISSING), pa.scalar(None, pa.int32()), indices
+            )
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                indices, pa.array(values, type=pa.string())
+            )
+        pq.write_table(pa.table(arrays), path)
+
+    def _write_npz(self, path: Path) -> None:
+        import numpy as np
+
+        names = list(self.columns)
+        arrays = {"columns": np.array(names, dtype=str)}
+        for i, name in enumerate(names):
+            codes, values = self.columns[name]
+            arrays[f"codes_{i}"] = np.frombuffer(codes, dtype=np.int32)
+            arrays[f"values_{i}"] = np.array(values, dtype=str)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> SDRFCorpus:
+        """Load a store written by write()."""
+        path = Path(path)
+        if path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(path)
+            columns = {}
+            for name in table.column_names:
+                column = table.column(name).combine_chunks()
+                indices = pc.fill_null(column.indices, MISSING).cast(pa.int32())
+                start = indices.offset * 4
+                codes = array("i")
+                codes.frombytes(indices.buffers()[1].to_pybytes()[start : start + 4 * len(indices)])
+                columns[name] = (codes, column.dictionary.to_pylist())
+            return cls(columns, table.num_rows)
+
+        import numpy as np
+
+        with np.load(path) as data:
+            columns = {}
+            for i, name in enumerate(data["columns"].tolist()):
+                codes = array("i")
+                codes.frombytes(data[f"codes_{i}"].astype(np.int32).tobytes())
+                columns[name] = (codes, data[f"values_{i}"].tolist())
+        num_rows = len(columns[DATASET_COLUMN][0]) if columns else 0
+        return cls(columns, num_rows)
@@ -0,0 +1,176 @@
+"""
+Faceted queries over the SDRF dataset index.
+
+Loads sdrf-data.json (written by site/build-sdrf-index.py) once and turns
+every facet value into a bitmask over the datasets, so a query such as
+
+    index = DatasetIndex.from_json("site/sdrf-data.json")
+    index.query(organism="Homo sapiens", label_type=["TMT", "iTRAQ"])
+
+is a handful of integer ANDs and ORs instead of a loop over every dataset.
+Bit i stands for the i-th dataset of the index, in file order. Sample
+totals sum a NumPy array of per-dataset sample counts through the mask
+when numpy is installed, and loop over the set bits otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+# Facet name -> dataset entry field (a string or a list of strings)
+FACETS = {
+    "id": "id",
+    "organism": "organisms",
+    "disease": "diseases",
+    "instrument": "instruments",
+    "acquisition_method": "acquisition_methods",
+    "experiment_type": "experiment_type",
+    "label_type": "label_type",
+    "template": "template",
+}
+
+
+def _iter_bits(mask: int):
+    """Yield the indices of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _sample_counts(datasets: list[dict[str, Any]]):
+    """Per-dataset sample counts as a NumPy array, or None without numpy."""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np.array([dataset["num_samples"] for dataset in datasets], dtype=np.int64)
+
+
+class DatasetIndex:
+    """Per-facet bitmaps over the datasets of an SDRF index.
+
+    Values are matched case-insensitively. Within one facet a list of values
+    is a disjunction (any of them); across facets, query() and match_all()
+    are conjunctions and match_any() is a disjunction. Masks can also be
+    combined directly with &, | and & ~.
+    """
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.datasets: list[dict[str, Any]] = data["datasets"]
+        self.statistics: dict[str, Any] = data.get("statistics", {})
+        self.all_mask = (1 << len(self.datasets)) - 1
+        self._num_samples = _sample_counts(self.datasets)
+        self._bitmaps: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+        # Display form of each value: its first spelling in the index
+        self._labels: dict[str, dict[str, str]] = {facet: {} for facet in FACETS}
+
+        for i, dataset in enumerate(self.datasets):
+            bit = 1 << i
+            for facet, field in FACETS.items():
+                values = dataset.get(field) or []
+                if isinstance(values, str):
+                    values = [values]
+                for value in values:
+                    key = value.casefold()
+                    bitmaps = self._bitmaps[facet]
+                    bitmaps[key] = bitmaps.get(key, 0) | bit
+                    self._labels[facet].setdefault(key, value)
+
+    @classmethod
+    def from_json(cls, path: Path) -> DatasetIndex:
+        """Load an index written by site/build-sdrf-index.py (sdrf-data.json)."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _facet(self, facet: str) -> dict[str, int]:
+        if facet not in self._bitmaps:
+            raise ValueError(
+                f"Unknown facet {facet!r}; expected one of {', '.join(FACETS)}"
+            )
+        return self._bitmaps[facet]
+
+    def mask(self, facet: str, values: str | Iterable[str]) -> int:
+        """Bitmask of the datasets having any of the values for a facet."""
+        bitmaps = self._facet(facet)
+        if isinstance(values, str):
+            values = [values]
+        mask = 0
+        for value in values:
+            mask |= bitmaps.get(value.casefold(), 0)
+        return mask
+
+    def match_all(self, **criteria: str | Iterable[str]) -> int:
+        """Bitmask of the datasets matching every facet criterion."""
+        mask = self.all_mask
+        for facet, values in criteria.items():
+            mask &= self.mask(facet, values)
+        return mask
+
+    def match_any(self, **criteria: str | Iterable[str]) -> int:
+        """Bitmask of the datasets matching at least one facet criterion."""
+        mask = 0
+        for facet, values in criteria.items():
+            mask |= self.mask(facet, values)
+        return mask
+
+    def datasets_of(self, mask: int) -> list[dict[str, Any]]:
+        """Dataset entries selected by a mask, in index order."""
+        return [self.datasets[i] for i in _iter_bits(mask)]
+
+    def query(self, **criteria: str | Iterable[str]) -> list[dict[str, Any]]:
+        """Datasets matching every criterion, e.g. query(organism="Homo sapiens", label_type="TMT")."""
+        return self.datasets_of(self.match_all(**criteria))
+
+    def count(self, mask: int) -> int:
+        """Number of datasets in a mask."""
+        return mask.bit_count()
+
+    def _selection(self, mask: int):
+        """Boolean NumPy array over the datasets, True where mask has the bit set."""
+        import numpy as np
+
+        n = len(self.datasets)
+        packed = (mask & self.all_mask).to_bytes((n + 7) // 8, "little")
+        bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), bitorder="little")
+        return bits[:n].astype(bool)
+
+    def samples(self, mask: int) -> int:
+        """Total number of samples of the datasets in a mask."""
+        if self._num_samples is None:
+            return sum(self.datasets[i]["num_samples"] for i in _iter_bits(mask & self.all_mask))
+        return int(self._num_samples[self._selection(mask)].sum())
+
+    def values(self, facet: str) -> list[str]:
+        """All values of a facet, sorted."""
+        self._facet(facet)
+        return sorted(self._labels[facet].values(), key=str.casefold)
+
+    def aggregate(self, facet: str, mask: int | None = None) -> dict[str, dict[str, int]]:
+        """Datasets and samples per value of a facet, within a mask.
+
+        Returns:
+            Dict of value -> {'datasets': n, 'samples': n}, most datasets first.
+            Values with no dataset in the mask are left out.
+        """
+        if mask is None:
+            mask = self.all_mask
+        selected = {
+            key: bitmap & mask for key, bitmap in self._facet(facet).items() if bitmap & mask
+        }
+        if self._num_samples is None or not selected:
+            samples = [self.samples(bitmap) for bitmap in selected.values()]
+        else:
+            import numpy as np
+
+            # One row per value: a single matrix product sums every value's samples
+            rows = np.stack([self._selection(bitmap) for bitmap in selected.values()])
+            samples = (rows @ self._num_samples).tolist()
+        result = {
+            self._labels[facet][key]: {"datasets": bitmap.bit_count(), "samples": total}
+            for (key, bitmap), total in zip(selected.items(), samples)
+        }
+        return dict(sorted(result.items(), key=lambda item: -item[1]["datasets"]))
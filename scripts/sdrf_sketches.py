@@ -0,0 +1,186 @@
+"""
+Bounded-memory sketches for corpus-scale SDRF statistics.
+
+SpaceSaving keeps approximate top-k counts in a fixed number of counters,
+for corpora (such as a mirror of all of PRIDE) where exact Counters over
+every distinct free-text value would grow without bound. HyperLogLog
+estimates how many distinct values there are in a few KB, and sketches of
+different files merge into the sketch of their union.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import math
+import zlib
+from collections.abc import Iterable, Mapping
+
+
+class SpaceSaving:
+    """Space-Saving top-k counter (Metwally et al., 2005) with weighted updates.
+
+    At most `capacity` items are monitored. When a new item arrives and all
+    counters are in use, the item with the smallest count is evicted and
+    the newcomer inherits its count as a possible overestimation.
+
+    Guarantees, with N the total weight added:
+        - a reported count never underestimates: true <= count <= true + error(item);
+        - every error is at most N / capacity, so any item whose true count
+          exceeds N / capacity is monitored.
+
+    While fewer than `capacity` distinct items have been seen, counts are
+    exact and most_common() matches collections.Counter, ties included.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        # item -> [count, error]; insertion order breaks ties like Counter
+        self._counters: dict[str, list[int]] = {}
+        # Lazy min-heap of (count, seq, item); stale entries are skipped
+        self._heap: list[tuple[int, int, str]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._counters
+
+    def _push(self, item: str, count: int) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (count, self._seq, item))
+        # Keep the heap from filling up with stale entries
+        if len(self._heap) > 4 * self.capacity + 16:
+            self._heap = [
+                (c, s, i) for c, s, i in self._heap
+                if i in self._counters and self._counters[i][0] == c
+            ]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> tuple[str, int]:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            entry = self._counters.get(item)
+            if entry is not None and entry[0] == count:
+                return item, count
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Add count occurrences of item."""
+        self.total += count
+        entry = self._counters.get(item)
+        if entry is not None:
+            entry[0] += count
+        elif len(self._counters) < self.capacity:
+            entry = self._counters[item] = [count, 0]
+        else:
+            evicted, min_count = self._pop_min()
+            del self._counters[evicted]
+            entry = self._counters[item] = [min_count + count, min_count]
+        self._push(item, entry[0])
+
+    def update(self, items: Mapping[str, int] | Iterable[str]) -> None:
+        """Add counts from a mapping, or one occurrence per item of an iterable.
+
+        Mirrors collections.Counter.update so either can be used for the
+        same statistic.
+        """
+        if isinstance(items, Mapping):
+            for item, count in items.items():
+                self.add(item, count)
+        else:
+            for item in items:
+                self.add(item)
+
+    def count(self, item: str) -> int:
+        """Estimated count of item (an upper bound), or 0 if it is not monitored."""
+        entry = self._counters.get(item)
+        return entry[0] if entry else 0
+
+    def error(self, item: str) -> int:
+        """Maximum overestimation of item's count."""
+        entry = self._counters.get(item)
+        return entry[1] if entry else self.max_error()
+
+    def max_error(self) -> int:
+        """Bound on the error of any count: N / capacity, rounded down."""
+        return self.total // self.capacity
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        """The n items with the highest estimated counts, like Counter.most_common."""
+        ranked = sorted(
+            ((item, entry[0]) for item, entry in self._counters.items()),
+            key=lambda pair: pair[1],
+            reverse=True,
+        )
+        return ranked if n is None else ranked[:n]
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch (Flajolet et al., 2007).
+
+    Uses 2**precision one-byte registers and a 64-bit BLAKE2 hash, so
+    sketches built in different processes or runs are compatible. The
+    relative standard error is about 1.04 / sqrt(2**precision), 1.6% at the
+    default precision of 12; small cardinalities use linear counting and
+    are close to exact.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """Add one value."""
+        h = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add every value of an iterable."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: HyperLogLog) -> None:
+        """Fold another sketch in, giving the sketch of the union of both inputs."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def relative_error(self) -> float:
+        """Relative standard error of estimate()."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def to_json(self) -> str:
+        """Compact string form (registers are mostly zero for small inputs)."""
+        packed = bytes([self.precision]) + zlib.compress(bytes(self.registers))
+        return base64.b64encode(packed).decode("ascii")
+
+    @classmethod
+    def from_json(cls, data: str) -> HyperLogLog:
+        """Rebuild a sketch from to_json() output."""
+        packed = base64.b64decode(data)
+        sketch = cls(packed[0])
+        sketch.registers = bytearray(zlib.decompress(packed[1:]))
+        return sketch
@@ -0,0 +1,170 @@
+"""
+Memory-mapped, lazily decoded access to one SDRF file.
+
+SDRFTable maps the file read-only and reads only the '#key=value' metadata
+and the header line when opened. The start and end of every data row are
+indexed on the first access to the body; after that a column, a row or a
+range of rows is decoded on demand, and cells of other columns are never
+turned into strings. A statistics or validation pass over a few columns of
+a file with hundreds of thousands of rows therefore costs one scan of the
+bytes plus the decoding of those columns.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from sdrf_corpus import read_sdrf_preamble
+
+ENCODING = "utf-8"
+
+_WHITESPACE = frozenset(b" \t\r\n\x0b\x0c")
+
+
+def _decode(cell: bytes) -> str:
+    return cell.decode(ENCODING, errors="replace").strip()
+
+
+class SDRFTable:
+    """Read-only view of an SDRF file.
+
+    Blank lines are skipped and every row is padded (or truncated) to the
+    number of header columns, like sdrf_corpus.iter_sdrf_rows. Columns can
+    be addressed by position or by header name; a repeated header name
+    refers to its last column.
+
+    Use as a context manager, or call close(), to release the mapping.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._mm = None
+        self._starts: array | None = None
+        self._ends: array | None = None
+        self.metadata: dict[str, str] = {}
+        self.headers: list[str] | None = None
+        self._body_start = 0
+        if self._size:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            lines = (
+                line.decode(ENCODING, errors="replace")
+                for line in iter(self._mm.readline, b"")
+            )
+            self.metadata, self.headers = read_sdrf_preamble(lines)
+            self._body_start = self._mm.tell() if self.headers is not None else self._size
+        # Header name -> index of the last column with that name
+        self._column_index = {name: i for i, name in enumerate(self.headers or [])}
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> SDRFTable:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _index_rows(self) -> None:
+        """Record the byte range of every non-blank line of the body."""
+        starts, ends = array("q"), array("q")
+        mm, pos, size = self._mm, self._body_start, self._size
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                end = size
+            # Only lines starting with whitespace can be blank
+            if end > pos and (mm[pos] not in _WHITESPACE or mm[pos:end].strip()):
+                starts.append(pos)
+                ends.append(end)
+            pos = end + 1
+        self._starts, self._ends = starts, ends
+
+    def _lines(self, start: int = 0, stop: int | None = None) -> Iterator[bytes]:
+        if self._starts is None:
+            self._index_rows()
+        mm, starts, ends = self._mm, self._starts, self._ends
+        for i in range(*slice(start, stop).indices(len(starts))):
+            yield mm[starts[i]:ends[i]].strip()
+
+    def __len__(self) -> int:
+        """Number of data rows."""
+        if self._starts is None:
+            self._index_rows()
+        return len(self._starts)
+
+    def column_position(self, column: int | str) -> int:
+        """Position of a column given by position or header name.
+
+        Raises:
+            KeyError: If no header has that name.
+        """
+        if isinstance(column, int):
+            return column
+        return self._column_index[column]
+
+    def _row(self, line: bytes) -> list[str]:
+        num_columns = len(self.headers)
+        values = [_decode(cell) for cell in line.split(b"\t")[:num_columns]]
+        if len(values) < num_columns:
+            values.extend([""] * (num_columns - len(values)))
+        return values
+
+    def row(self, i: int) -> list[str]:
+        """Cell values of data row i."""
+        if not 0 <= i < len(self):
+            raise IndexError("row index out of range")
+        return self._row(next(self._lines(i, i + 1)))
+
+    def rows(self, start: int = 0, stop: int | None = None) -> list[list[str]]:
+        """Cell values of the data rows in [start, stop)."""
+        return [self._row(line) for line in self._lines(start, stop)]
+
+    def column(self, column: int | str, start: int = 0, stop: int | None = None) -> list[str]:
+        """Values of one column over the data rows in [start, stop)."""
+        i = self.column_position(column)
+        values = []
+        for line in self._lines(start, stop):
+            cells = line.split(b"\t", i + 1)
+            values.append(_decode(cells[i]) if i < len(cells) else "")
+        return values
+
+    def value_counts(self, columns: Iterable[int | str]) -> dict[int | str, Counter]:
+        """Count the distinct values of several columns in one pass.
+
+        Cells are counted as raw bytes and only the distinct values are
+        decoded. Rows too short to have a column do not count towards it.
+
+        Returns:
+            Dict mapping each requested column (as given) to a Counter of
+            stripped values, in first-seen order.
+        """
+        selected = [(column, self.column_position(column)) for column in columns]
+        if not selected:
+            return {}
+        raw = [Counter() for _ in selected]
+        positions = [i for _, i in selected]
+        last = max(positions)
+        for line in self._lines():
+            cells = line.split(b"\t", last + 1)
+            num_cells = len(cells)
+            for i, counts in zip(positions, raw):
+                if i < num_cells:
+                    counts[cells[i]] += 1
+
+        result = {}
+        for (column, _), counts in zip(selected, raw):
+            decoded = Counter()
+            for value, count in counts.items():
+                decoded[_decode(value)] += count
+            result[column] = decoded
+        return result
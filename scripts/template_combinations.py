@@ -0,0 +1,190 @@
+"""
+Template combination resolver using bitmask-encoded template sets.
+
+Every template gets one bit, so a set of templates is a single int. The
+combination rules (mutually_exclusive_with, excludes, requires, usable_alone)
+compile to per-template masks, which turns a compatibility check into a few
+AND operations.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from resolve_templates import (
+    LAYER_ORDER,
+    ResolvedColumn,
+    _parse_extends,
+    load_compiled_templates,
+)
+
+
+def _as_list(value: Any) -> list[str]:
+    if not value:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _iter_bits(mask: int):
+    """Yield the indices of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class TemplateCombinations:
+    """Compatibility checks and merged columns for sets of templates.
+
+    Bits are assigned in manifest order. Templates referenced by rules but
+    missing from the manifest are ignored.
+
+    Rules:
+        - two templates listed in each other's mutually_exclusive_with or
+          excludes cannot be combined (the relation is made symmetric);
+        - every template listed in requires must also be in the set;
+        - at least one template in the set must be usable_alone (so the
+          empty set is invalid).
+    """
+
+    def __init__(self, resolved: dict[str, dict[str, Any]]) -> None:
+        self.resolved = resolved
+        self.names: list[str] = list(resolved)
+        self.bits: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self.exclusive_masks: list[int] = [0] * n
+        self.requires_masks: list[int] = [0] * n
+        self.usable_alone_mask = 0
+
+        for name, tpl in resolved.items():
+            i = self.bits[name]
+            if tpl.get("usable_alone"):
+                self.usable_alone_mask |= 1 << i
+            others = _as_list(tpl.get("mutually_exclusive_with")) + _as_list(
+                tpl.get("excludes")
+            )
+            for other in others:
+                j = self.bits.get(_parse_extends(other))
+                if j is not None and j != i:
+                    self.exclusive_masks[i] |= 1 << j
+                    self.exclusive_masks[j] |= 1 << i
+            for req in _as_list(tpl.get("requires")):
+                j = self.bits.get(_parse_extends(req))
+                if j is not None:
+                    self.requires_masks[i] |= 1 << j
+
+        self._merged: dict[int, list[ResolvedColumn]] = {}
+
+    @classmethod
+    def from_templates_dir(cls, templates_dir: Path) -> TemplateCombinations:
+        """Build from a templates directory (or snapshot), using the cache."""
+        return cls(load_compiled_templates(templates_dir)["resolved"])
+
+    def mask_of(self, names) -> int:
+        """Encode template names as a bitmask.
+
+        Raises:
+            KeyError: If a name is not a known template.
+        """
+        mask = 0
+        for name in names:
+            mask |= 1 << self.bits[name]
+        return mask
+
+    def names_of(self, mask: int) -> list[str]:
+        """Decode a bitmask into template names, in manifest order."""
+        return [self.names[i] for i in _iter_bits(mask)]
+
+    def is_valid(self, mask: int) -> bool:
+        """Fast validity check of an encoded template set."""
+        if not mask & self.usable_alone_mask:
+            return False
+        for i in _iter_bits(mask):
+            if mask & self.exclusive_masks[i] or self.requires_masks[i] & ~mask:
+                return False
+        return True
+
+    def violations(self, mask: int) -> list[str]:
+        """Human-readable reasons why an encoded template set is invalid."""
+        if not mask:
+            return ["no template selected"]
+        reasons: list[str] = []
+        if not mask & self.usable_alone_mask:
+            reasons.append("no template in the set is usable alone")
+        seen_pairs: set[int] = set()
+        for i in _iter_bits(mask):
+            name = self.names[i]
+            for j in _iter_bits(mask & self.exclusive_masks[i]):
+                pair = (1 << i) | (1 << j)
+                if pair not in seen_pairs:
+                    seen_pairs.add(pair)
+                    reasons.append(f"{name} cannot be combined with {self.names[j]}")
+            for j in _iter_bits(self.requires_masks[i] & ~mask):
+                reasons.append(f"{name} requires {self.names[j]}")
+        return reasons
+
+    def merge_order(self, mask: int) -> list[str]:
+        """Order templates so that more specific ones are merged last.
+
+        Sorts by inheritance depth, then layer (templates without a layer
+        first), then manifest order, so an ancestor always precedes its
+        descendants.
+        """
+        return sorted(
+            self.names_of(mask),
+            key=lambda name: (
+                len(self.resolved[name]["inheritance_chain"]),
+                LAYER_ORDER.get(self.resolved[name].get("layer"), -1),
+                self.bits[name],
+            ),
+        )
+
+    def merged_columns(self, mask: int) -> list[ResolvedColumn]:
+        """Union of the templates' columns, memoized per mask.
+
+        Columns keep the position of their first appearance. When several
+        templates carry the same column, a definition never replaces one
+        from a descendant of its source template (so human's override of
+        characteristics[disease] survives next to dia-acquisition, which only
+        inherits it); otherwise the template merged last wins.
+        """
+        if mask not in self._merged:
+            merged: dict[str, ResolvedColumn] = {}
+            for name in self.merge_order(mask):
+                for col in self.resolved[name]["all_columns"]:
+                    current = merged.get(col["name"])
+                    if current is not None and self._is_ancestor_definition(col, current):
+                        continue
+                    merged[col["name"]] = col
+            self._merged[mask] = list(merged.values())
+        return self._merged[mask]
+
+    def _is_ancestor_definition(
+        self, col: ResolvedColumn, current: ResolvedColumn
+    ) -> bool:
+        """Whether col was defined by an ancestor of current's source template."""
+        if col is current:
+            return True
+        current_source = self.resolved.get(current.get("source_template"))
+        if current_source is None:
+            return False
+        return col.get("source_template") in current_source["inheritance_chain"]
+
+    def resolve(self, names) -> dict[str, Any]:
+        """Resolve a set of templates into a verdict and merged columns.
+
+        Args:
+            names: Iterable of template names, e.g. ['human', 'dia-acquisition'].
+
+        Returns:
+            Dict with 'templates', 'mask', 'valid', 'violations' and 'columns'.
+        """
+        mask = self.mask_of(names)
+        return {
+            "templates": self.merge_order(mask),
+            "mask": mask,
+            "valid": self.is_valid(mask),
+            "violations": self.violations(mask),
+            "columns": self.merged_columns(mask),
+        }
@@ -0,0 +1,133 @@
+"""
+Reverse indexes over resolved templates.
+
+Answers questions such as "which templates define characteristics[disease]",
+"which columns are backed by the MONDO ontology" or "which columns are
+required in human" with dict lookups instead of scanning resolve_all() output.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from resolve_templates import load_compiled_templates
+
+
+class ColumnRef(NamedTuple):
+    """A column as resolved in a specific template."""
+
+    template: str
+    column: str
+
+
+def _ontology_keys(column: Mapping[str, Any]) -> set[str]:
+    """Collect normalized ontology names and accessions referenced by a column."""
+    keys: set[str] = set()
+    accession = column.get("ontology_accession")
+    if accession:
+        keys.add(str(accession).lower())
+    for validator in column.get("validators") or []:
+        if not validator:
+            continue
+        params = validator.get("params") or {}
+        ontologies = params.get("ontologies") or []
+        if isinstance(ontologies, str):
+            ontologies = [ontologies]
+        if params.get("ontology"):
+            ontologies = [*ontologies, params["ontology"]]
+        keys.update(str(o).lower() for o in ontologies)
+    return keys
+
+
+class TemplateIndex:
+    """Reverse indexes built once over a resolved template tree.
+
+    Ontology and validator lookups return each distinct resolved column once,
+    under the template that defined or last overrode it; the
+    templates_with_column() lookup covers inherited columns too.
+    All lookups are case-insensitive for ontology names and accessions.
+    """
+
+    def __init__(self, resolved: dict[str, dict[str, Any]]) -> None:
+        self.resolved = resolved
+        by_column: dict[str, list[str]] = {}
+        defined_by: dict[str, list[str]] = {}
+        by_ontology: dict[str, list[ColumnRef]] = {}
+        by_validator: dict[str, list[ColumnRef]] = {}
+        by_requirement: dict[str, dict[str, list[str]]] = {}
+        columns: dict[ColumnRef, Mapping[str, Any]] = {}
+
+        for tname, tpl in resolved.items():
+            requirements = by_requirement.setdefault(tname, {})
+            for col in tpl["all_columns"]:
+                col_name = col["name"]
+                columns[ColumnRef(tname, col_name)] = col
+                by_column.setdefault(col_name, []).append(tname)
+                requirement = col.get("requirement", "optional")
+                requirements.setdefault(requirement, []).append(col_name)
+
+            # own_columns hold every column this template defined or overrode,
+            # so each distinct resolved column is indexed exactly once
+            for col in tpl["own_columns"]:
+                ref = ColumnRef(tname, col["name"])
+                defined_by.setdefault(col["name"], []).append(tname)
+                for key in _ontology_keys(col):
+                    by_ontology.setdefault(key, []).append(ref)
+                for validator in col.get("validators") or []:
+                    if validator and validator.get("validator_name"):
+                        by_validator.setdefault(validator["validator_name"], []).append(ref)
+
+        self._columns = columns
+        self._by_column = {k: tuple(v) for k, v in by_column.items()}
+        self._defined_by = {k: tuple(v) for k, v in defined_by.items()}
+        self._by_ontology = {k: tuple(dict.fromkeys(v)) for k, v in by_ontology.items()}
+        self._by_validator = {k: tuple(dict.fromkeys(v)) for k, v in by_validator.items()}
+        self._by_requirement = {
+            tname: {req: tuple(names) for req, names in reqs.items()}
+            for tname, reqs in by_requirement.items()
+        }
+
+    @classmethod
+    def from_templates_dir(cls, templates_dir: Path) -> TemplateIndex:
+        """Build the index from a templates directory (or snapshot), using the cache."""
+        return cls(load_compiled_templates(templates_dir)["resolved"])
+
+    def column(self, template: str, column: str) -> Mapping[str, Any]:
+        """Return the resolved column definition of a column in a template."""
+        return self._columns[ColumnRef(template, column)]
+
+    def templates_with_column(
+        self, column: str, own_only: bool = False
+    ) -> tuple[str, ...]:
+        """Templates containing a column.
+
+        Args:
+            column: Column name, e.g. 'characteristics[disease]'.
+            own_only: Only templates that define or override the column.
+        """
+        index = self._defined_by if own_only else self._by_column
+        return index.get(column, ())
+
+    def columns_for_ontology(self, ontology: str) -> tuple[ColumnRef, ...]:
+        """Columns validated against an ontology (e.g. 'mondo') or accession."""
+        return self._by_ontology.get(ontology.lower(), ())
+
+    def columns_with_validator(self, validator_name: str) -> tuple[ColumnRef, ...]:
+        """Columns using a validator type (e.g. 'ontology', 'pattern')."""
+        return self._by_validator.get(validator_name, ())
+
+    def columns_by_requirement(
+        self, template: str, requirement: str
+    ) -> tuple[str, ...]:
+        """Column names of a template with a requirement level, in column order."""
+        return self._by_requirement[template].get(requirement, ())
+
+    def ontologies(self) -> list[str]:
+        """All indexed ontology names and accessions, sorted."""
+        return sorted(self._by_ontology)
+
+    def validator_types(self) -> list[str]:
+        """All indexed validator types, sorted."""
+        return sorted(self._by_validator)
@@ -0,0 +1,50 @@
+"""Tests for the synthetic SDRF corpus generator and benchmark runner."""
+
+import json
+
+from benchmark import generate_corpus, load_site_script, run_benchmarks, synthetic_columns
+
+
+class TestSyntheticCorpus:
+    def test_synthetic_columns_combine_sample_and_technology_templates(self, resolved):
+        columns = dict(synthetic_columns(resolved, "human"))
+        assert "characteristics[organism]" in columns
+        assert "comment[instrument]" in columns
+        assert all(values for values in columns.values())
+
+    def test_generated_corpus_parses_like_real_files(self, resolved, tmp_path):
+        paths = generate_corpus(resolved, tmp_path, num_files=3, rows_per_file=40, seed=1)
+        assert [p.relative_to(tmp_path).as_posix() for p in paths] == [
+            f"PXD00000{n}/PXD00000{n}.sdrf.tsv" for n in (1, 2, 3)
+        ]
+
+        index = load_site_script("build-sdrf-index.py")
+        parsed = index.parse_sdrf_file(paths[0])
+        assert parsed["num_rows"] == 40
+        assert parsed["metadata"]["template"] in resolved
+        assert len(parsed["columns"]["assay name"]) == 40
+        assert len(parsed["columns"]["source name"]) == 10
+
+        again = generate_corpus(resolved, tmp_path / "again", 3, 40, seed=1)
+        assert [p.read_text() for p in paths] == [p.read_text() for p in again]
+
+
+class TestRunBenchmarks:
+    def test_run_benchmarks_times_every_stage(self, templates_dir, tmp_path, capsys):
+        results = run_benchmarks(templates_dir, [2], [10], repeat=1, work_dir=tmp_path)
+        assert [r["benchmark"] for r in results] == [
+            "resolve_all", "template_index", "search_index", "builder_data",
+            "generate", "parse_sdrf_file", "statistics", "index_sdrf_file",
+        ]
+        assert all(r["best_s"] >= 0 for r in results)
+        assert results[-1]["files"] == 2 and results[-1]["rows"] == 10
+
+    def test_search_index_uses_selected_templates(self, templates_copy, tmp_path, capsys):
+        for human_yaml in (templates_copy / "human").rglob("human.yaml"):
+            human_yaml.write_text(
+                human_yaml.read_text().replace("description: ", "description: Benchmarkmarker ", 1)
+            )
+        run_benchmarks(templates_copy, [], [], repeat=1, work_dir=tmp_path)
+        with open(tmp_path / "search-index.json") as f:
+            human = next(entry for entry in json.load(f) if entry["url"] == "./templates/human.html")
+        assert human["content"].startswith("Benchmarkmarker")
@@ -0,0 +1,59 @@
+"""Tests for the opt-in build stage profiler."""
+
+import json
+
+import pytest
+
+from build_profiling import DEFAULT_PROFILE_DIR, PROFILE_ENV, StageProfiler, pop_profile_option
+
+
+class TestProfileOption:
+    @pytest.mark.parametrize(
+        ("argv", "option", "rest"),
+        [
+            (["x.py", "out"], None, ["x.py", "out"]),
+            (["x.py", "--profile", "out"], "", ["x.py", "out"]),
+            (["x.py", "out", "--profile=prof", "--dev"], "prof", ["x.py", "out", "--dev"]),
+        ],
+    )
+    def test_pop_profile_option(self, argv, option, rest):
+        assert pop_profile_option(argv) == option
+        assert argv == rest
+
+    def test_create_reads_option_then_environment(self, monkeypatch, tmp_path):
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        assert not StageProfiler.create("build").enabled
+        assert StageProfiler.create("build", "").output_dir == DEFAULT_PROFILE_DIR
+        monkeypatch.setenv(PROFILE_ENV, "1")
+        assert StageProfiler.create("build").output_dir == DEFAULT_PROFILE_DIR
+        monkeypatch.setenv(PROFILE_ENV, str(tmp_path))
+        assert StageProfiler.create("build").output_dir == tmp_path
+        monkeypatch.setenv(PROFILE_ENV, "0")
+        assert not StageProfiler.create("build").enabled
+
+
+class TestStageProfiler:
+    def test_disabled_profiler_writes_nothing(self, capsys):
+        profiler = StageProfiler("build")
+        with profiler.stage("work"):
+            sum(range(1000))
+        profiler.report()
+        assert profiler.stages == {}
+        assert capsys.readouterr().out == ""
+
+    def test_enabled_profiler_writes_stage_reports(self, tmp_path, capsys):
+        profiler = StageProfiler("build", tmp_path, top_n=5)
+        with profiler.stage("allocate"):
+            data = [str(i) for i in range(50000)]
+        with profiler.stage("sort"):
+            sorted(data)
+        profiler.report()
+
+        assert (tmp_path / "build.allocate.prof").is_file()
+        assert (tmp_path / "build.sort.prof").is_file()
+        summary = json.loads((tmp_path / "build.json").read_text())
+        assert list(summary["stages"]) == ["allocate", "sort"]
+        assert summary["stages"]["allocate"]["peak_memory_bytes"] > 1_000_000
+        out = capsys.readouterr().out
+        assert "[profile] build / sort" in out
+        assert "ncalls" in out
@@ -0,0 +1,318 @@
+"""Tests for the SDRF dataset index build (site/build-sdrf-index.py)."""
+
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmark import SITE_DIR, load_site_script
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+HUMAN_SDRF = (
+    "#template=human\n"
+    "source name\tcharacteristics[organism]\tcharacteristics[disease]\tassay name"
+    "\tcomment[instrument]\tcomment[label]\tcomment[proteomics data acquisition method]"
+    "\tcomment[data file]\n"
+    "s1\tHomo sapiens\tnormal\trun1\tNT=Q Exactive;AC=MS:1001911\tTMT126"
+    "\tNT=Data-dependent acquisition;AC=PRIDE:0000449\ts1.raw\n"
+    "s2\tHomo sapiens\tglioma\trun2\tNT=Q Exactive;AC=MS:1001911\tTMT127"
+    "\tNT=Data-dependent acquisition;AC=PRIDE:0000449\ts2.raw\n"
+)
+MOUSE_SDRF = (
+    "source name\tcharacteristics[organism]\tassay name\tcomment[instrument]"
+    "\tcomment[label]\tcomment[data file]\n"
+    "m1\tMus musculus\trun1\tNT=Orbitrap Fusion;AC=MS:1002416\tlabel free sample\tm1.raw\n"
+)
+
+
+@pytest.fixture(scope="module")
+def sdrf_index():
+    return load_site_script("build-sdrf-index.py")
+
+
+@pytest.fixture
+def datasets(write_sdrf, tmp_path):
+    """A tiny datasets/ tree: one accession split in two files, and a second one."""
+    write_sdrf("datasets/PXD000001/PXD000001-1.sdrf.tsv", HUMAN_SDRF)
+    write_sdrf("datasets/PXD000001/PXD000001-2.sdrf.tsv", HUMAN_SDRF.replace("glioma", "normal"))
+    write_sdrf("datasets/PXD000002/PXD000002.sdrf.tsv", MOUSE_SDRF)
+    return tmp_path / "datasets"
+
+
+@pytest.fixture
+def build_index(tmp_path, datasets):
+    """Run build-sdrf-index.py from a copy of site/, as the docs build does.
+
+    build_index(*args, site="site", cache=True) runs the script in
+    tmp_path/<site> and returns the 'Parsed ...' line it prints.
+    """
+
+    def run(*args, site="site", cache=True):
+        site_dir = tmp_path / site
+        if not site_dir.exists():
+            site_dir.mkdir()
+            for name in ("build-sdrf-index.py", "sdrf-explorer.html"):
+                shutil.copy(SITE_DIR / name, site_dir / name)
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(SCRIPTS_DIR),
+            "SDRF_DATASETS_DIR": str(datasets),
+            "SDRF_INDEX_CACHE": "1" if cache else "0",
+            "SDRF_INDEX_CACHE_DIR": str(tmp_path / "cache"),
+        }
+        env.pop("SDRF_PROFILE", None)
+        result = subprocess.run(
+            [sys.executable, str(site_dir / "build-sdrf-index.py"), *args],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        return next(line for line in result.stdout.splitlines() if line.startswith("Parsed "))
+
+    return run
+
+
+def _index(tmp_path, site="site"):
+    """The written sdrf-data.json, without its timestamp."""
+    with open(tmp_path / site / "sdrf-data.json") as f:
+        data = json.load(f)
+    data["statistics"].pop("generated_at")
+    return data
+
+
+def _cache_records(tmp_path):
+    with open(tmp_path / "cache" / "files.json") as f:
+        return json.load(f)["files"]
+
+
+def _tree(directory):
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in sorted(directory.rglob("*")) if path.is_file()
+    }
+
+
+class TestIndexCacheFingerprint:
+    def test_fingerprint_is_stable(self, sdrf_index):
+        first = sdrf_index.index_cache_fingerprint("repo", "main")
+        assert sdrf_index.index_cache_fingerprint("repo", "main") == first
+        assert sdrf_index.index_cache_fingerprint("repo", "dev") != first
+
+    def test_sketch_module_change_invalidates_cache(self, sdrf_index, tmp_path, monkeypatch):
+        before = sdrf_index.index_cache_fingerprint("repo", "main")
+        edited = tmp_path / "sdrf_sketches.py"
+        with open(sdrf_index.sdrf_sketches.__file__, encoding="utf-8") as f:
+            edited.write_text(f.read() + "\n# edited\n", encoding="utf-8")
+        monkeypatch.setattr(sdrf_index.sdrf_sketches, "__file__", str(edited))
+        assert sdrf_index.index_cache_fingerprint("repo", "main") != before
+
+        cache_path = tmp_path / "files.json"
+        sdrf_index.save_index_cache(cache_path, before, {"PXD1/PXD1.sdrf.tsv": {}})
+        assert sdrf_index.load_index_cache(cache_path, before)
+        fingerprint = sdrf_index.index_cache_fingerprint("repo", "main")
+        assert sdrf_index.load_index_cache(cache_path, fingerprint) == {}
+
+
+def _synthetic_datasets(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"PXD{i:06d}",
+            "organisms": rng.sample(["Homo sapiens", "homo sapiens", "Mus musculus", "Danio rerio"], 2),
+            "diseases": rng.sample(["normal", "breast cancer", "glioma"], rng.randint(0, 2)),
+            "instruments": [rng.choice(["Q Exactive", "Orbitrap Fusion", "timsTOF Pro"])],
+            "experiment_type": rng.choice(["DDA", "DIA", "Unknown"]),
+            "label_type": rng.choice(["TMT", "Label-free"]),
+        }
+        for i in range(n)
+    ]
+
+
+def _delta_decode(gaps):
+    return list(itertools.accumulate(gaps))
+
+
+class TestWriteHashedJson:
+    def test_identical_file_is_left_untouched(self, sdrf_index, tmp_path):
+        name = sdrf_index.write_hashed_json({"a": 1}, str(tmp_path), "data")
+        path = tmp_path / name
+        os.utime(path, ns=(0, 0))
+        assert sdrf_index.write_hashed_json({"a": 1}, str(tmp_path), "data") == name
+        assert path.stat().st_mtime_ns == 0
+
+    def test_truncated_file_is_replaced(self, sdrf_index, tmp_path):
+        name = sdrf_index.write_hashed_json({"a": [1, 2, 3]}, str(tmp_path), "data")
+        path = tmp_path / name
+        path.write_text('{"a":[1,')
+        assert sdrf_index.write_hashed_json({"a": [1, 2, 3]}, str(tmp_path), "data") == name
+        assert json.loads(path.read_text()) == {"a": [1, 2, 3]}
+        assert sorted(p.name for p in tmp_path.iterdir()) == [name]
+
+
+class TestFacetIndex:
+    def test_delta_encoding_is_lossless(self, sdrf_index):
+        datasets = _synthetic_datasets(300)
+        facets = sdrf_index.build_facet_index(datasets)
+        assert set(facets) == set(sdrf_index.FACET_FIELDS)
+        for facet, field in sdrf_index.FACET_FIELDS.items():
+            expected = {}
+            for ordinal, dataset in enumerate(datasets):
+                values = dataset[field]
+                values = [values] if isinstance(values, str) else values
+                if facet == "organism":
+                    values = [value.lower() for value in values]
+                for value in set(values):
+                    expected.setdefault(value, []).append(ordinal)
+            decoded = {value: _delta_decode(gaps) for value, gaps in facets[facet].items()}
+            assert decoded == expected
+            assert all(gap > 0 for gaps in facets[facet].values() for gap in gaps[1:])
+
+    def test_shard_assignment_is_stable(self, sdrf_index, tmp_path):
+        datasets = _synthetic_datasets(95)
+        output = {"datasets": datasets, "statistics": {}}
+        explorer_dir = str(tmp_path / "explorer")
+
+        def shards():
+            summary_name, num_shards = sdrf_index.write_explorer_data(output, explorer_dir, 20)
+            with open(os.path.join(explorer_dir, summary_name)) as f:
+                summary = json.load(f)
+            assert len(summary["shards"]) == num_shards == 5
+            return summary
+
+        first = shards()
+        assert shards() == first
+        loaded = []
+        for shard in first["shards"]:
+            with open(os.path.join(explorer_dir, shard["file"])) as f:
+                loaded.extend(json.load(f))
+        assert loaded == datasets
+
+        # Appending datasets only renames the shard whose content changed
+        output["datasets"] = datasets + _synthetic_datasets(3, seed=1)
+        grown = shards()
+        assert grown["shards"][:4] == first["shards"][:4]
+        assert grown["shards"][4] != first["shards"][4]
+        assert len(os.listdir(explorer_dir)) == 1 + 1 + 5
+        assert first["shards"][4]["file"] not in os.listdir(explorer_dir)
+
+
+class TestIndexSdrfFile:
+    def test_entry_and_statistics(self, sdrf_index, datasets):
+        path = datasets / "PXD000001" / "PXD000001-1.sdrf.tsv"
+        result = sdrf_index.index_sdrf_file(str(path), str(datasets), "org/repo", "main")
+        entry = result["entry"]
+        assert entry["id"] == "PXD000001"
+        assert entry["path"] == "datasets/PXD000001/PXD000001-1.sdrf.tsv"
+        assert entry["num_samples"] == 2
+        assert entry["organisms"] == ["Homo sapiens"]
+        assert entry["instruments"] == ["Q Exactive"]
+        assert entry["label_type"] == "TMT"
+        assert entry["experiment_type"] == "DDA"
+        assert entry["template"] == "human"
+        assert result["profile"]
+        json.dumps(result)
+
+    def test_file_without_rows_is_skipped(self, sdrf_index, write_sdrf, datasets):
+        path = write_sdrf("datasets/PXD000003/PXD000003.sdrf.tsv", "source name\tassay name\n")
+        assert sdrf_index.index_sdrf_file(str(path), str(datasets), "org/repo", "main") is None
+
+
+class TestIndexCache:
+    def test_cache_miss_then_hit(self, build_index, tmp_path):
+        assert build_index() == "Parsed 3 of 3 SDRF files (0 cached)"
+        first = _index(tmp_path)
+        assert [d["accession_file_count"] for d in first["datasets"]] == [2, 2, 1]
+        assert build_index() == "Parsed 0 of 3 SDRF files (3 cached)"
+        assert _index(tmp_path) == first
+
+    def test_changed_content_is_reparsed(self, build_index, datasets, tmp_path):
+        build_index()
+        (datasets / "PXD000002" / "PXD000002.sdrf.tsv").write_text(
+            MOUSE_SDRF.replace("Mus musculus", "Rattus norvegicus")
+        )
+        assert build_index() == "Parsed 1 of 3 SDRF files (2 cached)"
+        assert _index(tmp_path)["datasets"][2]["organisms"] == ["Rattus norvegicus"]
+
+    def test_touched_file_is_not_reparsed(self, build_index, datasets, tmp_path):
+        build_index()
+        first = _index(tmp_path)
+        path = datasets / "PXD000001" / "PXD000001-1.sdrf.tsv"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        # Same size and content hash: the cached result is reused
+        assert build_index() == "Parsed 0 of 3 SDRF files (3 cached)"
+        assert _index(tmp_path) == first
+        record = _cache_records(tmp_path)["PXD000001/PXD000001-1.sdrf.tsv"]
+        assert record["mtime_ns"] == path.stat().st_mtime_ns
+
+    def test_deleted_file_is_dropped(self, build_index, datasets, tmp_path):
+        build_index()
+        (datasets / "PXD000001" / "PXD000001-2.sdrf.tsv").unlink()
+        assert build_index() == "Parsed 0 of 2 SDRF files (2 cached)"
+        index = _index(tmp_path)
+        assert [d["file"] for d in index["datasets"]] == [
+            "PXD000001-1.sdrf.tsv", "PXD000002.sdrf.tsv",
+        ]
+        assert index["datasets"][0]["accession_file_count"] == 1
+        assert index["statistics"]["total_samples"] == 3
+        assert sorted(_cache_records(tmp_path)) == [
+            "PXD000001/PXD000001-1.sdrf.tsv", "PXD000002/PXD000002.sdrf.tsv",
+        ]
+        assert not (tmp_path / "site" / "sdrf-profiles" / "PXD000001" / "PXD000001-2.json").exists()
+
+    def test_cached_build_matches_uncached(self, build_index, tmp_path):
+        build_index()
+        assert build_index() == "Parsed 0 of 3 SDRF files (3 cached)"
+        build_index(site="uncached", cache=False)
+        assert _index(tmp_path) == _index(tmp_path, "uncached")
+
+
+class TestParallelBuild:
+    def test_jobs_output_matches_serial(self, build_index, tmp_path):
+        assert build_index(site="serial", cache=False) == "Parsed 3 of 3 SDRF files (0 cached)"
+        assert build_index("--jobs", "2", site="parallel", cache=False) == (
+            "Parsed 3 of 3 SDRF files (0 cached)"
+        )
+        assert _index(tmp_path, "serial") == _index(tmp_path, "parallel")
+        # The explorer summary holds the build time; shards, facets and profiles must match
+        for directory in ("sdrf-explorer-data", "sdrf-profiles"):
+            serial, parallel = (
+                {name: data for name, data in _tree(tmp_path / site / directory).items()
+                 if not name.startswith("sdrf-data.")}
+                for site in ("serial", "parallel")
+            )
+            assert serial and serial == parallel
+
+
+class TestApproximateCounters:
+    def test_approx_counters_bypass_the_cache(self, build_index, tmp_path):
+        build_index(site="exact", cache=False)
+        assert build_index("--approx-counters", "50") == "Parsed 3 of 3 SDRF files (0 cached)"
+        assert not (tmp_path / "cache" / "files.json").exists()
+        approx, exact = _index(tmp_path), _index(tmp_path, "exact")
+        # Below capacity Space-Saving counts are exact
+        errors = approx["statistics"].pop("approximate_counts")
+        assert all(not any(stat["errors"].values()) for stat in errors.values())
+        assert approx == exact
+
+    def test_approx_counters_jobs_match_serial(self, build_index, tmp_path):
+        build_index("--approx-counters", "50", site="serial")
+        build_index("--approx-counters", "50", "--jobs", "2", site="parallel")
+        assert _index(tmp_path, "serial") == _index(tmp_path, "parallel")
+
+
+class TestExport:
+    def test_export_writes_the_store(self, build_index, tmp_path):
+        pytest.importorskip("numpy")
+        build_index("--export", str(tmp_path / "corpus.npz"))
+        assert (tmp_path / "corpus.npz").is_file()
+
+    def test_unknown_export_suffix_is_rejected(self, build_index, tmp_path):
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            build_index("--export", str(tmp_path / "corpus.csv"))
+        assert "--export must be a .parquet or .npz path" in error.value.stderr
@@ -18,7 +18,19 @@ from resolve_templates import (
     merge_columns,
     resolve_template,
     resolve_all,
+    topological_order,
+    load_compiled_templates,
+    ResolvedColumn,
+    TemplateVersionResolver,
+    resolve_template_version,
+    select_version,
+    version_satisfies,
+    write_templates_snapshot,
+    IncrementalResolver,
+    build_dependency_graph,
+    descendants,
 )
+import resolve_templates
 
 METADATA_FIELDS = [
     "name",
@@ -33,6 +45,7 @@ METADATA_FIELDS = [
     "requires",
     "excludes",
     "inheritance_chain",
+    "inheritance_versions",
     "own_columns",
     "inherited_columns",
     "all_columns",
@@ -71,6 +84,24 @@ class TestTemplateYamlLoading:
         assert tpl["extends"] == "sample-metadata@>=1.0.0"
 
 
+# --- Pre-parsed snapshot ---
+
+
+class TestTemplatesSnapshot:
+    def test_snapshot_resolves_like_yaml_tree(self, tmp_path):
+        snapshot = tmp_path / "templates-snapshot.json"
+        count = write_templates_snapshot(TEMPLATES_DIR, snapshot)
+        assert count >= len(load_manifest(TEMPLATES_DIR))
+        assert load_manifest(snapshot) == load_manifest(TEMPLATES_DIR)
+        assert resolve_all(snapshot) == resolve_all(TEMPLATES_DIR)
+
+    def test_snapshot_missing_version_raises(self, tmp_path):
+        snapshot = tmp_path / "templates-snapshot.json"
+        write_templates_snapshot(TEMPLATES_DIR, snapshot)
+        with pytest.raises(FileNotFoundError):
+            load_template_yaml(snapshot, "base", "0.0.0")
+
+
 # --- Inheritance chain ---
 
 
@@ -152,6 +183,41 @@ class TestColumnMerging:
             assert col["source_template"] in resolved["inheritance_chain"]
 
 
+    def test_override_shares_unchanged_fields_with_parent(self):
+        all_resolved = resolve_all(TEMPLATES_DIR)
+        parent_col = next(
+            c
+            for c in all_resolved["sample-metadata"]["all_columns"]
+            if c["name"] == "characteristics[disease]"
+        )
+        child_col = next(
+            c
+            for c in all_resolved["human"]["all_columns"]
+            if c["name"] == "characteristics[disease]"
+        )
+        assert child_col["source_template"] == "human"
+        assert child_col["validators"] is parent_col["validators"]
+
+    def test_inherited_column_is_shared_object(self):
+        all_resolved = resolve_all(TEMPLATES_DIR)
+        base_col = next(
+            c for c in all_resolved["base"]["all_columns"] if c["name"] == "source name"
+        )
+        human_col = next(
+            c for c in all_resolved["human"]["all_columns"] if c["name"] == "source name"
+        )
+        assert human_col is base_col
+
+    def test_resolved_column_is_immutable(self):
+        resolved = resolve_template("human", TEMPLATES_DIR)
+        col = resolved["all_columns"][0]
+        assert isinstance(col, ResolvedColumn)
+        with pytest.raises(TypeError):
+            col["requirement"] = "optional"
+        with pytest.raises(AttributeError):
+            col.extra = 1
+
+
 # --- Resolved template metadata ---
 
 
@@ -211,6 +277,222 @@ class TestResolveAll:
             )
 
 
+    def test_resolve_all_matches_resolve_template(self):
+        all_resolved = resolve_all(TEMPLATES_DIR)
+        for name in ["base", "human", "dia-acquisition", "metaproteomics"]:
+            assert all_resolved[name] == resolve_template(name, TEMPLATES_DIR)
+
+    def test_resolve_all_parses_each_template_once(self, monkeypatch):
+        calls = []
+        original = resolve_templates.load_template_yaml
+
+        def counting_load(templates_dir, name, version):
+            calls.append(name)
+            return original(templates_dir, name, version)
+
+        monkeypatch.setattr(resolve_templates, "load_template_yaml", counting_load)
+        all_resolved = resolve_all(TEMPLATES_DIR)
+        assert sorted(calls) == sorted(all_resolved)
+
+
+# --- Topological ordering ---
+
+
+class TestTopologicalOrder:
+    def test_parents_precede_children(self):
+        manifest = load_manifest(TEMPLATES_DIR)
+        order = topological_order(manifest)
+        assert sorted(order) == sorted(manifest)
+        position = {name: i for i, name in enumerate(order)}
+        for name in manifest:
+            chain = build_inheritance_chain(name, manifest, TEMPLATES_DIR)
+            for parent, child in zip(chain, chain[1:]):
+                assert position[parent] < position[child]
+
+    def test_cycle_raises(self):
+        manifest = {
+            "a": {"extends": "b@>=1.0.0"},
+            "b": {"extends": "a@>=1.0.0"},
+        }
+        with pytest.raises(ValueError, match="Cyclic"):
+            topological_order(manifest)
+
+
+# --- Incremental re-resolution ---
+
+
+class TestIncrementalResolution:
+    def test_dependency_graph(self):
+        manifest = load_manifest(TEMPLATES_DIR)
+        graph = build_dependency_graph(manifest)
+        assert "sample-metadata" in graph["base"]
+        assert "human" in graph["sample-metadata"]
+        affected = descendants(graph, {"sample-metadata"})
+        assert {"sample-metadata", "human", "dia-acquisition"} <= affected
+        assert "base" not in affected
+        assert "metaproteomics" not in affected
+
+    def test_refresh_reresolves_only_descendants(self, templates_copy):
+        resolver = IncrementalResolver(templates_copy)
+        assert resolver.refresh() == set(load_manifest(templates_copy))
+        assert resolver.refresh() == set()
+
+        base_before = resolver.resolved["base"]
+        manifest = resolver.manifest
+        yaml_path = (
+            templates_copy
+            / "sample-metadata"
+            / manifest["sample-metadata"]["latest"]
+            / "sample-metadata.yaml"
+        )
+        yaml_path.write_text(yaml_path.read_text() + "\n# edited\n")
+        # A comment-only edit still changes the content hash
+        affected = resolver.refresh()
+        assert affected == descendants(resolver.graph, {"sample-metadata"})
+        assert resolver.resolved["base"] is base_before
+        assert resolver.resolved == resolve_all(templates_copy)
+
+
+# --- Versioned resolution ---
+
+
+class TestVersionConstraints:
+    @pytest.mark.parametrize(
+        "version,constraint,expected",
+        [
+            ("1.1.0", ">=1.0.0", True),
+            ("1.0.0", ">=1.1.0", False),
+            ("1.10.0", ">1.9.0", True),
+            ("1.1.0", "1.1.0", True),
+            ("1.1.0", "==1.0.0", False),
+            ("1.5.0", ">=1.0.0,<2.0.0", True),
+            ("2.0.0", ">=1.0.0,<2.0.0", False),
+            ("1.0.0", None, True),
+        ],
+    )
+    def test_version_satisfies(self, version, constraint, expected):
+        assert version_satisfies(version, constraint) is expected
+
+    def test_invalid_constraint_raises(self):
+        with pytest.raises(ValueError):
+            version_satisfies("1.0.0", "~>1.0")
+
+    def test_select_version_picks_highest_match(self):
+        manifest = {"base": {"latest": "1.2.0", "versions": ["1.0.0", "1.1.0", "1.2.0"]}}
+        assert select_version("base", ">=1.0.0,<1.2.0", manifest) == "1.1.0"
+        assert select_version("base", None, manifest) == "1.2.0"
+        with pytest.raises(ValueError, match="No version"):
+            select_version("base", ">=2.0.0", manifest)
+
+
+class TestVersionedResolution:
+    def test_latest_matches_resolve_all(self):
+        all_resolved = resolve_all(TEMPLATES_DIR)
+        manifest = load_manifest(TEMPLATES_DIR)
+        resolver = TemplateVersionResolver(TEMPLATES_DIR)
+        for name in ["human", "dia-acquisition", "metaproteomics"]:
+            versioned = resolver.resolve(name, manifest[name]["latest"])
+            assert versioned["all_columns"] == all_resolved[name]["all_columns"]
+            assert versioned["inheritance_chain"] == all_resolved[name]["inheritance_chain"]
+
+    def test_parent_version_satisfies_constraint(self):
+        manifest = load_manifest(TEMPLATES_DIR)
+        resolver = TemplateVersionResolver(TEMPLATES_DIR, manifest)
+        for (name, version), resolved in resolver.resolve_all_versions().items():
+            assert resolved["version"] == version
+            parent = resolver.parent_of(name, version)
+            if parent is None:
+                continue
+            parent_name, parent_version = parent
+            assert resolved["inheritance_versions"][-2] == parent_version
+            constraint = resolved["extends"].partition("@")[2] or None
+            assert version_satisfies(parent_version, constraint)
+
+    def test_each_node_parsed_once(self, monkeypatch):
+        calls = []
+        original = resolve_templates.load_template_yaml
+
+        def counting_load(templates_dir, name, version):
+            calls.append((name, version))
+            return original(templates_dir, name, version)
+
+        monkeypatch.setattr(resolve_templates, "load_template_yaml", counting_load)
+        resolver = TemplateVersionResolver(TEMPLATES_DIR)
+        all_versions = resolver.resolve_all_versions()
+        assert len(calls) == len(set(calls))
+        assert set(calls) == set(all_versions)
+
+    def test_resolve_template_version_wrapper(self):
+        manifest = load_manifest(TEMPLATES_DIR)
+        version = manifest["human"]["versions"][0]
+        resolved = resolve_template_version("human", version, TEMPLATES_DIR)
+        assert resolved["name"] == "human"
+        assert resolved["inheritance_chain"] == ["base", "sample-metadata", "human"]
+
+
+# --- Compiled template cache ---
+
+
+class TestCompiledTemplateCache:
+    def test_cache_roundtrip_matches_resolve_all(self, tmp_path):
+        first = load_compiled_templates(TEMPLATES_DIR, cache_dir=tmp_path)
+        assert len(list(tmp_path.glob("compiled-*.pickle"))) == 1
+        second = load_compiled_templates(TEMPLATES_DIR, cache_dir=tmp_path)
+        assert first["resolved"] == resolve_all(TEMPLATES_DIR)
+        assert second == first
+
+    def test_cache_hit_skips_yaml_parsing(self, tmp_path, monkeypatch):
+        load_compiled_templates(TEMPLATES_DIR, cache_dir=tmp_path)
+
+        def fail_load(*args, **kwargs):
+            raise AssertionError("template YAML parsed despite valid cache")
+
+        monkeypatch.setattr(resolve_templates, "load_template_yaml", fail_load)
+        compiled = load_compiled_templates(TEMPLATES_DIR, cache_dir=tmp_path)
+        assert "human" in compiled["resolved"]
+
+    def test_stale_cache_is_rebuilt(self, tmp_path, templates_copy):
+        cache_dir = tmp_path / "cache"
+        before = load_compiled_templates(templates_copy, cache_dir=cache_dir)
+
+        manifest = load_manifest(templates_copy)
+        human_yaml = (
+            templates_copy / "human" / manifest["human"]["latest"] / "human.yaml"
+        )
+        human_yaml.write_text(
+            human_yaml.read_text().replace(
+                before["templates"]["human"]["description"].splitlines()[0],
+                "Edited description",
+                1,
+            )
+        )
+        after = load_compiled_templates(templates_copy, cache_dir=cache_dir)
+        assert after["resolved"]["human"]["description"].startswith("Edited description")
+        assert len(list(cache_dir.glob("compiled-*.pickle"))) == 1
+
+    def test_other_sources_keep_their_cache(self, tmp_path, templates_copy, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        snapshot = tmp_path / "templates-snapshot.json"
+        write_templates_snapshot(TEMPLATES_DIR, snapshot)
+        load_compiled_templates(TEMPLATES_DIR, cache_dir=cache_dir)
+        load_compiled_templates(snapshot, cache_dir=cache_dir)
+        load_compiled_templates(templates_copy, cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("compiled-*.pickle"))) == 3
+
+        # Rebuilding one source only replaces that source's entry
+        human_yaml = next((templates_copy / "human").rglob("human.yaml"))
+        human_yaml.write_text(human_yaml.read_text() + "\n# edited\n")
+        load_compiled_templates(templates_copy, cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("compiled-*.pickle"))) == 3
+
+        def fail_load(*args, **kwargs):
+            raise AssertionError("template re-parsed despite a valid cache")
+
+        monkeypatch.setattr(resolve_templates, "compile_templates", fail_load)
+        load_compiled_templates(TEMPLATES_DIR, cache_dir=cache_dir)
+        load_compiled_templates(snapshot, cache_dir=cache_dir)
+
+
 # --- build_template_pages script ---
 
 
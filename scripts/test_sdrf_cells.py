@@ -0,0 +1,62 @@
+"""Tests for the structured SDRF cell parser."""
+
+import pytest
+
+from sdrf_cells import parse_cell, term_accession, term_name
+
+
+class TestParseCell:
+    def test_parse_cell_returns_all_keys(self):
+        cell = parse_cell("NT=Oxidation;AC=UNIMOD:35;MT=Variable;TA=M;PP=Anywhere")
+        assert dict(cell) == {
+            "NT": "Oxidation",
+            "AC": "UNIMOD:35",
+            "MT": "Variable",
+            "TA": "M",
+            "PP": "Anywhere",
+        }
+
+    def test_parse_cell_keeps_semicolons_inside_values(self):
+        cell = parse_cell("NT=Trypsin;AC=MS:1001251;CS=(?<=[KR]);(?!P)")
+        assert cell["CS"] == "(?<=[KR]);(?!P)"
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("NT=Homo sapiens;", {"NT": "Homo sapiens"}),
+            ("NT=Trypsin;AC=MS:1001251;", {"NT": "Trypsin", "AC": "MS:1001251"}),
+            ("NT=Trypsin;;AC=MS:1001251", {"NT": "Trypsin", "AC": "MS:1001251"}),
+            ("NT=Trypsin; ;AC=MS:1001251; ", {"NT": "Trypsin", "AC": "MS:1001251"}),
+            ("Homo sapiens;", {"NT": "Homo sapiens"}),
+            ("Homo sapiens;;AC=NCBITaxon:9606", {"NT": "Homo sapiens", "AC": "NCBITaxon:9606"}),
+        ],
+    )
+    def test_parse_cell_ignores_empty_parts(self, value, expected):
+        assert dict(parse_cell(value)) == expected
+
+    def test_parse_cell_is_cached_and_read_only(self):
+        value = "NT=Carbamidomethyl;AC=UNIMOD:4;MT=Fixed;TA=C"
+        first = parse_cell(value)
+        assert parse_cell(value) is first
+        with pytest.raises(TypeError):
+            first["NT"] = "other"
+
+
+class TestTermAccessors:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("NT=Homo sapiens;AC=NCBITaxon:9606", "Homo sapiens"),
+            ("AC=MS:1001251;NT=Trypsin", "Trypsin"),
+            ("Homo sapiens;AC=NCBITaxon:9606", "Homo sapiens"),
+            ("Homo sapiens", "Homo sapiens"),
+            ("NT=Homo sapiens;", "Homo sapiens"),
+            ("", ""),
+        ],
+    )
+    def test_term_name(self, value, expected):
+        assert term_name(value) == expected
+
+    def test_term_accession(self):
+        assert term_accession("NT=Homo sapiens;AC=NCBITaxon:9606") == "NCBITaxon:9606"
+        assert term_accession("Homo sapiens") is None
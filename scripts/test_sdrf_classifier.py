@@ -0,0 +1,81 @@
+"""Tests for the vocabulary-driven dataset classifier."""
+
+import json
+
+import pytest
+
+from sdrf_cells import CELL_CACHE_SIZE
+from sdrf_classifier import load_classifiers
+
+
+@pytest.fixture(scope="module")
+def classifiers():
+    return load_classifiers()
+
+
+class TestClassify:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("NT=Data-Independent Acquisition;AC=NCIT:C161786", "DIA"),
+            ("NT=Data-dependent acquisition;AC=PRIDE:0000449", "DDA"),
+            ("diaPASEF", "DIA"),
+            ("DIA-PASEF", "DIA"),
+            ("ddaPASEF", "DDA"),
+            ("NT=DDA-PASEF;AC=NCIT:C161785", "DDA"),
+            ("SWATH-MS", "DIA"),
+            ("selected reaction monitoring", "SRM/MRM"),
+            ("media change", None),
+            ("NT=custom method;AC=NCIT:C161786", "DIA"),
+        ],
+    )
+    def test_experiment_type(self, classifiers, value, expected):
+        assert classifiers["experiment_type"].classify(value) == expected
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("TMT126", "TMT"),
+            ("NT=TMT127N;AC=MS:1002622", "TMT"),
+            ("TMTpro 134N", "TMT"),
+            ("NT=TMT6plex;AC=UNIMOD:737", "TMT"),
+            ("iTRAQ4plex-114", "iTRAQ"),
+            ("SILAC heavy", "SILAC"),
+            ("NT=label free sample;AC=MS:1002038", "Label-free"),
+            ("metabolic label", None),
+        ],
+    )
+    def test_label_type(self, classifiers, value, expected):
+        assert classifiers["label_type"].classify(value) == expected
+
+    def test_dataset_class_follows_vocabulary_priority(self, classifiers):
+        labels = classifiers["label_type"]
+        assert labels.classify_values(["label free sample", "TMT126"]) == "TMT"
+        assert labels.classify_values(["metabolic label"]) == "Label-free"
+        assert classifiers["experiment_type"].classify_values([]) == "Unknown"
+
+    def test_classification_cache_is_bounded(self, classifiers):
+        classifier = classifiers["experiment_type"]
+        classifier.classify("DIA")
+        classifier.classify("DIA")
+        info = classifier._priority.cache_info()
+        assert info.maxsize == CELL_CACHE_SIZE
+        assert info.hits >= 1
+
+
+class TestVocabularyFile:
+    def test_new_classes_need_only_vocabulary(self, tmp_path):
+        path = tmp_path / "vocabulary.json"
+        path.write_text(json.dumps({
+            "experiment_type": {
+                "column": "comment[proteomics data acquisition method]",
+                "default": "Unknown",
+                "classes": [
+                    {"name": "DIA-PASEF", "terms": ["dia-pasef", "diapasef"]},
+                    {"name": "DIA", "terms": ["dia"]},
+                ],
+            }
+        }))
+        classifier = load_classifiers(path)["experiment_type"]
+        assert classifier.classify("diaPASEF") == "DIA-PASEF"
+        assert classifier.classify("DIA") == "DIA"
@@ -0,0 +1,85 @@
+"""Tests for the columnar SDRF corpus export."""
+
+import sys
+
+import pytest
+
+from sdrf_corpus import MISSING, SDRFCorpus, unique_column_names
+
+HELA_FILE = (
+    "#template=human\n"
+    "source name\tcharacteristics[cell line]\tcomment[instrument]"
+    "\tcomment[modification parameters]\tcomment[modification parameters]\n"
+    "s1\tNT=HeLa;AC=CLO:0003684\tNT=Orbitrap Exploris 480;AC=MS:1003028\tNT=Oxidation\tNT=Carbamidomethyl\n"
+    "s2\tHEK293\tNT=Orbitrap Exploris 480;AC=MS:1003028\tNT=Oxidation\n"
+    "\n"
+)
+MOUSE_FILE = (
+    "source name\tcharacteristics[organism]\tcomment[instrument]\n"
+    "m1\tNT=Mus musculus\tNT=Q Exactive;AC=MS:1001911\n"
+)
+
+
+@pytest.fixture
+def corpus(write_sdrf):
+    return SDRFCorpus.from_files([
+        ("PXD1", write_sdrf("PXD1.sdrf.tsv", HELA_FILE)),
+        ("PXD2", write_sdrf("PXD2.sdrf.tsv", MOUSE_FILE)),
+    ])
+
+
+class TestColumnNames:
+    def test_unique_column_names(self):
+        assert unique_column_names(["a", "b", "a", "a"]) == ["a", "b", "a.1", "a.2"]
+
+
+class TestSDRFCorpus:
+    def test_rows_are_dictionary_encoded(self, corpus):
+        assert corpus.num_rows == 3
+        codes, values = corpus.columns["comment[instrument]"]
+        assert list(codes) == [0, 0, 1]
+        assert len(values) == 2
+        assert corpus.value("dataset_id", 2) == "PXD2"
+        assert corpus.value("file", 0) == "PXD1.sdrf.tsv"
+
+    def test_missing_columns_and_short_rows(self, corpus):
+        # Columns a file does not have are MISSING, short rows are padded with ''
+        assert list(corpus.columns["characteristics[organism]"][0])[:2] == [MISSING, MISSING]
+        assert corpus.value("characteristics[cell line]", 2) is None
+        assert corpus.value("comment[modification parameters].1", 1) == ""
+
+    def test_rows_where_matches_term_names(self, corpus):
+        conditions = {
+            "characteristics[cell line]": "hela",
+            "comment[instrument]": "Orbitrap Exploris 480",
+        }
+        assert corpus.rows_where(conditions) == [0]
+        assert corpus.datasets_where({"comment[instrument]": "Orbitrap Exploris 480"}) == ["PXD1"]
+        assert corpus.rows_where({"comment[unknown]": "x"}) == []
+
+    @pytest.mark.parametrize(
+        ("suffix", "module"), [(".npz", "numpy"), (".parquet", "pyarrow")]
+    )
+    def test_write_and_load_round_trip(self, corpus, tmp_path, suffix, module):
+        pytest.importorskip(module)
+        path = tmp_path / f"corpus{suffix}"
+        assert corpus.write(path) == path
+        loaded = SDRFCorpus.load(path)
+        assert loaded.num_rows == corpus.num_rows
+        assert list(loaded.columns) == list(corpus.columns)
+        for name, (codes, values) in corpus.columns.items():
+            assert list(loaded.columns[name][0]) == list(codes)
+            assert loaded.columns[name][1] == values
+
+    def test_parquet_falls_back_to_npz_without_pyarrow(self, corpus, tmp_path, monkeypatch):
+        pytest.importorskip("numpy")
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        written = corpus.write(tmp_path / "corpus.parquet")
+        assert written == tmp_path / "corpus.npz"
+        assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith("corpus")) == ["corpus.npz"]
+        assert SDRFCorpus.load(written).num_rows == corpus.num_rows
+
+    def test_unknown_suffix_is_rejected(self, corpus, tmp_path):
+        with pytest.raises(ValueError, match="use .parquet or .npz"):
+            corpus.write(tmp_path / "corpus.dat")
+        assert not list(tmp_path.glob("corpus*"))
@@ -0,0 +1,90 @@
+"""Tests for the faceted dataset index queries."""
+
+import json
+
+import pytest
+
+from sdrf_dataset_query import DatasetIndex
+
+
+def _dataset(id, organisms, label_type, instruments, num_samples, experiment_type="DDA"):
+    return {
+        "id": id,
+        "organisms": organisms,
+        "diseases": ["normal"],
+        "instruments": instruments,
+        "acquisition_methods": [],
+        "experiment_type": experiment_type,
+        "label_type": label_type,
+        "template": "human",
+        "num_samples": num_samples,
+    }
+
+
+@pytest.fixture
+def index():
+    return DatasetIndex({
+        "datasets": [
+            _dataset("PXD1", ["Homo sapiens"], "TMT", ["Q Exactive"], 10),
+            _dataset("PXD2", ["homo sapiens", "Mus musculus"], "Label-free", ["Q Exactive"], 20),
+            _dataset("PXD3", ["Mus musculus"], "TMT", ["Orbitrap Fusion"], 30),
+            _dataset("PXD4", ["Homo sapiens"], "iTRAQ", ["Orbitrap Fusion"], 40, "DIA"),
+        ]
+    })
+
+
+def _ids(datasets):
+    return [d["id"] for d in datasets]
+
+
+class TestQuery:
+    def test_query_is_conjunctive_and_case_insensitive(self, index):
+        assert _ids(index.query(organism="HOMO SAPIENS")) == ["PXD1", "PXD2", "PXD4"]
+        assert _ids(index.query(organism="Homo sapiens", label_type="TMT")) == ["PXD1"]
+        assert index.query(organism="Homo sapiens", instrument="unknown") == []
+
+    def test_list_values_and_match_any_are_disjunctive(self, index):
+        assert _ids(index.query(label_type=["TMT", "iTRAQ"])) == ["PXD1", "PXD3", "PXD4"]
+        mask = index.match_any(experiment_type="DIA", instrument="Q Exactive")
+        assert _ids(index.datasets_of(mask)) == ["PXD1", "PXD2", "PXD4"]
+
+    def test_masks_combine_with_set_operators(self, index):
+        human = index.mask("organism", "Homo sapiens")
+        tmt = index.mask("label_type", "TMT")
+        assert _ids(index.datasets_of(human & ~tmt)) == ["PXD2", "PXD4"]
+        assert index.match_all() == index.all_mask
+
+    def test_unknown_facet_is_rejected(self, index):
+        with pytest.raises(ValueError, match="Unknown facet"):
+            index.query(species="Homo sapiens")
+
+
+class TestAggregations:
+    def test_sample_aggregations(self, index):
+        mask = index.match_all(organism="Homo sapiens")
+        assert index.count(mask) == 3
+        assert index.samples(mask) == 70
+        assert index.aggregate("instrument", mask) == {
+            "Q Exactive": {"datasets": 2, "samples": 30},
+            "Orbitrap Fusion": {"datasets": 1, "samples": 40},
+        }
+        assert index.values("organism") == ["Homo sapiens", "Mus musculus"]
+
+    def test_numpy_sums_match_the_bit_loop(self, index):
+        pytest.importorskip("numpy")
+        not_mouse = ~index.mask("organism", "Mus musculus")
+        masks = [0, index.all_mask, index.mask("label_type", "TMT"), not_mouse]
+        expected = [0, 100, 40, 50]
+        assert [index.samples(mask) for mask in masks] == expected
+        by_instrument = index.aggregate("instrument")
+        index._num_samples = None
+        assert [index.samples(mask) for mask in masks] == expected
+        assert index.aggregate("instrument") == by_instrument
+
+
+class TestFromJson:
+    def test_from_json(self, tmp_path, index):
+        path = tmp_path / "sdrf-data.json"
+        path.write_text(json.dumps({"datasets": index.datasets, "statistics": {}}))
+        loaded = DatasetIndex.from_json(path)
+        assert _ids(loaded.query(label_type="TMT")) == ["PXD1", "PXD3"]
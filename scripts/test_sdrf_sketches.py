@@ -0,0 +1,82 @@
+"""Tests for the bounded-memory statistics sketches."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from sdrf_sketches import HyperLogLog, SpaceSaving
+
+
+def _zipf_stream(n, distinct, seed=0):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices([f"value-{i}" for i in range(distinct)], weights, k=n)
+
+
+class TestSpaceSaving:
+    def test_space_saving_is_exact_below_capacity(self):
+        stream = _zipf_stream(2000, 40)
+        exact = Counter(stream)
+        sketch = SpaceSaving(100)
+        sketch.update(stream)
+        assert sketch.most_common(20) == exact.most_common(20)
+        assert sketch.max_error() == 20
+        assert all(sketch.error(item) == 0 for item in exact)
+
+    def test_space_saving_bounds_hold_after_evictions(self):
+        stream = _zipf_stream(20000, 2000, seed=1)
+        exact = Counter(stream)
+        sketch = SpaceSaving(100)
+        for item in stream:
+            sketch.add(item)
+
+        assert len(sketch) == 100
+        assert sketch.total == len(stream)
+        for item, count in sketch.most_common():
+            assert count - sketch.error(item) <= exact[item] <= count
+            assert sketch.error(item) <= sketch.max_error()
+        # Every item above N / capacity is monitored
+        for item, count in exact.items():
+            if count > sketch.max_error():
+                assert item in sketch
+
+    def test_space_saving_weighted_updates_match_unit_updates(self):
+        counts = {"Homo sapiens": 500, "Mus musculus": 120, "HeLa": 7}
+        weighted = SpaceSaving(10)
+        weighted.update(counts)
+        unit = SpaceSaving(10)
+        for item, count in counts.items():
+            for _ in range(count):
+                unit.add(item)
+        assert weighted.most_common() == unit.most_common()
+
+    def test_space_saving_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            SpaceSaving(0)
+
+
+class TestHyperLogLog:
+    @pytest.mark.parametrize("n", [0, 1, 50, 1000, 50000])
+    def test_hyperloglog_estimate_within_error(self, n):
+        sketch = HyperLogLog()
+        sketch.update(f"sample-{i}" for i in range(n))
+        # Four standard errors, plus slack for the tiny cardinalities
+        assert abs(sketch.estimate() - n) <= 4 * sketch.relative_error() * n + 1
+
+    def test_hyperloglog_merge_is_union(self):
+        left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        left.update(f"file-{i}.raw" for i in range(0, 6000))
+        right.update(f"file-{i}.raw" for i in range(3000, 9000))
+        union.update(f"file-{i}.raw" for i in range(0, 9000))
+        left.merge(right)
+        assert left.registers == union.registers
+
+    def test_hyperloglog_json_round_trip(self):
+        sketch = HyperLogLog(precision=10)
+        sketch.update(["Homo sapiens", "Mus musculus"])
+        restored = HyperLogLog.from_json(sketch.to_json())
+        assert restored.precision == 10
+        assert restored.registers == sketch.registers
+        with pytest.raises(ValueError):
+            restored.merge(HyperLogLog(precision=12))
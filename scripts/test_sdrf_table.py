@@ -0,0 +1,61 @@
+"""Tests for the memory-mapped SDRF table."""
+
+import pytest
+
+from sdrf_table import SDRFTable
+
+SDRF = (
+    "#template=human\n"
+    "#version=1.1.0\n"
+    "source name\tcharacteristics[organism]\tcomment[label]\tcomment[label]\n"
+    "s1\tHomo sapiens\tTMT126\tTMT127 \n"
+    "\n"
+    "s2\t Homo sapiens\tTMT126\n"
+    "   \t\t\r\n"
+    "s3\tMus musculus\tTMT126\tTMT128\r\n"
+)
+
+
+@pytest.fixture
+def table(write_sdrf):
+    with SDRFTable(write_sdrf("PXD000001.sdrf.tsv", SDRF)) as table:
+        yield table
+
+
+class TestSDRFTable:
+    def test_metadata_and_headers_are_read_without_indexing_rows(self, table):
+        assert table.metadata == {"template": "human", "version": "1.1.0"}
+        assert table.headers[1] == "characteristics[organism]"
+        assert table._starts is None
+
+    def test_rows_skip_blank_lines_and_are_padded(self, table):
+        assert len(table) == 3
+        assert table.row(1) == ["s2", "Homo sapiens", "TMT126", ""]
+        assert table.rows(2) == [["s3", "Mus musculus", "TMT126", "TMT128"]]
+        with pytest.raises(IndexError):
+            table.row(3)
+
+    def test_column_by_name_uses_last_repeated_header(self, table):
+        assert table.column("characteristics[organism]") == ["Homo sapiens", "Homo sapiens", "Mus musculus"]
+        assert table.column("comment[label]") == ["TMT127", "", "TMT128"]
+        assert table.column(0, 1, 3) == ["s2", "s3"]
+        with pytest.raises(KeyError):
+            table.column("characteristics[disease]")
+
+    def test_value_counts_skip_missing_cells(self, table):
+        counts = table.value_counts(["characteristics[organism]", "comment[label]", 2])
+        assert counts["characteristics[organism]"] == {"Homo sapiens": 2, "Mus musculus": 1}
+        assert counts["comment[label]"] == {"TMT127": 1, "TMT128": 1}
+        assert counts[2] == {"TMT126": 3}
+
+
+class TestDegenerateFiles:
+    def test_empty_file(self, write_sdrf):
+        with SDRFTable(write_sdrf("empty.sdrf.tsv", "")) as table:
+            assert table.headers is None
+            assert len(table) == 0
+
+    def test_header_only_file(self, write_sdrf):
+        with SDRFTable(write_sdrf("header.sdrf.tsv", "source name\tassay name\n")) as table:
+            assert table.headers == ["source name", "assay name"]
+            assert table.rows() == []
@@ -0,0 +1,61 @@
+"""Tests for the bitmask template combination resolver."""
+
+from itertools import combinations
+
+import pytest
+
+from template_combinations import TemplateCombinations
+
+
+@pytest.fixture(scope="module")
+def combos(resolved):
+    return TemplateCombinations(resolved)
+
+
+class TestMasks:
+    def test_mask_roundtrip(self, combos):
+        mask = combos.mask_of(["human", "dia-acquisition"])
+        assert sorted(combos.names_of(mask)) == ["dia-acquisition", "human"]
+        with pytest.raises(KeyError):
+            combos.mask_of(["no-such-template"])
+
+
+class TestResolve:
+    def test_mutually_exclusive_templates_are_invalid(self, combos):
+        result = combos.resolve(["ms-proteomics", "human", "vertebrates"])
+        assert result["valid"] is False
+        assert any("vertebrates" in reason for reason in result["violations"])
+
+    def test_empty_selection_is_invalid(self, combos):
+        result = combos.resolve([])
+        assert result["valid"] is False
+        assert result["violations"] == ["no template selected"]
+        assert combos.is_valid(0) is False
+        assert result["columns"] == []
+
+    def test_merged_columns_union_with_specific_override(self, combos):
+        result = combos.resolve(["human", "dia-acquisition"])
+        names = [c["name"] for c in result["columns"]]
+        assert len(names) == len(set(names))
+        expected = {
+            c["name"]
+            for tname in ("human", "dia-acquisition")
+            for c in combos.resolved[tname]["all_columns"]
+        }
+        assert set(names) == expected
+        disease = next(c for c in result["columns"] if c["name"] == "characteristics[disease]")
+        assert disease["source_template"] == "human"
+        assert combos.merged_columns(result["mask"]) is result["columns"]
+
+
+class TestValidity:
+    def test_is_valid_agrees_with_violations(self, combos):
+        candidates = [n for n, t in combos.resolved.items() if t.get("layer")][:10]
+        for size in range(len(candidates) + 1):
+            for subset in combinations(candidates, size):
+                mask = combos.mask_of(subset)
+                assert combos.is_valid(mask) == (not combos.violations(mask))
+
+    def test_merge_order_puts_ancestors_first(self, combos):
+        order = combos.merge_order(combos.mask_of(["dia-acquisition", "ms-proteomics", "human"]))
+        assert order.index("ms-proteomics") < order.index("dia-acquisition")
@@ -0,0 +1,51 @@
+"""Tests for the reverse indexes over resolved templates."""
+
+import pytest
+
+from template_index import ColumnRef, TemplateIndex
+
+
+@pytest.fixture(scope="module")
+def index(resolved):
+    return TemplateIndex(resolved)
+
+
+class TestColumnIndexes:
+    def test_templates_with_column_matches_scan(self, resolved, index):
+        expected = tuple(
+            name
+            for name, tpl in resolved.items()
+            if any(c["name"] == "characteristics[disease]" for c in tpl["all_columns"])
+        )
+        assert index.templates_with_column("characteristics[disease]") == expected
+        assert "human" in index.templates_with_column("characteristics[disease]", own_only=True)
+        assert index.templates_with_column("no such column") == ()
+
+    def test_columns_by_requirement_matches_scan(self, resolved, index):
+        for requirement in ("required", "recommended", "optional"):
+            expected = tuple(
+                c["name"]
+                for c in resolved["human"]["all_columns"]
+                if c.get("requirement", "optional") == requirement
+            )
+            assert index.columns_by_requirement("human", requirement) == expected
+
+
+class TestValidatorIndexes:
+    def test_columns_with_validator_and_ontology(self, index):
+        refs = index.columns_with_validator("ontology")
+        assert refs
+        for ref in refs:
+            col = index.column(*ref)
+            assert col["source_template"] == ref.template
+            assert any(v.get("validator_name") == "ontology" for v in col["validators"])
+        organism_refs = [
+            ref
+            for ontology in index.ontologies()
+            for ref in index.columns_for_ontology(ontology)
+            if ref.column == "characteristics[organism]"
+        ]
+        assert organism_refs
+        assert all(isinstance(ref, ColumnRef) for ref in organism_refs)
+        for ontology in index.ontologies():
+            assert index.columns_for_ontology(ontology.upper()) == index.columns_for_ontology(ontology)
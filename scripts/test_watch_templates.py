@@ -0,0 +1,64 @@
+"""Tests for the incremental template watcher."""
+
+import json
+import sys
+
+import pytest
+
+from build_template_pages import load_page_template
+from resolve_templates import IncrementalResolver, load_manifest, write_templates_snapshot
+from watch_templates import main, poll, rebuild
+
+
+@pytest.fixture
+def watched(templates_copy, tmp_path):
+    resolver = IncrementalResolver(templates_copy)
+    output_dir = tmp_path / "site"
+    page_template = load_page_template()
+    rebuild(resolver, output_dir, page_template)
+    return resolver, output_dir, page_template
+
+
+class TestPoll:
+    def test_unchanged_tree_rebuilds_nothing(self, watched):
+        assert poll(*watched) == set()
+
+    def test_broken_yaml_is_reported_and_retried(self, watched, templates_copy, capsys):
+        resolver = watched[0]
+        manifest = load_manifest(templates_copy)
+        human_yaml = templates_copy / "human" / manifest["human"]["latest"] / "human.yaml"
+        original = human_yaml.read_text()
+        capsys.readouterr()
+
+        human_yaml.write_text(original + "\ncolumns: [unclosed\n")
+        assert poll(*watched) == set()
+        assert "Rebuild failed" in capsys.readouterr().err
+        # Still broken: reported again rather than silently skipped
+        assert poll(*watched) == set()
+        assert "Rebuild failed" in capsys.readouterr().err
+
+        human_yaml.write_text(original.replace("name: human", "name: human\n# fixed", 1))
+        affected = poll(*watched)
+        assert "human" in affected
+        assert capsys.readouterr().err == ""
+        assert resolver.resolved["human"]["name"] == "human"
+        output_dir = watched[1]
+        assert (output_dir / "templates" / "human.html").is_file()
+        with open(output_dir / "sdrf-builder-data.json") as f:
+            assert "human" in json.load(f)["templates"]
+
+
+class TestSnapshotSource:
+    def test_snapshot_is_rejected_with_a_clear_message(
+        self, templates_dir, tmp_path, monkeypatch, capsys
+    ):
+        snapshot = tmp_path / "templates-snapshot.json"
+        write_templates_snapshot(templates_dir, snapshot)
+        with pytest.raises(ValueError, match="snapshot"):
+            IncrementalResolver(snapshot)
+
+        monkeypatch.setattr(sys, "argv", ["watch_templates.py", str(snapshot), str(tmp_path / "site")])
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code == 2
+        assert "incremental rebuilds need the sdrf-templates directory" in capsys.readouterr().err
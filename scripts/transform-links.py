@@ -21,6 +21,8 @@ import sys
 import re
 from pathlib import Path
 
+from build_profiling import StageProfiler, pop_profile_option
+
 
 def transform_sdrf_explorer_links(content: str) -> tuple[str, int]:
     """Transform GitHub annotated dataset links to SDRF Explorer links."""
@@ -143,8 +145,9 @@ def transform_directory(dirpath: str) -> dict:
 
 
 def main():
+    profiler = StageProfiler.create("transform-links", pop_profile_option(sys.argv))
     if len(sys.argv) < 2:
-        print("Usage: python3 transform-links.py <html_file_or_directory>")
+        print("Usage: python3 transform-links.py <html_file_or_directory> [--profile[=DIR]]")
         sys.exit(1)
 
     target = Path(sys.argv[1])
@@ -154,15 +157,18 @@ def main():
         sys.exit(1)
 
     if target.is_file():
-        counts = transform_file(str(target))
+        with profiler.stage("transform"):
+            counts = transform_file(str(target))
         print(f"Transformed {counts['total']} links in {target}")
         print(f"  - SDRF Explorer links: {counts['sdrf_explorer']}")
         print(f"  - AsciiDoc to HTML links: {counts['adoc_to_html']}")
     else:
-        counts = transform_directory(str(target))
+        with profiler.stage("transform"):
+            counts = transform_directory(str(target))
         print(f"\nTotal: Transformed {counts['total']} links in {counts['files']} files")
         print(f"  - SDRF Explorer links: {counts['sdrf_explorer']}")
         print(f"  - AsciiDoc to HTML links: {counts['adoc_to_html']}")
+    profiler.report()
 
 
 if __name__ == "__main__":
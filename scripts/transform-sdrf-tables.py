@@ -13,6 +13,8 @@ import sys
 import re
 from pathlib import Path
 
+from build_profiling import StageProfiler, pop_profile_option
+
 
 def classify_column(header_text: str) -> str:
     """Classify a column based on its header text."""
@@ -154,8 +156,9 @@ def process_html_file(filepath: Path) -> None:
 
 
 def main():
+    profiler = StageProfiler.create("transform-sdrf-tables", pop_profile_option(sys.argv))
     if len(sys.argv) < 2:
-        print("Usage: python3 transform-sdrf-tables.py <output_dir>")
+        print("Usage: python3 transform-sdrf-tables.py <output_dir> [--profile[=DIR]]")
         sys.exit(1)
 
     output_dir = Path(sys.argv[1])
@@ -163,10 +166,12 @@ def main():
     # Process all HTML files
     html_files = list(output_dir.glob("**/*.html"))
 
-    for html_file in html_files:
-        process_html_file(html_file)
+    with profiler.stage("transform"):
+        for html_file in html_files:
+            process_html_file(html_file)
 
     print("SDRF table transformation complete!")
+    profiler.report()
 
 
 if __name__ == "__main__":
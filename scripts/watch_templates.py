@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Watch YAML templates and rebuild only the affected outputs.
+
+Keeps the resolved template tree in memory. When a template YAML changes,
+only that template and the templates inheriting from it are re-resolved,
+and only their HTML pages and builder JSON entries are rewritten.
+
+Usage:
+    python3 scripts/watch_templates.py <sdrf-templates-dir> <output-dir> [--interval SECONDS]
+
+<output-dir> is a built site (e.g. demo_page/): pages go to
+<output-dir>/templates/ and builder data to <output-dir>/sdrf-builder-data.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from build_sdrf_builder_data import (  # noqa: E402
+    _extract_combination_rules,
+    _load_terms,
+    build_builder_data,
+    serialize_template,
+    write_builder_data,
+)
+from build_template_pages import load_page_template, write_template_pages  # noqa: E402
+from resolve_templates import IncrementalResolver  # noqa: E402
+
+
+def update_builder_data(
+    builder_path: Path, all_templates: dict[str, dict], affected: set[str]
+) -> None:
+    """Rewrite only the affected template entries of the builder JSON."""
+    if not builder_path.exists():
+        repo_root = Path(__file__).resolve().parent.parent
+        write_builder_data(
+            build_builder_data(all_templates, _load_terms(repo_root)), builder_path
+        )
+        return
+
+    with open(builder_path) as f:
+        data = json.load(f)
+    templates_json = data.get("templates", {})
+    for name in affected:
+        if name in all_templates:
+            templates_json[name] = serialize_template(all_templates[name])
+        else:
+            templates_json.pop(name, None)
+    data["templates"] = {
+        name: templates_json[name] for name in all_templates if name in templates_json
+    }
+    data["combination_rules"] = _extract_combination_rules(all_templates)
+    write_builder_data(data, builder_path)
+
+
+def rebuild(
+    resolver: IncrementalResolver, output_dir: Path, page_template
+) -> set[str]:
+    """Refresh the resolver and rewrite outputs for affected templates."""
+    affected = resolver.refresh()
+    if not affected:
+        return affected
+
+    pages_dir = output_dir / "templates"
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    current = sorted(name for name in affected if name in resolver.resolved)
+    write_template_pages(
+        resolver.resolved, pages_dir, names=current, page_template=page_template
+    )
+    for name in affected - set(current):
+        (pages_dir / f"{name}.html").unlink(missing_ok=True)
+        print(f"  Removed: {pages_dir / f'{name}.html'}")
+
+    update_builder_data(
+        output_dir / "sdrf-builder-data.json", resolver.resolved, affected
+    )
+    return affected
+
+
+def poll(resolver: IncrementalResolver, output_dir: Path, page_template) -> set[str]:
+    """Run one rebuild of the watch loop, reporting errors instead of raising.
+
+    A template that fails to parse or resolve is reported on stderr and
+    retried on the next poll, so a half-saved or broken YAML file does not
+    stop the watcher.
+    """
+    start = time.perf_counter()
+    try:
+        affected = rebuild(resolver, output_dir, page_template)
+    except Exception as e:
+        print(f"Rebuild failed: {type(e).__name__}: {e}", file=sys.stderr)
+        return set()
+    if affected:
+        print(
+            f"Rebuilt {', '.join(sorted(affected))} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+    return affected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Watch sdrf-templates and incrementally rebuild template outputs."
+    )
+    parser.add_argument("templates_dir", type=Path, help="Path to sdrf-templates")
+    parser.add_argument("output_dir", type=Path, help="Built site directory")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval in seconds (default: 0.5)",
+    )
+    args = parser.parse_args()
+
+    try:
+        resolver = IncrementalResolver(args.templates_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    page_template = load_page_template()
+
+    start = time.perf_counter()
+    affected = rebuild(resolver, args.output_dir, page_template)
+    print(
+        f"Built {len(affected)} templates in {time.perf_counter() - start:.2f}s; "
+        f"watching {args.templates_dir} (Ctrl+C to stop)"
+    )
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            poll(resolver, args.output_dir, page_template)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+
+if __name__ == "__main__":
+    main()
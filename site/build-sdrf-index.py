@@ -5,97 +5,528 @@ Build SDRF Index and Statistics
 This script scans all SDRF files in the repository and generates:
 1. A JSON index of all datasets with metadata
 2. Pre-computed statistics for the SDRF explorer dashboard
+3. The explorer data: a summary file plus dataset shards loaded on demand
 
 Run this script as part of the CI/CD build process.
 """
 
+import argparse
+import hashlib
 import os
 import json
 import glob
 import re
+import shutil
+import sys
+import tempfile
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from datetime import datetime
 
-def parse_sdrf_file(filepath):
-    """Parse an SDRF file and extract metadata and statistics."""
-    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
-
-    lines = content.strip().split('\n')
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+import sdrf_cells  # noqa: E402
+import sdrf_classifier  # noqa: E402
+import sdrf_corpus  # noqa: E402
+import sdrf_sketches  # noqa: E402
+import sdrf_table  # noqa: E402
+from build_profiling import StageProfiler, add_profile_argument  # noqa: E402
+from sdrf_cells import term_name  # noqa: E402
+from sdrf_classifier import load_classifiers  # noqa: E402
+from sdrf_corpus import SDRFCorpus  # noqa: E402
+from sdrf_sketches import HyperLogLog, SpaceSaving  # noqa: E402
+from sdrf_table import SDRFTable  # noqa: E402
+
+NA_VALUES = ['not available', 'not applicable', 'na', 'n/a', '']
+
+# Statistics gathered from every file: (key, column patterns, term names
+# excluded after parsing the ontology value)
+STAT_FIELDS = [
+    ('organisms', ['characteristics[organism]'], []),
+    ('organism_parts', ['characteristics[organism part]'], ['not available', 'not applicable']),
+    ('diseases', ['characteristics[disease]'], ['not available', 'not applicable', 'normal']),
+    ('cell_types', ['characteristics[cell type]'], ['not available', 'not applicable']),
+    ('instruments', ['comment[instrument]'], []),
+    ('labels', ['comment[label]'], []),
+    ('acquisition_methods', ['comment[proteomics data acquisition method]'], []),
+    ('modifications', ['comment[modification parameters]', 'comment[modification identifier]'], []),
+    ('cleavage_agents', ['comment[cleavage agent details]'], []),
+]
+# Number of top values reported per statistic
+STAT_TOP_N = {
+    'organisms': 50,
+    'organism_parts': 50,
+    'diseases': 50,
+    'cell_types': 50,
+    'instruments': 50,
+    'labels': 20,
+    'acquisition_methods': 20,
+    'modifications': 30,
+    'cleavage_agents': 20,
+}
+# Columns whose number of distinct term names is estimated with HyperLogLog
+# sketches, per dataset and (by merging those) across the corpus
+DISTINCT_FIELDS = [
+    ('organisms', ['characteristics[organism]']),
+    ('cell_lines', ['characteristics[cell line]']),
+    ('individuals', ['characteristics[individual]']),
+    ('diseases', ['characteristics[disease]']),
+    ('instruments', ['comment[instrument]']),
+    ('data_files', ['comment[data file]']),
+]
+
+# Dataset entry field -> classifier of the experiment_type and label_type
+CLASSIFIERS = load_classifiers()
+
+# Per-dataset column profiles (relative to site/) and top values kept per column
+PROFILES_DIR = 'sdrf-profiles'
+PROFILE_TOP_N = 5
+
+INDEX_CACHE_FORMAT_VERSION = 1
+
+# Explorer data directory (relative to site/) and datasets per shard
+EXPLORER_DATA_DIR = 'sdrf-explorer-data'
+DEFAULT_SHARD_SIZE = 250
+
+# Facets of the explorer's inverted index -> dataset entry field
+FACET_FIELDS = {
+    'organism': 'organisms',
+    'disease': 'diseases',
+    'instrument': 'instruments',
+    'experiment_type': 'experiment_type',
+    'label_type': 'label_type',
+}
+
+# The explorer page's only reference to its data
+EXPLORER_REFERENCE_RE = re.compile(r'<meta name="sdrf-data" content="[^"\n]*">')
+
+DEFAULT_INDEX_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'sdrf-index'
+)
+
+def parse_sdrf_file(filepath, column_patterns=None):
+    """Count the values of the selected columns of an SDRF file.
+
+    The file is read through an SDRFTable, so rows are never kept and only
+    the distinct values of the selected columns are decoded: memory grows
+    with the number of columns and distinct values rather than with the
+    number of rows.
+
+    Args:
+        filepath: Path to the SDRF file.
+        column_patterns: Only count columns whose name contains one of these
+            substrings (all columns when None).
+
+    Returns:
+        Dict with 'metadata', 'headers', 'num_rows', 'positions' (column
+        position -> Counter of its values) and 'columns' (column name ->
+        Counter; when a header is repeated, the last column with that name).
+    """
+    with SDRFTable(filepath) as table:
+        headers = table.headers
+        if headers is None:
+            return None
+        positions = table.value_counts(
+            i for i, name in enumerate(headers)
+            if column_patterns is None or any(p in name for p in column_patterns)
+        )
+        last = {name: i for i, name in enumerate(headers)}
+        return {
+            'metadata': table.metadata,
+            'headers': headers,
+            'columns': {headers[i]: positions[last[headers[i]]] for i in positions},
+            'positions': positions,
+            'num_rows': len(table)
+        }
 
-    # Parse header metadata
-    metadata = {}
-    data_start = 0
+def extract_column_values(parsed, column_patterns):
+    """Count values from columns matching patterns, skipping empty and NA values."""
+    values = Counter()
+    for col, column_counts in parsed['columns'].items():
+        if not any(pattern in col for pattern in column_patterns):
+            continue
+        for val, count in column_counts.items():
+            if val and val.lower() not in NA_VALUES:
+                values[val] += count
+    return values
 
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if line.startswith('#'):
-            match = re.match(r'^#(\w+)=(.+)$', line)
-            if match:
-                metadata[match.group(1)] = match.group(2)
-            data_start = i + 1
-        else:
-            break
+def summarize_file(parsed):
+    """Count the parsed term names of every STAT_FIELDS entry in one file.
+
+    Each distinct cell value is parsed once, however many rows share it, and
+    parse_cell() caches the parse across files.
+
+    Returns:
+        Dict mapping each statistics key to a Counter of term names, in
+        first-seen order.
+    """
+    stats = {}
+    for key, patterns, excluded in STAT_FIELDS:
+        names = Counter()
+        for value, count in extract_column_values(parsed, patterns).items():
+            name = term_name(value)
+            if name and name.lower() not in excluded:
+                names[name] += count
+        stats[key] = names
+    return stats
+
+def sketch_file(parsed):
+    """Build a HyperLogLog sketch of the term names of every DISTINCT_FIELDS entry.
+
+    Returns:
+        Dict mapping each key to its sketch.
+    """
+    sketches = {}
+    for key, patterns in DISTINCT_FIELDS:
+        sketch = HyperLogLog()
+        for value in extract_column_values(parsed, patterns):
+            name = term_name(value)
+            if name:
+                sketch.add(name)
+        sketches[key] = sketch
+    return sketches
+
+def profile_file(parsed):
+    """Profile every column of a file, in header order.
+
+    Rates are shares of all rows: 'fill_rate' counts non-empty cells,
+    'not_available' and 'not_applicable' count those exact values (any
+    case). 'distinct' is the number of distinct non-empty values and 'top'
+    the most common ones with their counts.
+    """
+    num_rows = parsed['num_rows']
+    columns = []
+    for position, counts in parsed['positions'].items():
+        values = Counter({value: count for value, count in counts.items() if value})
+        lowered = Counter()
+        for value, count in values.items():
+            lowered[value.lower()] += count
+        columns.append({
+            'name': parsed['headers'][position],
+            'fill_rate': round(sum(values.values()) / num_rows, 4),
+            'not_available': round(lowered['not available'] / num_rows, 4),
+            'not_applicable': round(lowered['not applicable'] / num_rows, 4),
+            'distinct': len(values),
+            'top': [[value, count] for value, count in values.most_common(PROFILE_TOP_N)],
+        })
+    return {'num_rows': num_rows, 'columns': columns}
+
+def profile_name(filepath):
+    """File name of the column profile of an SDRF file."""
+    return os.path.basename(filepath).replace('.sdrf.tsv', '') + '.json'
+
+def project_id_for(filepath, datasets_dir):
+    """Accession a file belongs to, taken from its path inside the datasets/ tree."""
+    rel_in_datasets = os.path.relpath(filepath, datasets_dir)
+    parts = rel_in_datasets.split(os.sep)
+    if len(parts) >= 2:
+        return parts[0]
+    return os.path.basename(filepath).replace('.sdrf.tsv', '')
+
+def index_sdrf_file(filepath, datasets_dir, datasets_repo, datasets_branch):
+    """Parse one SDRF file into its dataset entry and statistics contribution.
+
+    Only depends on the file itself, so it can run in a worker process.
+
+    Returns:
+        Dict with 'entry' (the dataset index entry, without
+        accession_file_count), 'stats' (see summarize_file), 'sketches'
+        (see sketch_file, serialized) and 'profile' (see profile_file), or
+        None for files without data rows.
+    """
+    datasets_prefix = 'datasets'
+    project_id = project_id_for(filepath, datasets_dir)
 
-    # Parse column headers
-    if data_start >= len(lines):
+    # Parse the file; every column is counted for the column profile
+    parsed = parse_sdrf_file(filepath)
+    if not parsed or parsed['num_rows'] == 0:
         return None
 
-    headers = lines[data_start].split('\t')
-    headers = [h.strip().lower() for h in headers]
-    data_start += 1
+    headers = parsed['headers']
+    num_samples = parsed['num_rows']
+    file_stats = summarize_file(parsed)
+    sketches = sketch_file(parsed)
+
+    # Unique values for this dataset
+    dataset_organisms = list(file_stats['organisms'])
+    dataset_diseases = list(file_stats['diseases'])
+    dataset_instruments = list(file_stats['instruments'])
+    dataset_acq = list(file_stats['acquisition_methods'])
+
+    # Experiment and label type, from the vocabulary in sdrf_vocabulary.json
+    classes = {
+        facet: classifier.classify_values(extract_column_values(parsed, [classifier.column]))
+        for facet, classifier in CLASSIFIERS.items()
+    }
 
-    # Parse data rows
-    rows = []
-    for i in range(data_start, len(lines)):
-        line = lines[i].strip()
-        if line:
-            values = line.split('\t')
-            row = {headers[j]: values[j].strip() if j < len(values) else ''
-                   for j in range(len(headers))}
-            rows.append(row)
+    # Keep local parsing on annotated-projects/ while publishing links via datasets/
+    datasets_rel_path = os.path.join(datasets_prefix, project_id, os.path.basename(filepath)).replace(os.sep, '/')
+
+    # Create dataset entry
+    dataset_entry = {
+        'id': project_id,
+        'file': os.path.basename(filepath),  # Alias for filename (used by quickstart search)
+        'filename': os.path.basename(filepath),
+        'path': datasets_rel_path,
+        'accession_path': os.path.join(datasets_prefix, project_id).replace(os.sep, '/'),
+        'github_url': f'https://github.com/{datasets_repo}/blob/{datasets_branch}/{datasets_rel_path}',
+        'accession_github_url': f'https://github.com/{datasets_repo}/tree/{datasets_branch}/{datasets_prefix}/{project_id}',
+        'raw_url': f'https://raw.githubusercontent.com/{datasets_repo}/{datasets_branch}/{datasets_rel_path}',
+        'num_samples': num_samples,
+        'num_columns': len(headers),
+        'organisms': [o for o in dataset_organisms if o],
+        'diseases': [d for d in dataset_diseases if d],
+        'instruments': [i for i in dataset_instruments if i],
+        'acquisition_methods': [a for a in dataset_acq if a],  # Used by quickstart search
+        **classes,
+        'accession_file_count': None,  # Filled in once all files are known
+        'template': parsed['metadata'].get('template', 'unknown'),
+        'version': parsed['metadata'].get('version', 'unknown'),
+        'distinct_counts': {key: round(sketch.estimate()) for key, sketch in sketches.items()},
+        'profile_path': f'{PROFILES_DIR}/{project_id}/{profile_name(filepath)}',
+    }
 
     return {
-        'metadata': metadata,
-        'headers': headers,
-        'rows': rows,
-        'num_rows': len(rows)
+        'entry': dataset_entry,
+        'stats': file_stats,
+        'sketches': {key: sketch.to_json() for key, sketch in sketches.items()},
+        'profile': profile_file(parsed),
     }
 
-def extract_column_values(rows, column_patterns):
-    """Extract values from columns matching patterns."""
-    values = []
-    for row in rows:
-        for col, val in row.items():
-            for pattern in column_patterns:
-                if pattern in col and val and val.lower() not in ['not available', 'not applicable', 'na', 'n/a', '']:
-                    values.append(val)
-                    break
-    return values
-
-def get_unique_values(rows, column_patterns):
-    """Get unique values from columns matching patterns."""
-    return list(set(extract_column_values(rows, column_patterns)))
-
-def parse_ontology_term(value):
-    """Extract the name from an ontology term value like 'NT=Homo sapiens;AC=NCBITaxon:9606'."""
-    if not value:
-        return value
-
-    # Check for NT= format
-    nt_match = re.search(r'NT=([^;]+)', value)
-    if nt_match:
-        return nt_match.group(1)
-
-    # Check for AC= format and return the value before it or the whole thing
-    if ';AC=' in value:
-        return value.split(';AC=')[0]
+def file_sha256(filepath):
+    """Hex SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def index_cache_fingerprint(datasets_repo, datasets_branch):
+    """Hash of everything besides the file itself that shapes a cached result.
+
+    The source of this script, of the shared SDRF readers, cell parser,
+    classifier and statistics sketches, and the classifier vocabulary are
+    included, so any change to the parsing, the cached sketches or the entry
+    layout invalidates the whole cache.
+    """
+    digest = hashlib.sha256()
+    digest.update(f'format={INDEX_CACHE_FORMAT_VERSION}\n'.encode())
+    digest.update(f'{datasets_repo}@{datasets_branch}\n'.encode())
+    sources = (
+        os.path.abspath(__file__), sdrf_cells.__file__, sdrf_corpus.__file__,
+        sdrf_classifier.__file__, sdrf_classifier.VOCABULARY_PATH, sdrf_sketches.__file__,
+        sdrf_table.__file__,
+    )
+    for source in sources:
+        with open(source, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def load_index_cache(cache_path, fingerprint):
+    """Load the per-file cache records, or an empty dict if missing or stale."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('fingerprint') != fingerprint:
+        return {}
+    return cache.get('files', {})
+
+def save_index_cache(cache_path, fingerprint, files):
+    """Atomically write the per-file cache records."""
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'files': files}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def write_json(data, path, indent=None):
+    """Write JSON, minified unless an indent is given."""
+    separators = None if indent else (',', ':')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, separators=separators, ensure_ascii=False)
+
+def organism_facet(datasets):
+    """Number of datasets per organism, merging names that differ only in case."""
+    counts = Counter()
+    display = {}
+    for dataset in datasets:
+        for organism in {o.lower(): o for o in dataset['organisms']}.values():
+            key = organism.lower()
+            display.setdefault(key, organism)
+            counts[key] += 1
+    return {display[key]: count for key, count in counts.items()}
+
+def write_hashed_json(data, directory, stem, indent=None):
+    """Write JSON under a content-hashed name such as 'stem.1a2b3c4d5e6f.json'.
+
+    The name changes whenever the content does, so the file can be cached
+    by browsers and CDNs indefinitely. An existing file with the same name
+    is only kept if it holds exactly this content; otherwise (e.g. left
+    truncated by an interrupted build) it is replaced. The file is written
+    to a temporary name and renamed into place, so it is never seen partly
+    written.
+
+    Returns:
+        The file name.
+    """
+    separators = None if indent else (',', ':')
+    encoded = json.dumps(data, indent=indent, separators=separators, ensure_ascii=False).encode('utf-8')
+    digest = hashlib.sha256(encoded).hexdigest()[:12]
+    name = f'{stem}.{digest}.json'
+    path = os.path.join(directory, name)
+    try:
+        if os.path.getsize(path) == len(encoded):
+            with open(path, 'rb') as f:
+                if f.read() == encoded:
+                    return name
+    except OSError:
+        pass
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+        # mkstemp creates the file private; these are public site assets
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return name
+
+def delta_encode(ordinals):
+    """Encode sorted ordinals as the first value followed by the gaps."""
+    return [current - previous for previous, current in zip([0] + ordinals, ordinals)]
+
+def build_facet_index(datasets):
+    """Inverted index from each facet value to the ordinals of its datasets.
+
+    Ordinals are positions in the dataset list, which follows the sorted
+    file paths and is therefore stable between builds. Each posting list is
+    sorted and delta-encoded. Organism values are lower-cased, like the
+    explorer's organism filter.
+    """
+    postings = {facet: {} for facet in FACET_FIELDS}
+    for ordinal, dataset in enumerate(datasets):
+        for facet, field in FACET_FIELDS.items():
+            values = dataset[field]
+            if isinstance(values, str):
+                values = [values]
+            if facet == 'organism':
+                values = [value.lower() for value in values]
+            for value in dict.fromkeys(values):
+                postings[facet].setdefault(value, []).append(ordinal)
+    return {
+        facet: {value: delta_encode(ordinals) for value, ordinals in values.items()}
+        for facet, values in postings.items()
+    }
 
-    return value
+def write_explorer_data(output, explorer_dir, shard_size, indent=None):
+    """Write the explorer summary and the dataset list split into shards.
+
+    The sdrf-data.<hash>.json summary holds the statistics, the facet values
+    for the filters and the names of the other files; the explorer renders
+    its dashboard from it and fetches datasets-NNN.<hash>.json shards only
+    as they are needed. Filters are answered from the facets.<hash>.json
+    posting lists (see build_facet_index). All names are content-hashed, so
+    shards that did not change keep their name and stay cached. Files from
+    previous builds are removed.
+
+    Returns:
+        Tuple of the summary file name and the number of shards written.
+    """
+    os.makedirs(explorer_dir, exist_ok=True)
+    datasets = output['datasets']
+    shards = []
+    for start in range(0, len(datasets), shard_size):
+        chunk = datasets[start:start + shard_size]
+        name = write_hashed_json(chunk, explorer_dir, f'datasets-{len(shards):03d}', indent)
+        shards.append({'file': name, 'count': len(chunk)})
+
+    facet_index_name = write_hashed_json(
+        build_facet_index(datasets), explorer_dir, 'facets', indent
+    )
+
+    summary = {
+        'statistics': output['statistics'],
+        'facets': {'organisms': organism_facet(datasets)},
+        'facet_index': facet_index_name,
+        'total_datasets': len(datasets),
+        'shard_size': shard_size,
+        'shards': shards,
+    }
+    summary_name = write_hashed_json(summary, explorer_dir, 'sdrf-data', indent)
+
+    current = {summary_name, facet_index_name} | {shard['file'] for shard in shards}
+    for stale in glob.glob(os.path.join(explorer_dir, '*.json')):
+        if os.path.basename(stale) not in current:
+            os.remove(stale)
+    return summary_name, len(shards)
+
+def update_explorer_reference(explorer_path, summary_url):
+    """Point the explorer's <meta name="sdrf-data"> tag at the current summary.
+
+    Only that one tag is replaced; the page is left untouched when it already
+    references summary_url.
+
+    Returns:
+        True if the page was rewritten.
+    """
+    with open(explorer_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    new_html, count = EXPLORER_REFERENCE_RE.subn(
+        f'<meta name="sdrf-data" content="{summary_url}">', html, count=1
+    )
+    if count != 1:
+        raise SystemExit(f'No <meta name="sdrf-data"> tag found in {explorer_path}')
+    if new_html == html:
+        return False
+    with open(explorer_path, 'w', encoding='utf-8') as f:
+        f.write(new_html)
+    return True
 
 def main():
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    datasets_prefix = 'datasets'
+    parser = argparse.ArgumentParser(description='Build the SDRF dataset index and statistics.')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Number of worker processes parsing SDRF files (default: 1; 0 uses all CPUs)'
+    )
+    parser.add_argument(
+        '--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+        help=f'Datasets per explorer data shard (default: {DEFAULT_SHARD_SIZE})'
+    )
+    parser.add_argument(
+        '--pretty', action='store_true',
+        help='Indent the JSON outputs for reading (default: minified)'
+    )
+    parser.add_argument(
+        '--approx-counters', type=int, metavar='K',
+        help='Keep at most K counters per statistic (Space-Saving top-k sketch) '
+             'instead of exact counts; reported counts are upper bounds with '
+             'per-value errors in statistics.approximate_counts'
+    )
+    parser.add_argument(
+        '--export', metavar='PATH',
+        help='Also export every sample row to a columnar store: Parquet for a '
+             '.parquet path (needs pyarrow; falls back to .npz without it) or '
+             'NumPy for a .npz path (needs numpy)'
+    )
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler.create('build-sdrf-index', args.profile)
+    if args.approx_counters is not None and args.approx_counters < max(STAT_TOP_N.values()):
+        parser.error(f'--approx-counters must be at least {max(STAT_TOP_N.values())}')
+    if args.export and os.path.splitext(args.export)[1] not in ('.parquet', '.npz'):
+        parser.error('--export must be a .parquet or .npz path')
+
     datasets_repo = os.environ.get('SDRF_DATASETS_REPO', 'bigbio/sdrf-annotated-datasets')
     datasets_branch = os.environ.get('SDRF_DATASETS_BRANCH', 'main')
     datasets_repo_url = f'https://github.com/{datasets_repo}'
@@ -115,212 +546,139 @@ def main():
             f"SDRF_DATASETS_DIR={datasets_dir!r} does not exist or is not a directory."
         )
 
-    # Find all SDRF files
-    sdrf_files = glob.glob(os.path.join(datasets_dir, '**', '*.sdrf.tsv'), recursive=True)
-
-    # Statistics counters
-    total_samples = 0
-    organisms = Counter()
-    organism_parts = Counter()
-    diseases = Counter()
-    cell_types = Counter()
-    instruments = Counter()
-    labels = Counter()
-    acquisition_methods = Counter()
-    modifications = Counter()
-    cleavage_agents = Counter()
-
-    # Dataset index
-    datasets = []
-    project_file_counts = Counter()
-
-    for filepath in sorted(sdrf_files):
-        if '/.' in filepath:
-            continue
-        rel_in_datasets = os.path.relpath(filepath, datasets_dir)
-        parts = rel_in_datasets.split(os.sep)
-        if len(parts) >= 2:
-            project_id = parts[0]
-        else:
-            project_id = os.path.basename(filepath).replace('.sdrf.tsv', '')
-        project_file_counts[project_id] += 1
-
-    for filepath in sorted(sdrf_files):
-        # Skip hidden files
-        if '/.' in filepath:
-            continue
+    with profiler.stage('scan'):
+        # Find all SDRF files
+        sdrf_files = glob.glob(os.path.join(datasets_dir, '**', '*.sdrf.tsv'), recursive=True)
 
-        # Extract project ID from the path inside the datasets/ tree
-        rel_in_datasets = os.path.relpath(filepath, datasets_dir)
-        parts = rel_in_datasets.split(os.sep)
-        if len(parts) >= 2:
-            project_id = parts[0]
+        # Statistics counters
+        total_samples = 0
+        if args.approx_counters:
+            # Constant memory per statistic, with bounded overestimation
+            counters = {key: SpaceSaving(args.approx_counters) for key, _, _ in STAT_FIELDS}
         else:
-            project_id = os.path.basename(filepath).replace('.sdrf.tsv', '')
-
-        # Parse the file
-        parsed = parse_sdrf_file(filepath)
-        if not parsed or parsed['num_rows'] == 0:
-            continue
-
-        rows = parsed['rows']
-        headers = parsed['headers']
-        num_samples = parsed['num_rows']
-        total_samples += num_samples
-
-        # Extract organisms
-        org_values = extract_column_values(rows, ['characteristics[organism]'])
-        for org in org_values:
-            org_name = parse_ontology_term(org)
-            if org_name:
-                organisms[org_name] += 1
-
-        # Extract organism parts
-        org_part_values = extract_column_values(rows, ['characteristics[organism part]'])
-        for op in org_part_values:
-            op_name = parse_ontology_term(op)
-            if op_name and op_name.lower() not in ['not available', 'not applicable']:
-                organism_parts[op_name] += 1
-
-        # Extract diseases
-        disease_values = extract_column_values(rows, ['characteristics[disease]'])
-        for d in disease_values:
-            d_name = parse_ontology_term(d)
-            if d_name and d_name.lower() not in ['not available', 'not applicable', 'normal']:
-                diseases[d_name] += 1
-
-        # Extract cell types
-        cell_type_values = extract_column_values(rows, ['characteristics[cell type]'])
-        for ct in cell_type_values:
-            ct_name = parse_ontology_term(ct)
-            if ct_name and ct_name.lower() not in ['not available', 'not applicable']:
-                cell_types[ct_name] += 1
-
-        # Extract instruments
-        instr_values = extract_column_values(rows, ['comment[instrument]'])
-        for instr in instr_values:
-            instr_name = parse_ontology_term(instr)
-            if instr_name:
-                instruments[instr_name] += 1
-
-        # Extract labels
-        label_values = extract_column_values(rows, ['comment[label]'])
-        for lbl in label_values:
-            lbl_name = parse_ontology_term(lbl)
-            if lbl_name:
-                labels[lbl_name] += 1
-
-        # Extract acquisition methods
-        acq_values = extract_column_values(rows, ['comment[proteomics data acquisition method]'])
-        for acq in acq_values:
-            acq_name = parse_ontology_term(acq)
-            if acq_name:
-                acquisition_methods[acq_name] += 1
-
-        # Extract modifications
-        mod_values = extract_column_values(rows, ['comment[modification parameters]', 'comment[modification identifier]'])
-        for mod in mod_values:
-            mod_name = parse_ontology_term(mod)
-            if mod_name:
-                modifications[mod_name] += 1
-
-        # Extract cleavage agents
-        cleav_values = extract_column_values(rows, ['comment[cleavage agent details]'])
-        for cleav in cleav_values:
-            cleav_name = parse_ontology_term(cleav)
-            if cleav_name:
-                cleavage_agents[cleav_name] += 1
-
-        # Get unique values for this dataset
-        dataset_organisms = list(set([parse_ontology_term(o) for o in get_unique_values(rows, ['characteristics[organism]'])]))
-        dataset_diseases = list(set([parse_ontology_term(d) for d in get_unique_values(rows, ['characteristics[disease]'])
-                                     if parse_ontology_term(d) and parse_ontology_term(d).lower() not in ['not available', 'not applicable', 'normal']]))
-        dataset_instruments = list(set([parse_ontology_term(i) for i in get_unique_values(rows, ['comment[instrument]'])]))
-        dataset_labels = list(set([parse_ontology_term(l) for l in get_unique_values(rows, ['comment[label]'])]))
-        dataset_acq = list(set([parse_ontology_term(a) for a in get_unique_values(rows, ['comment[proteomics data acquisition method]'])]))
-
-        # Determine experiment type (DDA/DIA/SRM)
-        exp_type = 'Unknown'
-        for acq in dataset_acq:
-            if acq:
-                acq_lower = acq.lower()
-                if 'dia' in acq_lower or 'data-independent' in acq_lower or 'data independent' in acq_lower:
-                    exp_type = 'DIA'
-                    break
-                elif 'dda' in acq_lower or 'data-dependent' in acq_lower or 'data dependent' in acq_lower:
-                    exp_type = 'DDA'
-                    break
-                elif 'srm' in acq_lower or 'mrm' in acq_lower or 'prm' in acq_lower or 'selected reaction monitoring' in acq_lower or 'multiple reaction monitoring' in acq_lower or 'parallel reaction monitoring' in acq_lower:
-                    exp_type = 'SRM/MRM'
-                    break
-
-        # Determine labeling type
-        label_type = 'Label-free'
-        for lbl in dataset_labels:
-            if lbl:
-                lbl_lower = lbl.lower()
-                if 'tmt' in lbl_lower:
-                    label_type = 'TMT'
-                    break
-                elif 'itraq' in lbl_lower:
-                    label_type = 'iTRAQ'
-                    break
-                elif 'silac' in lbl_lower:
-                    label_type = 'SILAC'
-                    break
-                elif 'label free' in lbl_lower or 'label-free' in lbl_lower:
-                    label_type = 'Label-free'
-
-        # Keep local parsing on annotated-projects/ while publishing links via datasets/
-        datasets_rel_path = os.path.join(datasets_prefix, project_id, os.path.basename(filepath)).replace(os.sep, '/')
-
-        # Create dataset entry
-        dataset_entry = {
-            'id': project_id,
-            'file': os.path.basename(filepath),  # Alias for filename (used by quickstart search)
-            'filename': os.path.basename(filepath),
-            'path': datasets_rel_path,
-            'accession_path': os.path.join(datasets_prefix, project_id).replace(os.sep, '/'),
-            'github_url': f'https://github.com/{datasets_repo}/blob/{datasets_branch}/{datasets_rel_path}',
-            'accession_github_url': f'https://github.com/{datasets_repo}/tree/{datasets_branch}/{datasets_prefix}/{project_id}',
-            'raw_url': f'https://raw.githubusercontent.com/{datasets_repo}/{datasets_branch}/{datasets_rel_path}',
-            'num_samples': num_samples,
-            'num_columns': len(headers),
-            'organisms': [o for o in dataset_organisms if o],
-            'diseases': [d for d in dataset_diseases if d],
-            'instruments': [i for i in dataset_instruments if i],
-            'acquisition_methods': [a for a in dataset_acq if a],  # Used by quickstart search
-            'experiment_type': exp_type,
-            'label_type': label_type,
-            'accession_file_count': project_file_counts[project_id],
-            'template': parsed['metadata'].get('template', 'unknown'),
-            'version': parsed['metadata'].get('version', 'unknown')
+            counters = {key: Counter() for key, _, _ in STAT_FIELDS}
+        distinct = {key: HyperLogLog() for key, _ in DISTINCT_FIELDS}
+
+        # Dataset index
+        datasets = []
+        project_file_counts = Counter()
+
+        sdrf_files = sorted(f for f in sdrf_files if '/.' not in f)  # Skip hidden files
+        for filepath in sdrf_files:
+            project_file_counts[project_id_for(filepath, datasets_dir)] += 1
+
+        # Per-file cache: a file is only re-parsed when its size and mtime changed
+        # and its content hash no longer matches. Records of deleted files are
+        # dropped because only the current files are written back. The cache
+        # holds every file's exact counts, so --approx-counters bypasses it.
+        use_cache = os.environ.get('SDRF_INDEX_CACHE', '1') != '0' and not args.approx_counters
+        cache_path = os.path.join(
+            os.environ.get('SDRF_INDEX_CACHE_DIR', DEFAULT_INDEX_CACHE_DIR), 'files.json'
+        )
+        fingerprint = index_cache_fingerprint(datasets_repo, datasets_branch)
+        cached_files = load_index_cache(cache_path, fingerprint) if use_cache else {}
+
+        records = {}
+        to_parse = []
+        for filepath in sdrf_files:
+            rel_path = os.path.relpath(filepath, datasets_dir).replace(os.sep, '/')
+            if not use_cache:
+                records[rel_path] = {'result': None}
+                to_parse.append((rel_path, filepath))
+                continue
+            st = os.stat(filepath)
+            record = cached_files.get(rel_path)
+            if record and record['size'] == st.st_size and record['mtime_ns'] == st.st_mtime_ns:
+                records[rel_path] = record
+                continue
+            sha256 = file_sha256(filepath)
+            if record and record['size'] == st.st_size and record['sha256'] == sha256:
+                records[rel_path] = {**record, 'mtime_ns': st.st_mtime_ns}
+                continue
+            records[rel_path] = {
+                'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256, 'result': None
+            }
+            to_parse.append((rel_path, filepath))
+        del cached_files
+
+    site_dir = os.path.dirname(os.path.abspath(__file__))
+    indent = 2 if args.pretty else None
+
+    # Column profiles of the previous build are replaced as a whole
+    profiles_dir = os.path.join(site_dir, PROFILES_DIR)
+    shutil.rmtree(profiles_dir, ignore_errors=True)
+
+    with profiler.stage('index'):
+        index_file = partial(
+            index_sdrf_file,
+            datasets_dir=datasets_dir,
+            datasets_repo=datasets_repo,
+            datasets_branch=datasets_branch,
+        )
+        pending = {rel_path for rel_path, _ in to_parse}
+        paths = [filepath for _, filepath in to_parse]
+        pool = ProcessPoolExecutor(max_workers=args.jobs or None) if args.jobs != 1 and paths else nullcontext()
+        with pool as executor:
+            results = executor.map(index_file, paths, chunksize=8) if executor else map(index_file, paths)
+            # Merge each result as soon as it is available, in sorted file
+            # order whether it was cached, parsed serially or came from a
+            # worker. Only the cache keeps a result after it is merged.
+            for rel_path, record in records.items():
+                result = next(results) if rel_path in pending else record['result']
+                record['result'] = result if use_cache else None
+                if result is None:
+                    continue
+                dataset_entry = dict(result['entry'])
+                dataset_entry['accession_file_count'] = project_file_counts[dataset_entry['id']]
+                total_samples += dataset_entry['num_samples']
+                for key, names in result['stats'].items():
+                    counters[key].update(names)
+                for key, sketch in result['sketches'].items():
+                    distinct[key].merge(HyperLogLog.from_json(sketch))
+                datasets.append(dataset_entry)
+
+                profile_path = os.path.join(site_dir, *dataset_entry['profile_path'].split('/'))
+                os.makedirs(os.path.dirname(profile_path), exist_ok=True)
+                write_json(
+                    {'id': dataset_entry['id'], 'file': dataset_entry['file'], **result['profile']},
+                    profile_path, indent,
+                )
+        print(f"Parsed {len(to_parse)} of {len(sdrf_files)} SDRF files ({len(sdrf_files) - len(to_parse)} cached)")
+
+    with profiler.stage('merge'):
+        if use_cache:
+            save_index_cache(cache_path, fingerprint, records)
+        del records
+
+        # Build statistics summary
+        statistics = {
+            'total_datasets': len(datasets),
+            'total_accessions': len(project_file_counts),
+            'total_sdrf_files': len(datasets),
+            'split_accessions': sum(1 for count in project_file_counts.values() if count > 1),
+            'total_samples': total_samples,
+            'generated_at': datetime.utcnow().isoformat() + 'Z',
+            'source_repository_url': datasets_repo_url,
+            **{key: dict(counters[key].most_common(STAT_TOP_N[key])) for key, _, _ in STAT_FIELDS},
+            'experiment_types': dict(Counter(d['experiment_type'] for d in datasets)),
+            'label_types': dict(Counter(d['label_type'] for d in datasets)),
+            'templates': dict(Counter(d['template'] for d in datasets)),
+            # HyperLogLog estimates, with their relative standard error
+            'distinct_counts': {key: round(sketch.estimate()) for key, sketch in distinct.items()},
+            'distinct_counts_relative_error': round(HyperLogLog().relative_error(), 4)
         }
 
-        datasets.append(dataset_entry)
-
-    # Build statistics summary
-    statistics = {
-        'total_datasets': len(datasets),
-        'total_accessions': len(project_file_counts),
-        'total_sdrf_files': len(datasets),
-        'split_accessions': sum(1 for count in project_file_counts.values() if count > 1),
-        'total_samples': total_samples,
-        'generated_at': datetime.utcnow().isoformat() + 'Z',
-        'source_repository_url': datasets_repo_url,
-        'organisms': dict(organisms.most_common(50)),
-        'organism_parts': dict(organism_parts.most_common(50)),
-        'diseases': dict(diseases.most_common(50)),
-        'cell_types': dict(cell_types.most_common(50)),
-        'instruments': dict(instruments.most_common(50)),
-        'labels': dict(labels.most_common(20)),
-        'acquisition_methods': dict(acquisition_methods.most_common(20)),
-        'modifications': dict(modifications.most_common(30)),
-        'cleavage_agents': dict(cleavage_agents.most_common(20)),
-        'experiment_types': dict(Counter(d['experiment_type'] for d in datasets)),
-        'label_types': dict(Counter(d['label_type'] for d in datasets)),
-        'templates': dict(Counter(d['template'] for d in datasets))
-    }
+    if args.approx_counters:
+        statistics['approximate_counts'] = {
+            key: {
+                'capacity': counters[key].capacity,
+                'total': counters[key].total,
+                'max_error': counters[key].max_error(),
+                # True count lies in [count - error, count]
+                'errors': {name: counters[key].error(name) for name in statistics[key]},
+            }
+            for key, _, _ in STAT_FIELDS
+        }
 
     # Build final output
     output = {
@@ -328,42 +686,42 @@ def main():
         'datasets': datasets
     }
 
-    # Write output
-    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sdrf-data.json')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
-
-    print(f"Generated SDRF index with {len(datasets)} datasets and {total_samples} total samples")
-    print(f"Output written to: {output_path}")
-
-    # Keep sdrf-explorer.html embedded index in sync with sdrf-data.json
-    explorer_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sdrf-explorer.html')
-    if os.path.isfile(explorer_path):
-        embedded = '\n' + json.dumps(output, indent=2, ensure_ascii=False) + '\n'
-        with open(explorer_path, 'r', encoding='utf-8') as f:
-            explorer_html = f.read()
-        pattern = re.compile(
-            r'(<script id="sdrf-data" type="application/json">)(.*?)(</script>)',
-            re.DOTALL,
-        )
-        new_explorer, repl_count = pattern.subn(
-            lambda m: m.group(1) + embedded + m.group(3),
-            explorer_html,
-            count=1,
-        )
-        if repl_count == 1:
-            with open(explorer_path, 'w', encoding='utf-8') as f:
-                f.write(new_explorer)
-            print(f"Updated embedded index in: {explorer_path}")
-        else:
-            print(
-                f"Warning: could not update embedded sdrf-data in {explorer_path} "
-                f"(matches={repl_count})"
+    with profiler.stage('write'):
+        # Full index, kept for external consumers
+        output_path = os.path.join(site_dir, 'sdrf-data.json')
+        write_json(output, output_path, indent)
+
+        print(f"Generated SDRF index with {len(datasets)} datasets and {total_samples} total samples")
+        print(f"Output written to: {output_path}")
+        print(f"Column profiles written to: {profiles_dir}")
+
+        # Explorer data: a small summary plus dataset shards fetched on demand
+        explorer_dir = os.path.join(site_dir, EXPLORER_DATA_DIR)
+        summary_name, shards = write_explorer_data(output, explorer_dir, args.shard_size, indent)
+        print(f"Explorer data written to: {explorer_dir} ({shards} dataset shards)")
+
+        explorer_path = os.path.join(site_dir, 'sdrf-explorer.html')
+        if os.path.isfile(explorer_path):
+            summary_url = f'{EXPLORER_DATA_DIR}/{summary_name}'
+            if update_explorer_reference(explorer_path, summary_url):
+                print(f"Explorer now references: {summary_url}")
+
+    if args.export:
+        with profiler.stage('export'):
+            corpus = SDRFCorpus.from_files(
+                (project_id_for(filepath, datasets_dir), filepath) for filepath in sdrf_files
             )
+            try:
+                export_path = corpus.write(args.export)
+            except (ImportError, ValueError) as e:
+                raise SystemExit(f"Cannot export to {args.export}: {e}")
+            if export_path.suffix != os.path.splitext(args.export)[1]:
+                print("pyarrow is not installed; wrote NumPy .npz instead of Parquet")
+            print(f"Exported {corpus.num_rows} rows x {len(corpus.columns)} columns to: {export_path}")
 
     # Print summary
     print(f"\nTop 10 organisms:")
-    for org, count in organisms.most_common(10):
+    for org, count in counters['organisms'].most_common(10):
         print(f"  {org}: {count}")
 
     print(f"\nExperiment types:")
@@ -374,5 +732,7 @@ def main():
     for label_type, count in Counter(d['label_type'] for d in datasets).items():
         print(f"  {label_type}: {count}")
 
+    profiler.report()
+
 if __name__ == '__main__':
     main()
@@ -2,6 +2,9 @@
 """
 Build search index for SDRF-Proteomics documentation site.
 Extracts content from AsciiDoc files and creates a JSON index for Lunr.js
+
+Usage: build-search-index.py [DOCS_DIR] [OUTPUT_FILE] [TEMPLATES_DIR]
+TEMPLATES_DIR may be a templates directory or a templates snapshot.
 """
 
 import json
@@ -10,6 +13,9 @@ import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from build_profiling import StageProfiler, pop_profile_option  # noqa: E402
+
 def extract_text_from_adoc(filepath):
     """Extract plain text content from AsciiDoc file."""
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -153,14 +159,17 @@ def parse_sdrf_terms_tsv(filepath):
     return entries
 
 
-def _index_yaml_templates(docs_dir):
+def _index_yaml_templates(docs_dir, templates_dir=None):
     """Index YAML template definitions for search.
 
     Uses resolve_templates to get full template data including inherited columns,
-    then creates search entries for each template.
+    then creates search entries for each template. templates_dir defaults to
+    sdrf-proteomics/sdrf-templates under docs_dir.
     """
     scripts_dir = Path(docs_dir) / 'scripts'
-    templates_dir = Path(docs_dir) / 'sdrf-proteomics' / 'sdrf-templates'
+    if templates_dir is None:
+        templates_dir = Path(docs_dir) / 'sdrf-proteomics' / 'sdrf-templates'
+    templates_dir = Path(templates_dir)
 
     if not templates_dir.exists():
         print("Warning: sdrf-templates directory not found, skipping YAML template indexing")
@@ -169,13 +178,13 @@ def _index_yaml_templates(docs_dir):
     # Import resolve_templates
     sys.path.insert(0, str(scripts_dir))
     try:
-        from resolve_templates import resolve_all
+        from resolve_templates import load_compiled_templates
     except ImportError:
         print("Warning: Could not import resolve_templates, skipping YAML template indexing")
         return []
 
     entries = []
-    all_templates = resolve_all(templates_dir)
+    all_templates = load_compiled_templates(templates_dir)["resolved"]
 
     for name, tpl in all_templates.items():
         # Build searchable content from template metadata and columns
@@ -221,8 +230,16 @@ def _index_yaml_templates(docs_dir):
     return entries
 
 
-def build_index(docs_dir, output_file):
-    """Build search index from documentation files."""
+def build_index(docs_dir, output_file, profiler=None, templates_dir=None):
+    """Build search index from documentation files.
+
+    Args:
+        profiler: Optional StageProfiler timing each kind of source.
+        templates_dir: Templates directory (or snapshot) to index; defaults
+            to sdrf-proteomics/sdrf-templates under docs_dir.
+    """
+    if profiler is None:
+        profiler = StageProfiler('build-search-index')
     index = []
 
     # Define AsciiDoc documents to index
@@ -259,46 +276,50 @@ def build_index(docs_dir, output_file):
                 'section': adoc_file.stem.replace('-', ' ').title()
             })
 
-    # Process AsciiDoc documents
-    for doc in documents:
-        filepath = Path(docs_dir) / doc['file']
-        if not filepath.exists():
-            print(f"Warning: File not found: {filepath}")
-            continue
-
-        print(f"Indexing: {doc['file']}")
-
-        with open(filepath, 'r', encoding='utf-8') as f:
-            raw_content = f.read()
-
-        title, content = extract_text_from_adoc(filepath)
-        keywords = extract_keywords(raw_content)
-
-        chunks = split_into_chunks(content, title, doc['url'], doc['section'], keywords)
-        index.extend(chunks)
-
-    # Index YAML-generated template pages
-    index.extend(_index_yaml_templates(docs_dir))
-
-    # Index sdrf-terms.tsv for column definitions and ontology mappings
-    sdrf_terms_path = Path(docs_dir) / 'sdrf-proteomics' / 'metadata-guidelines' / 'sdrf-terms.tsv'
-    if sdrf_terms_path.exists():
-        print(f"Indexing: sdrf-terms.tsv")
-        sdrf_entries = parse_sdrf_terms_tsv(sdrf_terms_path)
-        index.extend(sdrf_entries)
-        print(f"  Added {len(sdrf_entries)} SDRF term entries")
-
-    # Write JSON index (for server-based fetch)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2)
-
-    # Write JS index (for direct file:// access without server)
-    js_output = output_file.replace('.json', '.js')
-    with open(js_output, 'w', encoding='utf-8') as f:
-        f.write('// Auto-generated search index - do not edit\n')
-        f.write('const SEARCH_INDEX = ')
-        json.dump(index, f, indent=2)
-        f.write(';\n')
+    with profiler.stage('adoc'):
+        # Process AsciiDoc documents
+        for doc in documents:
+            filepath = Path(docs_dir) / doc['file']
+            if not filepath.exists():
+                print(f"Warning: File not found: {filepath}")
+                continue
+
+            print(f"Indexing: {doc['file']}")
+
+            with open(filepath, 'r', encoding='utf-8') as f:
+                raw_content = f.read()
+
+            title, content = extract_text_from_adoc(filepath)
+            keywords = extract_keywords(raw_content)
+
+            chunks = split_into_chunks(content, title, doc['url'], doc['section'], keywords)
+            index.extend(chunks)
+
+    with profiler.stage('templates'):
+        # Index YAML-generated template pages
+        index.extend(_index_yaml_templates(docs_dir, templates_dir))
+
+    with profiler.stage('terms'):
+        # Index sdrf-terms.tsv for column definitions and ontology mappings
+        sdrf_terms_path = Path(docs_dir) / 'sdrf-proteomics' / 'metadata-guidelines' / 'sdrf-terms.tsv'
+        if sdrf_terms_path.exists():
+            print(f"Indexing: sdrf-terms.tsv")
+            sdrf_entries = parse_sdrf_terms_tsv(sdrf_terms_path)
+            index.extend(sdrf_entries)
+            print(f"  Added {len(sdrf_entries)} SDRF term entries")
+
+    with profiler.stage('write'):
+        # Write JSON index (for server-based fetch)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+
+        # Write JS index (for direct file:// access without server)
+        js_output = output_file.replace('.json', '.js')
+        with open(js_output, 'w', encoding='utf-8') as f:
+            f.write('// Auto-generated search index - do not edit\n')
+            f.write('const SEARCH_INDEX = ')
+            json.dump(index, f, indent=2)
+            f.write(';\n')
 
     print(f"Search index built with {len(index)} entries: {output_file}")
     print(f"JavaScript index also created: {js_output}")
@@ -368,9 +389,10 @@ def slugify(text):
 
 
 if __name__ == '__main__':
-    import sys
-
+    profiler = StageProfiler.create('build-search-index', pop_profile_option(sys.argv))
     docs_dir = sys.argv[1] if len(sys.argv) > 1 else '.'
     output_file = sys.argv[2] if len(sys.argv) > 2 else 'docs/search-index.json'
+    templates_dir = sys.argv[3] if len(sys.argv) > 3 else None
 
-    build_index(docs_dir, output_file)
+    build_index(docs_dir, output_file, profiler, templates_dir)
+    profiler.report()